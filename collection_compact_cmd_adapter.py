@@ -0,0 +1,16 @@
+import argparse
+
+from main.utils.logger import setup_root_logger
+from main.utils.performance import log_execution_duration
+from main.persisters.disk_persister import DiskPersister
+from main.indexes.indexer_factory import load_indexers
+
+setup_root_logger()
+
+ap = argparse.ArgumentParser()
+ap.add_argument("-collection", "--collection", required=True, help="Collection name (will be used as root folder name)")
+ap.add_argument("-indexes", "--indexes", nargs="+", required=False, default=None, help="Index(es) to compact. If not specified, all indexes of the collection are compacted.")
+args = vars(ap.parse_args())
+
+for indexer in load_indexers(args['indexes'], args['collection'], DiskPersister(base_path="./data/collections"), for_update=True):
+    log_execution_duration(lambda: indexer.compact(), identifier=f"Compacting index {indexer.get_name()} of collection: {args['collection']}")
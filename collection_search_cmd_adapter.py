@@ -17,6 +17,9 @@ ap.add_argument("-filter", "--filter", required=False, default=None, help="""Fil
 ap.add_argument("-indexes", "--indexes", nargs="+", required=False, default=None, help="Index(es) for search. Multiple can be specified (e.g. --indexes index1 index2). If not specified, all available indexes are used. Multiple indexes are combined using Reciprocal Rank Fusion.")
 ap.add_argument("-rrfK", "--rrfK", required=False, type=int, default=60, help="RRF constant for multi-index search fusion. Higher values reduce rank impact.")
 
+ap.add_argument("-efSearch", "--efSearch", required=False, type=int, default=None, help="Size of the candidates list for HNSW indexes (ChromaDb, FAISS HNSW), higher values give better recall but slower search. If not passed, value from the indexer name or default is used.")
+ap.add_argument("-nprobe", "--nprobe", required=False, type=int, default=None, help="Number of IVF lists visited for IVF indexes (FAISS IVFFlat/IVFPQ), higher values give better recall but slower search. If not passed, value from the indexer name or default is used.")
+
 ap.add_argument("-maxNumberOfChunks", "--maxNumberOfChunks", required=False, type=int, default=None, help="Max number of text chunks in result")
 ap.add_argument("-maxNumberOfDocuments", "--maxNumberOfDocuments", required=False, type=int, default=10, help="Max number of documents in result")
 
@@ -29,6 +32,8 @@ args = vars(ap.parse_args())
 
 searcher = create_collection_searcher(collection_name=args['collection'], index_names=args['indexes'], rrf_k=args['rrfK'])
 
+search_params = {name: args[name] for name in ["efSearch", "nprobe"] if args[name] is not None}
+
 max_number_of_chunks = args['maxNumberOfChunks'] if args['maxNumberOfChunks'] is not None else args['maxNumberOfDocuments'] * 3
 search_result = log_execution_duration(lambda: searcher.search(args['query'],
                                                                max_number_of_chunks=max_number_of_chunks, 
@@ -36,7 +41,8 @@ search_result = log_execution_duration(lambda: searcher.search(args['query'],
                                                                include_text_content=args['includeFullText'], 
                                                                include_matched_chunks_content=args['includeMatchedChunksText'],
                                                                include_all_chunks_content=args['includeAllChunksText'],
-                                                               filter=args['filter']),
+                                                               filter=args['filter'],
+                                                               search_params=search_params),
                                        identifier=f"Searching collection: \"{args['collection']}\" by query: \"{args['query']}\"")
 
 logging.info(f"Search results:\n{format_object(search_result, args['format'])}")
\ No newline at end of file
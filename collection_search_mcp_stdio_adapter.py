@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
+import json
+import logging
 import argparse
 
 from mcp.server.fastmcp import FastMCP
 
 from main.factories.fetch_collection_factory import create_collection_fetcher
 from main.factories.search_collection_factory import create_collection_searcher
+from main.indexes.indexer_factory import get_query_embedding_cache_stats
 from main.utils.formatting import format_object
 from main.utils.logger import setup_root_logger
+from main.utils.periodic import run_periodically_and_at_exit
 
 # Write to stderr for MCP, since in other case logs will be mixed with stdout and break communication between MCP and the tool adapter
 setup_root_logger(use_stderr=True)
@@ -21,12 +25,15 @@ ap.add_argument("-rrfK", "--rrfK", required=False, type=int, default=60, help="R
 
 ap.add_argument("-filter", "--filter", required=False, default=None, help="""Filter query for search. Uses common syntax: 'field operator "value"'. Multiple conditions can be combined with 'and'/'or'. Examples: --filter 'space = "SPACE_KEY"', --filter 'space = "SPACE_KEY" and lastModifiedAt > "2026-01-01"'""")
 
+ap.add_argument("-efSearch", "--efSearch", required=False, type=int, default=None, help="Size of the candidates list for HNSW indexes (ChromaDb, FAISS HNSW), higher values give better recall but slower search. If not passed, value from the indexer name or default is used.")
+
 ap.add_argument("-maxNumberOfChunks", "--maxNumberOfChunks", required=False, type=int, default=50, help="Max number of text chunks in result")
 ap.add_argument("-maxNumberOfDocuments", "--maxNumberOfDocuments", required=False, type=int, default=None, help="Max number of documents in result")
 
 ap.add_argument("-includeFullText", "--includeFullText", action="store_true", required=False, default=False, help="If passed - full text content will be included in the search result. By default only matched chunks content is included. If passed, it's better to reduce --maxNumberOfChunks or set small --maxNumberOfDocuments like 10-30 to avoid too big response and breaking AI agent.")
 
 ap.add_argument("-format", "--format", default="toon", required=False, choices=['json', 'json_with_indent', 'toon'], help="Output format for the search result (e.g., 'json', 'json_with_indent', 'toon')")
+ap.add_argument("-cacheStatsLogInterval", "--cacheStatsLogInterval", required=False, type=int, default=600, help="Interval in seconds between logging query embeddings cache stats, 0 disables periodic logging. Stats are always logged at shutdown (default: 600).")
 args = vars(ap.parse_args())
 
 searcher = create_collection_searcher(collection_name=args['collection'], index_names=args['indexes'], rrf_k=args['rrfK'])
@@ -42,7 +49,8 @@ def search_documents(query: str) -> str:
                                      max_number_of_documents=args['maxNumberOfDocuments'],
                                      include_text_content=args['includeFullText'],
                                      include_matched_chunks_content=not args['includeFullText'],
-                                     filter=args['filter'])
+                                     filter=args['filter'],
+                                     search_params={"efSearch": args['efSearch']} if args['efSearch'] else None)
 
     return format_object(search_results, args['format'])
 
@@ -63,5 +71,9 @@ def fetch_document(id: str, startLine: int = 1, endLine: int = 250) -> str:
     result = fetcher.fetch(id=id, start_line=startLine, end_line=endLine)
     return format_object(result, args['format'])
 
+def log_query_embedding_cache_stats():
+    logging.info(f"Query embeddings cache stats: {json.dumps(get_query_embedding_cache_stats())}")
+
 if __name__ == "__main__":
+    run_periodically_and_at_exit(log_query_embedding_cache_stats, args['cacheStatsLogInterval'], name="cache-stats-logger")
     mcp.run(transport='stdio')
\ No newline at end of file
@@ -2,16 +2,23 @@
 import argparse
 import json
 import os
+import time
+import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from main.factories.fetch_collection_factory import create_collection_fetcher
 from main.factories.search_collection_factory import create_collection_searcher
+from main.indexes.indexer_factory import get_query_embedding_cache_stats
 from main.utils.formatting import format_object
 from main.utils.logger import setup_root_logger
+from main.utils.periodic import run_periodically_and_at_exit
 
 ap = argparse.ArgumentParser()
 ap.add_argument("-c", "--collections", nargs="*", default=None, help="Collections to search in. If not passed, all collections are available.")
@@ -23,6 +30,9 @@ ap.add_argument("--maxNumberOfChunks", type=int, default=100, help="Maximum allo
 
 ap.add_argument("--http", action="store_true", default=False, help="Run MCP server over HTTP (streamable-http) instead of stdio.")
 ap.add_argument("--http-port", type=int, default=8000, help="Port for HTTP transport (default: 8000).")
+ap.add_argument("--preload", action="store_true", default=False, help="Load embedding models and warm up indexes of all collections in background threads right after start.")
+ap.add_argument("--preloadThreads", type=int, default=4, help="Number of background threads used to preload collections (default: 4).")
+ap.add_argument("--cacheStatsLogInterval", type=int, default=600, help="Interval in seconds between logging query embeddings cache stats, 0 disables periodic logging. Stats are always logged at shutdown (default: 600).")
 args = vars(ap.parse_args())
 
 transport = "streamable-http" if args["http"] else "stdio"
@@ -173,13 +183,14 @@ filter_field_description = __build_filter_field_description(discovered)
 available_names = {c["name"] for c in discovered}
 
 searcher_cache = {}
-searcher_cache_lock = threading.Lock()
+searcher_locks = {name: threading.Lock() for name in available_names}
+server_ready = threading.Event()
 
 def __get_or_create_searcher(collectionName: str):
     if collectionName in searcher_cache:
         return searcher_cache[collectionName]
 
-    with searcher_cache_lock:
+    with searcher_locks[collectionName]:
         if collectionName not in searcher_cache:
             searcher_cache[collectionName] = create_collection_searcher(
                 collection_name=collectionName,
@@ -188,6 +199,33 @@ def __get_or_create_searcher(collectionName: str):
 
     return searcher_cache[collectionName]
 
+def __preload_collection(collection_name: str):
+    start_time = time.perf_counter()
+    try:
+        __get_or_create_searcher(collection_name).warm_up()
+        logging.info(f"Collection {collection_name} is preloaded in {time.perf_counter() - start_time:.2f}s")
+    except Exception:
+        logging.exception(f"Error preloading collection {collection_name}")
+
+def __preload_collections():
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args["preloadThreads"]) as executor:
+        list(executor.map(__preload_collection, sorted(available_names)))
+
+    server_ready.set()
+    logging.info(f"Server is ready, {len(available_names)} collections preloaded in {time.perf_counter() - start_time:.2f}s")
+
+if args["preload"]:
+    threading.Thread(target=__preload_collections, name="collections-preloader", daemon=True).start()
+else:
+    server_ready.set()
+
+def __log_query_embedding_cache_stats():
+    logging.info(f"Query embeddings cache stats: {json.dumps(get_query_embedding_cache_stats())}")
+
+# /metrics is available over HTTP only, logs make the stats visible for stdio transport too
+run_periodically_and_at_exit(__log_query_embedding_cache_stats, args["cacheStatsLogInterval"], name="cache-stats-logger")
+
 mcp = FastMCP("documents-search-unified", port=args["http_port"])
 
 @mcp.tool(name="search_in_collection", description=search_description)
@@ -196,6 +234,7 @@ def search_in_collection(
     query: Annotated[str, Field(description="Search query text for vector similarity and keyword search.", default="")],
     filter: Annotated[str | None, Field(description=filter_field_description, default=None)],
     numberOfChunks: Annotated[int, Field(description=f"Number of best matched document chunks to return. Prefer to use default value unless there is strong reason to change. Max allowed: {args['maxNumberOfChunks']}.", default=args["defaultNumberOfChunks"])],
+    efSearch: Annotated[int | None, Field(description="Size of the candidates list for vector search (HNSW indexes). Higher values give better recall but slower search. Prefer to use default value unless search misses relevant chunks.", default=None)],
 ) -> str:
     if collection not in available_names:
         return f"Error: collection '{collection}' is not available. Available: {', '.join(sorted(available_names))}"
@@ -209,6 +248,7 @@ def search_in_collection(
         max_number_of_chunks=numberOfChunks,
         include_matched_chunks_content=True,
         filter=filter or None,
+        search_params={"efSearch": efSearch} if efSearch else None,
     )
     return format_object(search_results, args["format"])
 
@@ -226,4 +266,18 @@ def fetch_from_collection(
     result = fetcher.fetch(id=id, start_line=startLine, end_line=endLine)
     return format_object(result, args["format"])
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse({
+        "loadedCollections": sorted(searcher_cache.keys()),
+        "queryEmbeddingCache": get_query_embedding_cache_stats(),
+    })
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    return JSONResponse({
+        "ready": server_ready.is_set(),
+        "loadedCollections": sorted(searcher_cache.keys()),
+    }, status_code=200 if server_ready.is_set() else 503)
+
 mcp.run(transport=transport)
@@ -3,12 +3,14 @@ import argparse
 from main.utils.logger import setup_root_logger
 from main.factories.update_collection_factory import create_collection_updater
 
-setup_root_logger()
+if __name__ == "__main__":
+    setup_root_logger()
 
-ap = argparse.ArgumentParser()
-ap.add_argument("-collection", "--collection", required=True, help="Collection name (will be used to determine root folder and manifest file)")
-args = vars(ap.parse_args())
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-collection", "--collection", required=True, help="Collection name (will be used to determine root folder and manifest file)")
+    ap.add_argument("-embeddingWorkers", "--embeddingWorkers", required=False, default=None, type=int, help="Number of worker processes used to calculate embeddings, CPU cores are split between them. If not passed - embeddings are calculated in the current process")
+    args = vars(ap.parse_args())
 
-create_collection_updater = create_collection_updater(args['collection'])
+    create_collection_updater = create_collection_updater(args['collection'], embedding_workers=args['embeddingWorkers'])
 
-create_collection_updater.run()
\ No newline at end of file
+    create_collection_updater.run()
@@ -7,65 +7,73 @@ from main.sources.confluence.confluence_document_converter import ConfluenceDocu
 from main.sources.confluence.confluence_cloud_document_reader import ConfluenceCloudDocumentReader
 from main.sources.confluence.confluence_cloud_document_converter import ConfluenceCloudDocumentConverter
 from main.factories.create_collection_factory import create_collection_creator
-from main.splitter.text_splitter import TextSplitter
+from main.splitter.text_splitter_factory import create_text_splitter
+from main.indexes.indexer_factory import find_embedding_model_name
 
-setup_root_logger()
+if __name__ == "__main__":
+    setup_root_logger()
 
-ap = argparse.ArgumentParser()
-ap.add_argument("-collection", "--collection", required=True, help="Collection name (will be used as root folder name)")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-collection", "--collection", required=True, help="Collection name (will be used as root folder name)")
 
-ap.add_argument("-url", "--url", required=True, help="Confluence base url (e.g., https://your-domain.atlassian.net for Cloud or https://confluence.example.com for Server/Data Center)")
-ap.add_argument("-cql", "--cql", required=False, default="", help="Confluence query (CQL) to get pages for indexing")
+    ap.add_argument("-url", "--url", required=True, help="Confluence base url (e.g., https://your-domain.atlassian.net for Cloud or https://confluence.example.com for Server/Data Center)")
+    ap.add_argument("-cql", "--cql", required=False, default="", help="Confluence query (CQL) to get pages for indexing")
 
-ap.add_argument("-indexers", "--indexers", required=False, default=["indexer_ChromaDb__embeddings_sentence-transformers_slash_all-MiniLM-L6-v2", "indexer_SqlLiteBM25"], help="List on indexer names", nargs='+')
+    ap.add_argument("-indexers", "--indexers", required=False, default=["indexer_ChromaDb__embeddings_sentence-transformers_slash_all-MiniLM-L6-v2", "indexer_SqlLiteBM25"], help="List on indexer names", nargs='+')
 
-ap.add_argument("-readOnlyFirstLevelComments", "--readOnlyFirstLevelComments", action="store_true", required=False, default=False, help="Confluence has hierarchical comments, first level comments are read by default, but for other ones additional call is needed what can slowdown the process. Pass this argument to read only first level comments and have better performance.")
+    ap.add_argument("-readOnlyFirstLevelComments", "--readOnlyFirstLevelComments", action="store_true", required=False, default=False, help="Confluence has hierarchical comments, first level comments are read by default, but for other ones additional call is needed what can slowdown the process. Pass this argument to read only first level comments and have better performance.")
 
-ap.add_argument("-chunkSize", "--chunkSize", required=False, default=1000, type=int, help="Chunk size for text splitting (default: 1000)")
-ap.add_argument("-chunkOverlap", "--chunkOverlap", required=False, default=100, type=int, help="Chunk overlap for text splitting (default: 100)")
-args = vars(ap.parse_args())
+    ap.add_argument("-splitter", "--splitter", required=False, default="characters", choices=["characters", "tokens"], help="Text splitting mode: 'characters' measures chunks in characters, 'tokens' measures chunks in tokens of the embedding model of the indexers (default: characters)")
+    ap.add_argument("-chunkSize", "--chunkSize", required=False, default=None, type=int, help="Chunk size for text splitting (default: 1000 for 'characters' splitter, max sequence length of the embedding model for 'tokens' splitter)")
+    ap.add_argument("-chunkOverlap", "--chunkOverlap", required=False, default=None, type=int, help="Chunk overlap for text splitting (default: 100 for 'characters' splitter, 10%% of chunk size for 'tokens' splitter)")
+    ap.add_argument("-embeddingWorkers", "--embeddingWorkers", required=False, default=None, type=int, help="Number of worker processes used to calculate embeddings, CPU cores are split between them. If not passed - embeddings are calculated in the current process")
+    args = vars(ap.parse_args())
 
-text_splitter = TextSplitter(chunk_size=args['chunkSize'], chunk_overlap=args['chunkOverlap'])
+    text_splitter = create_text_splitter(splitter_type=args['splitter'],
+                                         chunk_size=args['chunkSize'],
+                                         chunk_overlap=args['chunkOverlap'],
+                                         model_name=find_embedding_model_name(args['indexers']))
 
-# Detect if it's Confluence Cloud or Server/Data Center based on URL
-is_cloud = args['url'].endswith('.atlassian.net')
+    # Detect if it's Confluence Cloud or Server/Data Center based on URL
+    is_cloud = args['url'].endswith('.atlassian.net')
 
-if is_cloud:
-    # Confluence Cloud setup
-    email = os.environ.get('ATLASSIAN_EMAIL')
+    if is_cloud:
+        # Confluence Cloud setup
+        email = os.environ.get('ATLASSIAN_EMAIL')
 
-    api_token = os.environ.get('ATLASSIAN_TOKEN')
+        api_token = os.environ.get('ATLASSIAN_TOKEN')
 
-    if not email or not api_token:
-        raise ValueError("Both 'ATLASSIAN_EMAIL' and 'ATLASSIAN_TOKEN' environment variables must be provided for Confluence Cloud.")
+        if not email or not api_token:
+            raise ValueError("Both 'ATLASSIAN_EMAIL' and 'ATLASSIAN_TOKEN' environment variables must be provided for Confluence Cloud.")
 
-    confluence_document_reader = ConfluenceCloudDocumentReader(base_url=args['url'],
-                                                               query=args['cql'],
-                                                               email=email,
-                                                               api_token=api_token,
-                                                               read_all_comments=(not args['readOnlyFirstLevelComments']))
-    confluence_document_converter = ConfluenceCloudDocumentConverter(text_splitter)
+        confluence_document_reader = ConfluenceCloudDocumentReader(base_url=args['url'],
+                                                                   query=args['cql'],
+                                                                   email=email,
+                                                                   api_token=api_token,
+                                                                   read_all_comments=(not args['readOnlyFirstLevelComments']))
+        confluence_document_converter = ConfluenceCloudDocumentConverter(text_splitter)
 
-else:
-    # Confluence Server/Data Center setup
-    token = os.environ.get('CONF_TOKEN')
-    login = os.environ.get('CONF_LOGIN')
-    password = os.environ.get('CONF_PASSWORD')
+    else:
+        # Confluence Server/Data Center setup
+        token = os.environ.get('CONF_TOKEN')
+        login = os.environ.get('CONF_LOGIN')
+        password = os.environ.get('CONF_PASSWORD')
 
-    if not token and (not login or not password):
-        raise ValueError("Either 'token' ('CONF_TOKEN' env variable) or both 'login' ('CONF_LOGIN' env variable) and 'password' ('CONF_PASSWORD' env variable) must be provided.")
+        if not token and (not login or not password):
+            raise ValueError("Either 'token' ('CONF_TOKEN' env variable) or both 'login' ('CONF_LOGIN' env variable) and 'password' ('CONF_PASSWORD' env variable) must be provided.")
 
-    confluence_document_reader = ConfluenceDocumentReader(base_url=args['url'],
-                                                          query=args['cql'],
-                                                          token=token,
-                                                          login=login, 
-                                                          password=password,
-                                                          read_all_comments=(not args['readOnlyFirstLevelComments']))
-    confluence_document_converter = ConfluenceDocumentConverter(text_splitter)
+        confluence_document_reader = ConfluenceDocumentReader(base_url=args['url'],
+                                                              query=args['cql'],
+                                                              token=token,
+                                                              login=login, 
+                                                              password=password,
+                                                              read_all_comments=(not args['readOnlyFirstLevelComments']))
+        confluence_document_converter = ConfluenceDocumentConverter(text_splitter)
 
-confluence_collection_creator = create_collection_creator(collection_name=args['collection'],
-                                                          indexers=args['indexers'],
-                                                          document_reader=confluence_document_reader,
-                                                          document_converter=confluence_document_converter)
+    confluence_collection_creator = create_collection_creator(collection_name=args['collection'],
+                                                              indexers=args['indexers'],
+                                                              document_reader=confluence_document_reader,
+                                                              document_converter=confluence_document_converter,
+                                                              embedding_workers=args['embeddingWorkers'])
 
-confluence_collection_creator.run()
\ No newline at end of file
+    confluence_collection_creator.run()
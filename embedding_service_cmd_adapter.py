@@ -0,0 +1,28 @@
+import argparse
+import logging
+
+from main.utils.logger import setup_root_logger
+from main.indexes.indexer_factory import create_in_process_embedder
+from main.indexes.embeddings.embedding_service_server import EmbeddingServiceServer
+
+setup_root_logger()
+
+ap = argparse.ArgumentParser()
+ap.add_argument("-socket", "--socket", required=False, default="./data/embedding_service.sock", help="Unix socket path the service listens on, clients use it from EMBEDDING_SERVICE_SOCKET env variable (default: ./data/embedding_service.sock)")
+ap.add_argument("-maxBatchSize", "--maxBatchSize", required=False, default=256, type=int, help="Maximal number of texts from different requests embedded together (default: 256)")
+ap.add_argument("-maxBatchDelayMs", "--maxBatchDelayMs", required=False, default=5, type=float, help="Maximal time to wait for more requests before embedding a batch, in milliseconds (default: 5)")
+ap.add_argument("-socketPermissions", "--socketPermissions", required=False, default="660", help="Permissions of the socket file in octal format, use 666 to share the service with all users of the machine (default: 660)")
+args = vars(ap.parse_args())
+
+server = EmbeddingServiceServer(socket_path=args['socket'],
+                                embedder_factory=create_in_process_embedder,
+                                max_batch_size=args['maxBatchSize'],
+                                max_batch_delay_in_seconds=args['maxBatchDelayMs'] / 1000,
+                                socket_permissions=int(args['socketPermissions'], 8))
+
+try:
+    server.serve_forever()
+except KeyboardInterrupt:
+    logging.info("Embedding service stopped")
+finally:
+    server.close()
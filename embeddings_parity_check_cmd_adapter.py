@@ -0,0 +1,57 @@
+import argparse
+import json
+import logging
+import time
+
+from main.utils.logger import setup_root_logger
+from main.persisters.disk_persister import DiskPersister
+from main.indexes.embeddings.sentence_embeder import SentenceEmbedder
+from main.indexes.embeddings.onnx_embedder import OnnxEmbedder
+from main.indexes.embeddings.embedding_parity import compare_embeddings
+
+setup_root_logger()
+
+ap = argparse.ArgumentParser()
+ap.add_argument("-collection", "--collection", required=True, help="Collection name, its chunks are used as texts for the check")
+ap.add_argument("-model", "--model", required=False, default="sentence-transformers/all-MiniLM-L6-v2", help="Embedding model name (default: sentence-transformers/all-MiniLM-L6-v2)")
+ap.add_argument("-numberOfTexts", "--numberOfTexts", required=False, default=1000, type=int, help="Number of collection chunks to embed (default: 1000)")
+ap.add_argument("-numberOfNeighbours", "--numberOfNeighbours", required=False, default=10, type=int, help="Number of nearest neighbours compared between PyTorch and ONNX embeddings (default: 10)")
+args = vars(ap.parse_args())
+
+
+def read_texts(collection_name, number_of_texts):
+    persister = DiskPersister(base_path="./data/collections")
+
+    texts = []
+    for document_file_name in sorted(persister.read_folder_files(f"{collection_name}/documents")):
+        document = json.loads(persister.read_text_file(f"{collection_name}/documents/{document_file_name}"))
+        for chunk in document["chunks"]:
+            texts.append(chunk["indexedData"])
+            if len(texts) >= number_of_texts:
+                return texts
+
+    return texts
+
+
+def embed_and_measure(embedder, texts):
+    start_time = time.perf_counter()
+    embeddings = embedder.embed(texts)
+    return embeddings, time.perf_counter() - start_time
+
+
+texts = read_texts(args['collection'], args['numberOfTexts'])
+if not texts:
+    raise Exception(f"No chunks found in collection {args['collection']}")
+
+reference_embeddings, reference_duration = embed_and_measure(SentenceEmbedder(model_name=args['model']), texts)
+candidate_embeddings, candidate_duration = embed_and_measure(OnnxEmbedder(model_name=args['model']), texts)
+
+result = {
+    "model": args['model'],
+    **compare_embeddings(reference_embeddings, candidate_embeddings, args['numberOfNeighbours']),
+    "pytorchDurationInSeconds": round(reference_duration, 3),
+    "onnxInt8DurationInSeconds": round(candidate_duration, 3),
+    "speedup": round(reference_duration / candidate_duration, 2),
+}
+
+logging.info(f"Embeddings parity check result:\n{json.dumps(result, indent=2)}")
@@ -4,41 +4,63 @@ import os
 from main.utils.logger import setup_root_logger
 from main.sources.files.files_document_reader import FilesDocumentReader
 from main.sources.files.files_document_converter import FilesDocumentConverter
+from main.sources.files.parsed_content_cache import ParsedContentCache
+from main.persisters.disk_persister import DiskPersister
 from main.factories.create_collection_factory import create_collection_creator
-from main.splitter.text_splitter import TextSplitter
+from main.splitter.text_splitter_factory import create_text_splitter
+from main.indexes.indexer_factory import find_embedding_model_name
 
-setup_root_logger()
+if __name__ == "__main__":
+    setup_root_logger()
 
-ap = argparse.ArgumentParser()
-ap.add_argument("-collection", "--collection", required=False, help="Collection name (will be used as root folder name). If not provided, it will be derived from the basePath folder name.")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-collection", "--collection", required=False, help="Collection name (will be used as root folder name). If not provided, it will be derived from the basePath folder name.")
 
-ap.add_argument("-basePath", "--basePath", required=True, help="Path to the root folder from which files will be read.")
-ap.add_argument("-includePatterns", "--includePatterns", required=False, default=[".*"], help="List of file patterns to include into collection", nargs='+')
-ap.add_argument("-excludePatterns", "--excludePatterns", required=False, default=[], help="List of file patterns to NOT include into collection", nargs='+')
+    ap.add_argument("-basePath", "--basePath", required=True, help="Path to the root folder from which files will be read.")
+    ap.add_argument("-includePatterns", "--includePatterns", required=False, default=[".*"], help="List of file patterns to include into collection", nargs='+')
+    ap.add_argument("-excludePatterns", "--excludePatterns", required=False, default=[], help="List of file patterns to NOT include into collection", nargs='+')
 
-ap.add_argument("-indexers", "--indexers", required=False, default=["indexer_ChromaDb__embeddings_sentence-transformers_slash_all-MiniLM-L6-v2", "indexer_SqlLiteBM25"], help="List on indexer names", nargs='+')
+    ap.add_argument("-indexers", "--indexers", required=False, default=["indexer_ChromaDb__embeddings_sentence-transformers_slash_all-MiniLM-L6-v2", "indexer_SqlLiteBM25"], help="List on indexer names", nargs='+')
 
-ap.add_argument("-failFast", "--failFast", action="store_true", required=False, default=False, help="If passed - the process will stop on the first error. Otherwise, it will try to process all files and log errors for those that failed.")
+    ap.add_argument("-failFast", "--failFast", action="store_true", required=False, default=False, help="If passed - the process will stop on the first error. Otherwise, it will try to process all files and log errors for those that failed.")
 
-ap.add_argument("-chunkSize", "--chunkSize", required=False, default=1000, type=int, help="Chunk size for text splitting (default: 1000)")
-ap.add_argument("-chunkOverlap", "--chunkOverlap", required=False, default=100, type=int, help="Chunk overlap for text splitting (default: 100)")
-args = vars(ap.parse_args())
+    ap.add_argument("-streamingThresholdMb", "--streamingThresholdMb", required=False, default=100, type=int, help="PDF and PPTX files of this size or larger (in megabytes) are parsed by page ranges to keep memory usage bounded (default: 100)")
 
-text_splitter = TextSplitter(chunk_size=args['chunkSize'], chunk_overlap=args['chunkOverlap'])
+    ap.add_argument("-strategies", "--strategies", required=False, default=[], help="Unstructured partitioning strategies per file extension in the format '.extension=strategy1,strategy2', e.g. '.pdf=fast,hi_res'. The next strategy is used only when the previous one extracts almost no text (default: 'auto' for all extensions)", nargs='+')
+    ap.add_argument("-minCharactersPerPage", "--minCharactersPerPage", required=False, default=20, type=int, help="Minimal number of characters per page extracted by a strategy to not fall back to the next one (default: 20)")
 
-files_document_reader = FilesDocumentReader(base_path=args['basePath'], 
-                                            include_patterns=args['includePatterns'], 
-                                            exclude_patterns=args['excludePatterns'],
-                                            fail_fast=args['failFast'])
-files_document_converter = FilesDocumentConverter(text_splitter)
+    ap.add_argument("-splitter", "--splitter", required=False, default="characters", choices=["characters", "tokens"], help="Text splitting mode: 'characters' measures chunks in characters, 'tokens' measures chunks in tokens of the embedding model of the indexers (default: characters)")
+    ap.add_argument("-chunkSize", "--chunkSize", required=False, default=None, type=int, help="Chunk size for text splitting (default: 1000 for 'characters' splitter, max sequence length of the embedding model for 'tokens' splitter)")
+    ap.add_argument("-chunkOverlap", "--chunkOverlap", required=False, default=None, type=int, help="Chunk overlap for text splitting (default: 100 for 'characters' splitter, 10%% of chunk size for 'tokens' splitter)")
+    ap.add_argument("-embeddingWorkers", "--embeddingWorkers", required=False, default=None, type=int, help="Number of worker processes used to calculate embeddings, CPU cores are split between them. If not passed - embeddings are calculated in the current process")
+    args = vars(ap.parse_args())
 
-collection_name = args['collection'] if args['collection'] else os.path.basename(args['basePath'])
-files_collection_creator = create_collection_creator(collection_name=collection_name,
-                                                     indexers=args['indexers'],
-                                                     document_reader=files_document_reader,
-                                                     document_converter=files_document_converter,
-                                                     use_cache=False)
+    strategies_by_extension = {
+        extension.lower(): strategies.split(",")
+        for extension, strategies in (strategies_argument.split("=", 1) for strategies_argument in args['strategies'])
+    }
 
-files_collection_creator.run()
+    text_splitter = create_text_splitter(splitter_type=args['splitter'],
+                                         chunk_size=args['chunkSize'],
+                                         chunk_overlap=args['chunkOverlap'],
+                                         model_name=find_embedding_model_name(args['indexers']))
 
+    files_document_reader = FilesDocumentReader(base_path=args['basePath'], 
+                                                include_patterns=args['includePatterns'], 
+                                                exclude_patterns=args['excludePatterns'],
+                                                fail_fast=args['failFast'],
+                                                streaming_threshold_in_bytes=args['streamingThresholdMb'] * 1024 * 1024,
+                                                strategies_by_extension=strategies_by_extension,
+                                                min_characters_per_page=args['minCharactersPerPage'],
+                                                parsed_content_cache=ParsedContentCache(DiskPersister(base_path="./data/caches/parsed_files")))
+    files_document_converter = FilesDocumentConverter(text_splitter)
 
+    collection_name = args['collection'] if args['collection'] else os.path.basename(args['basePath'])
+    files_collection_creator = create_collection_creator(collection_name=collection_name,
+                                                         indexers=args['indexers'],
+                                                         document_reader=files_document_reader,
+                                                         document_converter=files_document_converter,
+                                                         use_cache=False,
+                                                         embedding_workers=args['embeddingWorkers'])
+
+    files_collection_creator.run()
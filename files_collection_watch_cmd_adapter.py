@@ -0,0 +1,56 @@
+import argparse
+import json
+import logging
+
+from main.utils.logger import setup_root_logger
+from main.persisters.disk_persister import DiskPersister
+from main.sources.files.files_document_reader import EXCLUDED_FILE_EXTENSIONS
+from main.sources.files.files_watcher import FilesWatcher
+from main.factories.update_collection_factory import create_collection_updater
+
+setup_root_logger()
+
+ap = argparse.ArgumentParser()
+ap.add_argument("-collection", "--collection", required=True, help="Collection name (will be used to determine root folder and manifest file)")
+ap.add_argument("-debounceSeconds", "--debounceSeconds", required=False, default=2.0, type=float, help="Collection is updated when no file changes happened during this number of seconds (default: 2)")
+ap.add_argument("-maxDelaySeconds", "--maxDelaySeconds", required=False, default=30.0, type=float, help="Maximal delay between the first file change and the collection update when files keep changing (default: 30)")
+ap.add_argument("-batchSize", "--batchSize", required=False, default=100, type=int, help="Maximal number of changed paths processed by one collection update (default: 100)")
+args = vars(ap.parse_args())
+
+manifest = json.loads(DiskPersister(base_path="./data/collections").read_text_file(f"{args['collection']}/manifest.json"))
+if manifest['reader']['type'] != 'localFiles':
+    raise Exception(f"Watch mode is supported only for local files collections, but {args['collection']} has reader type: {manifest['reader']['type']}")
+
+
+def update_collection(changed_paths=None):
+    try:
+        create_collection_updater(args['collection'], changed_paths=changed_paths).run()
+    except Exception:
+        logging.exception(f"Error updating collection {args['collection']}")
+
+
+files_watcher = FilesWatcher(base_path=manifest['reader']['basePath'],
+                             include_patterns=manifest['reader'].get('includePatterns', [".*"]),
+                             exclude_patterns=manifest['reader'].get('excludePatterns', []),
+                             excluded_file_extensions=EXCLUDED_FILE_EXTENSIONS,
+                             debounce_time_in_seconds=args['debounceSeconds'],
+                             max_batch_delay_in_seconds=args['maxDelaySeconds'])
+
+try:
+    # Watches are added before the full update, so changes made during it are not missed
+    update_collection()
+    logging.info(f"Watching {manifest['reader']['basePath']} for changes in collection {args['collection']}")
+
+    while True:
+        changed_paths = files_watcher.wait_for_changes()
+        if changed_paths is None:
+            update_collection()
+            continue
+
+        logging.info(f"Detected {len(changed_paths)} changed paths in {manifest['reader']['basePath']}")
+        for batch_start in range(0, len(changed_paths), args['batchSize']):
+            update_collection(changed_paths[batch_start:batch_start + args['batchSize']])
+except KeyboardInterrupt:
+    logging.info("Watching stopped")
+finally:
+    files_watcher.close()
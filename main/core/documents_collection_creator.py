@@ -65,6 +65,8 @@ class DocumentCollectionCreator:
                                                last_modified_document_time,
                                                number_of_chunks)
         
+        self.__save_reader_state()
+
         if number_of_expected_documents != len(document_ids):
             logging.warning(f"Expected number of documents: {number_of_expected_documents} does not match actual number of read documents: {len(document_ids)}. Usually it happens when an error occurs during document reading. Please check logs for more details.")
         
@@ -80,11 +82,14 @@ class DocumentCollectionCreator:
         document_ids, number_of_expected_documents = log_execution_duration(lambda: self.__read_documents(),
                                                                             identifier=f"Reading documents for collection: {self.collection_name}")
         
-        if len(document_ids) == 0:
+        removed_document_ids = self.document_reader.get_removed_document_ids()
+        
+        if len(document_ids) == 0 and len(removed_document_ids) == 0:
             logging.warning(f"No documents found for collection update, so it will be not updated.")
+            self.__save_reader_state()
             return
     
-        last_modified_document_time, number_of_chunks = log_execution_duration(lambda: self.__index_documents_for_existing_collection(document_ids),
+        last_modified_document_time, number_of_chunks = log_execution_duration(lambda: self.__index_documents_for_existing_collection(document_ids, removed_document_ids),
                                                                                identifier=f"Indexing documents for collection: {self.collection_name}")
         
         manifest = self.__create_manifest_file(update_time, 
@@ -92,6 +97,8 @@ class DocumentCollectionCreator:
                                                number_of_chunks,
                                                existing_manifest=manifest)
         
+        self.__save_reader_state()
+
         if number_of_expected_documents != len(document_ids):
             logging.warning(f"Expected number of documents: {number_of_expected_documents} does not match actual number of read documents: {len(document_ids)}. Usually it happens when an error occurs during document reading. Please check logs for more details.")
         
@@ -122,13 +129,14 @@ class DocumentCollectionCreator:
                                       reverse_index_mapping,
                                       last_index_item_id)
 
-    def __index_documents_for_existing_collection(self, document_ids):
+    def __index_documents_for_existing_collection(self, document_ids, removed_document_ids):
         index_mapping = json.loads(self.persister.read_text_file(self.__build_index_mapping_path()))
         reverse_index_mapping = json.loads(self.persister.read_text_file(self.__build_reverse_index_mapping_path()))
         index_info = json.loads(self.persister.read_text_file(self.__build_index_info_path()))
         last_index_item_id = index_info["lastIndexItemId"]
 
-        self.__remove_documents_from_index(document_ids, index_mapping, reverse_index_mapping)
+        self.__remove_documents_from_index(document_ids + removed_document_ids, index_mapping, reverse_index_mapping)
+        self.__remove_documents(removed_document_ids)
 
         return self.__add_documents_to_index(document_ids,
                                       index_mapping,
@@ -181,7 +189,9 @@ class DocumentCollectionCreator:
                 indexer.index_texts(index_item_ids, items_to_index, items_metadata=items_metadata)
 
         for indexer in self.document_indexers:
-            if not indexer.is_persistent_storage():
+            if indexer.is_persistent_storage():
+                indexer.flush()
+            else:
                 self.persister.save_bin_file(indexer.serialize(), f"{self.__build_index_base_path(indexer)}/indexer")
 
         index_info = { "lastIndexItemId": last_index_item_id, }
@@ -220,6 +230,20 @@ class DocumentCollectionCreator:
             for indexer in self.document_indexers:
                 indexer.remove_ids(np.array(index_ids_to_remove))
 
+    def __remove_documents(self, document_ids):
+        for document_id in document_ids:
+            self.persister.remove_file(f"{self.collection_name}/documents/{document_id}.json")
+
+    def __save_reader_state(self):
+        reader_state = self.document_reader.get_state()
+        if reader_state is None:
+            return
+
+        self.persister.save_text_file(json.dumps(reader_state, ensure_ascii=False), self.__build_reader_state_path())
+
+    def __build_reader_state_path(self):
+        return f"{self.collection_name}/reader_state.json"
+
     def __build_reverse_index_mapping_path(self):
         return f"{self.collection_name}/indexes/reverse_index_document_mapping.json"
 
@@ -262,7 +286,7 @@ class DocumentCollectionCreator:
         if existing_manifest:
             return { **existing_manifest,
                 "updatedTime": update_time.isoformat(),
-                "lastModifiedDocumentTime": last_modified_document_time.isoformat(),
+                "lastModifiedDocumentTime": last_modified_document_time.isoformat() if last_modified_document_time else existing_manifest["lastModifiedDocumentTime"],
                 "numberOfDocuments": number_of_documents,
                 "numberOfChunks": number_of_chunks,
             }
@@ -22,16 +22,17 @@ class DocumentCollectionSearcher:
                include_text_content=False, 
                include_all_chunks_content=False, 
                include_matched_chunks_content=False,
-               filter: Optional[str] = None) -> dict:
+               filter: Optional[str] = None,
+               search_params: Optional[dict] = None) -> dict:
         if filter:
             for indexer in self.__indexers:
                 if not indexer.support_metadata():
-                    raise NotImplementedError(f"Filter works only with indexers that support metadata (chromadb), {indexer.get_name()} does not support it.")
+                    raise NotImplementedError(f"Filter works only with indexers that support metadata (FAISS, NumpyFlat, chromadb, SQLite BM25), {indexer.get_name()} does not support it.")
 
         if len(self.__indexers) == 1:
-            scores, indexes = self.__indexers[0].search(text, max_number_of_chunks, filter)
+            scores, indexes = self.__indexers[0].search(text, max_number_of_chunks, filter, search_params)
         else:
-            scores, indexes = self.__multi_index_search(text, max_number_of_chunks, filter)
+            scores, indexes = self.__multi_index_search(text, max_number_of_chunks, filter, search_params)
 
         results = self.__build_results(scores, indexes, include_text_content, include_all_chunks_content, include_matched_chunks_content)
         if max_number_of_documents:
@@ -43,11 +44,18 @@ class DocumentCollectionSearcher:
             "results": results,
         }
 
-    def __multi_index_search(self, text, max_number_of_chunks, filter):
+    def warm_up(self) -> None:
+        for indexer in self.__indexers:
+            indexer.warm_up()
+
+        if all(indexer.get_size() > 0 for indexer in self.__indexers):
+            self.search("warm up", max_number_of_chunks=1, include_matched_chunks_content=True)
+
+    def __multi_index_search(self, text, max_number_of_chunks, filter, search_params):
         rrf_scores = {}
 
         for indexer in self.__indexers:
-            scores, indexes = indexer.search(text, max_number_of_chunks, filter)
+            scores, indexes = indexer.search(text, max_number_of_chunks, filter, search_params)
             if len(indexes[0]) == 0:
                 continue
             for rank, chunk_id in enumerate(indexes[0]):
@@ -5,13 +5,13 @@ from main.persisters.disk_persister import DiskPersister
 
 from main.utils.performance import log_execution_duration
 
-def create_collection_creator(collection_name, indexers, document_reader, document_converter, use_cache=True) -> DocumentCollectionCreator:
+def create_collection_creator(collection_name, indexers, document_reader, document_converter, use_cache=True, embedding_workers=None) -> DocumentCollectionCreator:
     return log_execution_duration(
-        lambda: __create_collection_creator(collection_name, indexers, document_reader, document_converter, use_cache),
+        lambda: __create_collection_creator(collection_name, indexers, document_reader, document_converter, use_cache, embedding_workers),
         identifier=f"Preparing collection creator"
     )
 
-def __create_collection_creator(collection_name, indexers, document_reader, document_converter, use_cache):
+def __create_collection_creator(collection_name, indexers, document_reader, document_converter, use_cache, embedding_workers):
     if use_cache:
         cache_disk_persister = DiskPersister(base_path="./data/caches")
         result_document_reader = CacheReaderDecorator(reader=document_reader,
@@ -21,7 +21,7 @@ def __create_collection_creator(collection_name, indexers, document_reader, docu
 
     disk_persister = DiskPersister(base_path="./data/collections")
 
-    document_indexers = [create_indexer(indexer_name, collection_name=collection_name, persister=disk_persister) for indexer_name in indexers]
+    document_indexers = [create_indexer(indexer_name, collection_name=collection_name, persister=disk_persister, embedding_workers=embedding_workers) for indexer_name in indexers]
 
     return DocumentCollectionCreator(collection_name=collection_name, 
                                      document_reader=result_document_reader, 
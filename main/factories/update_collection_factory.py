@@ -3,29 +3,19 @@ from datetime import datetime, timedelta
 import json
 
 from main.persisters.disk_persister import DiskPersister
-from main.sources.jira.jira_document_reader import JiraDocumentReader
-from main.sources.jira.jira_document_converter import JiraDocumentConverter
-from main.sources.jira.jira_cloud_document_reader import JiraCloudDocumentReader
-from main.sources.jira.jira_cloud_document_converter import JiraCloudDocumentConverter
-from main.sources.confluence.confluence_document_reader import ConfluenceDocumentReader
-from main.sources.confluence.confluence_cloud_document_reader import ConfluenceCloudDocumentReader
-from main.sources.confluence.confluence_document_converter import ConfluenceDocumentConverter
-from main.sources.confluence.confluence_cloud_document_converter import ConfluenceCloudDocumentConverter
-from main.sources.files.files_document_reader import FilesDocumentReader
-from main.sources.files.files_document_converter import FilesDocumentConverter
 from main.indexes.indexer_factory import load_indexer
 from main.core.documents_collection_creator import DocumentCollectionCreator, OPERATION_TYPE
-from main.splitter.text_splitter import TextSplitter
+from main.splitter.text_splitter_factory import create_text_splitter
 
 from main.utils.performance import log_execution_duration
 
-def create_collection_updater(collection_name) -> DocumentCollectionCreator:
+def create_collection_updater(collection_name, changed_paths=None, embedding_workers=None) -> DocumentCollectionCreator:
     return log_execution_duration(
-        lambda: __create_collection_updater(collection_name),
+        lambda: __create_collection_updater(collection_name, changed_paths, embedding_workers),
         identifier=f"Preparing collection updater"
     )
 
-def __create_collection_updater(collection_name):
+def __create_collection_updater(collection_name, changed_paths, embedding_workers):
     disk_persister = DiskPersister(base_path="./data/collections")
 
     if not disk_persister.is_path_exists(collection_name):
@@ -33,9 +23,11 @@ def __create_collection_updater(collection_name):
 
     manifest = json.loads(disk_persister.read_text_file(f"{collection_name}/manifest.json"))
 
-    document_reader, document_converter = __create_reader_and_converter(manifest)
+    reader_state = __read_reader_state(collection_name, disk_persister)
 
-    document_indexers = [load_indexer(indexer["name"], collection_name, disk_persister) for indexer in manifest['indexers']]
+    document_reader, document_converter = __create_reader_and_converter(manifest, reader_state, changed_paths)
+
+    document_indexers = [load_indexer(indexer["name"], collection_name, disk_persister, embedding_workers=embedding_workers, for_update=True) for indexer in manifest['indexers']]
 
     return DocumentCollectionCreator(collection_name=collection_name,
                                      document_reader=document_reader, 
@@ -44,6 +36,13 @@ def __create_collection_updater(collection_name):
                                      persister=disk_persister,
                                      operation_type=OPERATION_TYPE.UPDATE)
 
+def __read_reader_state(collection_name, disk_persister):
+    reader_state_path = f"{collection_name}/reader_state.json"
+    if not disk_persister.is_path_exists(reader_state_path):
+        return None
+
+    return json.loads(disk_persister.read_text_file(reader_state_path))
+
 def __calculate_exact_update_time(manifest):
     return datetime.fromisoformat(manifest['lastModifiedDocumentTime'])
 
@@ -64,7 +63,7 @@ def __build_confluence_update_filter(manifest) -> str:
     watermark_cql = __format_update_watermark(manifest, "%Y-%m-%d %H:%M")
     return f'(created >= "{watermark_cql}" OR lastModified >= "{watermark_cql}")'
 
-def __create_reader_and_converter(manifest):
+def __create_reader_and_converter(manifest, reader_state, changed_paths):
     if manifest['reader']['type'] == 'jira':
         return __create_jira_reader_and_converter(manifest)
     
@@ -80,7 +79,7 @@ def __create_reader_and_converter(manifest):
         return [reader, converter]
     
     if manifest['reader']['type'] == 'localFiles':
-        reader, converter = __create_local_files_reader_and_converter(manifest)
+        reader, converter = __create_local_files_reader_and_converter(manifest, reader_state, changed_paths)
         return [reader, converter]
 
     raise Exception(f"Unknown document reader type: {manifest['reader']['type']}")
@@ -89,13 +88,18 @@ def __create_reader_and_converter(manifest):
 def __create_text_splitter(manifest):
     converter_config = manifest.get('converter', {})
     splitter_config = converter_config.get('splitter', {})
-    return TextSplitter(
+    return create_text_splitter(
+        splitter_type=splitter_config.get('type', 'characters'),
         chunk_size=splitter_config.get('chunkSize', 1000),
         chunk_overlap=splitter_config.get('chunkOverlap', 100),
+        model_name=splitter_config.get('model'),
     )
 
 
 def __create_jira_reader_and_converter(manifest):
+    from main.sources.jira.jira_document_reader import JiraDocumentReader
+    from main.sources.jira.jira_document_converter import JiraDocumentConverter
+
     token = os.environ.get('JIRA_TOKEN')
     login = os.environ.get('JIRA_LOGIN')
     password = os.environ.get('JIRA_PASSWORD')
@@ -112,6 +116,9 @@ def __create_jira_reader_and_converter(manifest):
     return reader,converter
 
 def __create_jira_cloud_reader_and_converter(manifest):
+    from main.sources.jira.jira_cloud_document_reader import JiraCloudDocumentReader
+    from main.sources.jira.jira_cloud_document_converter import JiraCloudDocumentConverter
+
     email = os.environ.get('ATLASSIAN_EMAIL')
     api_token = os.environ.get('ATLASSIAN_TOKEN')
 
@@ -129,6 +136,9 @@ def __create_jira_cloud_reader_and_converter(manifest):
     return reader,converter
 
 def __create_confluence_reader_and_converter(manifest):
+    from main.sources.confluence.confluence_document_reader import ConfluenceDocumentReader
+    from main.sources.confluence.confluence_document_converter import ConfluenceDocumentConverter
+
     token = os.environ.get('CONF_TOKEN')
     login = os.environ.get('CONF_LOGIN')
     password = os.environ.get('CONF_PASSWORD')
@@ -149,6 +159,9 @@ def __create_confluence_reader_and_converter(manifest):
     return reader,converter
 
 def __create_confluence_cloud_reader_and_converter(manifest):
+    from main.sources.confluence.confluence_cloud_document_reader import ConfluenceCloudDocumentReader
+    from main.sources.confluence.confluence_cloud_document_converter import ConfluenceCloudDocumentConverter
+
     email = os.environ.get('ATLASSIAN_EMAIL')
     api_token = os.environ.get('ATLASSIAN_TOKEN')
 
@@ -167,13 +180,20 @@ def __create_confluence_cloud_reader_and_converter(manifest):
     return reader,converter
 
 
-def __create_local_files_reader_and_converter(manifest):
+def __create_local_files_reader_and_converter(manifest, reader_state, changed_paths):
+    from main.sources.files.files_document_reader import FilesDocumentReader
+    from main.sources.files.files_document_converter import FilesDocumentConverter
+    from main.sources.files.parsed_content_cache import ParsedContentCache
+
     reader_config = manifest['reader']
     
     base_path = reader_config['basePath']
     include_patterns = reader_config.get('includePatterns', [".*"])
     exclude_patterns = reader_config.get('excludePatterns', [])
     fail_fast = reader_config.get('failFast', False)
+    streaming_threshold_in_bytes = reader_config.get('streamingThresholdInBytes', 100 * 1024 * 1024)
+    strategies_by_extension = reader_config.get('strategiesByExtension', {})
+    min_characters_per_page = reader_config.get('minCharactersPerPage', 20)
 
     update_time = __calculate_exact_update_time(manifest)
     
@@ -181,6 +201,12 @@ def __create_local_files_reader_and_converter(manifest):
                                 include_patterns=include_patterns,
                                 exclude_patterns=exclude_patterns,
                                 fail_fast=fail_fast,
-                                start_from_time=update_time)
+                                start_from_time=update_time,
+                                previous_state=reader_state,
+                                streaming_threshold_in_bytes=streaming_threshold_in_bytes,
+                                strategies_by_extension=strategies_by_extension,
+                                min_characters_per_page=min_characters_per_page,
+                                changed_paths=changed_paths,
+                                parsed_content_cache=ParsedContentCache(DiskPersister(base_path="./data/caches/parsed_files")))
     converter = FilesDocumentConverter(__create_text_splitter(manifest))
     return reader, converter
\ No newline at end of file
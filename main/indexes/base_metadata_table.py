@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+import numpy as np
+
+from main.indexes.filter_parser import FilterNode
+
+
+class BaseMetadataTable(ABC):
+    @abstractmethod
+    def add(self, ids: np.ndarray, items_metadata: Optional[list[dict]]) -> None: ...
+
+    @abstractmethod
+    def remove(self, ids: np.ndarray) -> None: ...
+
+    @abstractmethod
+    def filter(self, node: FilterNode) -> np.ndarray: ...
+
+    @abstractmethod
+    def is_changed(self) -> bool: ...
+
+    @abstractmethod
+    def save(self, path: str, compact: bool = False) -> None: ...
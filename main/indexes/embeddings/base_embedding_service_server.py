@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+
+class BaseEmbeddingServiceServer(ABC):
+    @abstractmethod
+    def serve_forever(self) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
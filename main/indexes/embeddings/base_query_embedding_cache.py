@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+import numpy as np
+
+
+class BaseQueryEmbeddingCache(ABC):
+    @abstractmethod
+    def get(self, model_key: str, text: str) -> Optional[np.ndarray]: ...
+
+    @abstractmethod
+    def put(self, model_key: str, text: str, embedding: np.ndarray) -> None: ...
+
+    @abstractmethod
+    def get_stats(self) -> dict: ...
@@ -0,0 +1,23 @@
+import numpy as np
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings.base_query_embedding_cache import BaseQueryEmbeddingCache
+
+class CachedQueryEmbedderDecorator(BaseEmbedder):
+    def __init__(self, embedder: BaseEmbedder, cache: BaseQueryEmbeddingCache, model_key: str):
+        self.embedder = embedder
+        self.cache = cache
+        self.model_key = model_key
+
+    def embed(self, text) -> np.ndarray:
+        if not isinstance(text, str):
+            return self.embedder.embed(text)
+
+        embedding = self.cache.get(self.model_key, text)
+        if embedding is None:
+            embedding = self.embedder.embed(text)
+            self.cache.put(self.model_key, text, embedding)
+
+        return embedding
+
+    def get_number_of_dimensions(self) -> int:
+        return self.embedder.get_number_of_dimensions()
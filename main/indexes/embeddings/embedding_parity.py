@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def compare_embeddings(reference_embeddings: np.ndarray, candidate_embeddings: np.ndarray, number_of_neighbours: int = 10) -> dict:
+    reference_embeddings = __normalize(reference_embeddings)
+    candidate_embeddings = __normalize(candidate_embeddings)
+
+    cosine_similarities = np.sum(reference_embeddings * candidate_embeddings, axis=1)
+
+    number_of_neighbours = min(number_of_neighbours, len(reference_embeddings) - 1)
+    neighbours_overlap = None
+    if number_of_neighbours > 0:
+        reference_neighbours = __find_neighbours(reference_embeddings, number_of_neighbours)
+        candidate_neighbours = __find_neighbours(candidate_embeddings, number_of_neighbours)
+        neighbours_overlap = float(np.mean([
+            len(set(reference_row) & set(candidate_row)) / number_of_neighbours
+            for reference_row, candidate_row in zip(reference_neighbours, candidate_neighbours)
+        ]))
+
+    return {
+        "numberOfTexts": len(reference_embeddings),
+        "meanCosineSimilarity": float(np.mean(cosine_similarities)),
+        "minCosineSimilarity": float(np.min(cosine_similarities)),
+        "numberOfNeighbours": number_of_neighbours,
+        "meanNeighboursOverlap": neighbours_overlap,
+    }
+
+
+def __normalize(embeddings):
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def __find_neighbours(normalized_embeddings, number_of_neighbours):
+    similarities = normalized_embeddings @ normalized_embeddings.T
+    np.fill_diagonal(similarities, -np.inf)
+    return np.argpartition(-similarities, number_of_neighbours - 1, axis=1)[:, :number_of_neighbours]
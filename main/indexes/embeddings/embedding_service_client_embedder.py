@@ -0,0 +1,99 @@
+import time
+import socket
+import logging
+import threading
+from typing import Callable
+
+import numpy as np
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings.embedding_service_protocol import send_message, receive_message
+
+
+class EmbeddingServiceClientEmbedder(BaseEmbedder):
+    def __init__(self,
+                 socket_path: str,
+                 model: str,
+                 fallback_embedder_factory: Callable[[], BaseEmbedder],
+                 timeout_in_seconds: float = 300.0,
+                 reconnect_interval_in_seconds: float = 30.0,
+                 max_texts_per_request: int = 32):
+        self.socket_path = socket_path
+        self.model = model
+        self.fallback_embedder_factory = fallback_embedder_factory
+        self.timeout_in_seconds = timeout_in_seconds
+        self.reconnect_interval_in_seconds = reconnect_interval_in_seconds
+        self.max_texts_per_request = max_texts_per_request
+
+        self.__connection = None
+        self.__lock = threading.Lock()
+        self.__fallback_embedder = None
+        self.__service_unavailable_until = 0.0
+        self.__number_of_dimensions = None
+
+    def embed(self, text) -> np.ndarray:
+        texts = [text] if isinstance(text, str) else list(text)
+
+        # Service batches queries of all clients in one thread, so large batches of collection builds would block them
+        if len(texts) > self.max_texts_per_request:
+            return self.__get_fallback_embedder().embed(text)
+
+        response = self.__request({"type": "embed", "model": self.model, "texts": texts})
+        if response is None:
+            return self.__get_fallback_embedder().embed(text)
+
+        header, payload = response
+        embeddings = np.frombuffer(payload, dtype=np.float32).reshape(header["shape"])
+        return embeddings[0] if isinstance(text, str) else embeddings
+
+    def get_number_of_dimensions(self) -> int:
+        if self.__number_of_dimensions is None:
+            response = self.__request({"type": "dimensions", "model": self.model})
+            if response is None:
+                return self.__get_fallback_embedder().get_number_of_dimensions()
+            self.__number_of_dimensions = response[0]["dimensions"]
+
+        return self.__number_of_dimensions
+
+    def __request(self, header):
+        with self.__lock:
+            if time.monotonic() < self.__service_unavailable_until:
+                return None
+
+            try:
+                connection = self.__get_connection()
+                send_message(connection, header)
+                response_header, payload = receive_message(connection)
+            except OSError as error:
+                self.__close_connection()
+                self.__service_unavailable_until = time.monotonic() + self.reconnect_interval_in_seconds
+                logging.warning(f"Embedding service on {self.socket_path} is unavailable ({error}), embeddings are calculated in the current process")
+                return None
+
+        if "error" in response_header:
+            raise Exception(f"Embedding service failed to embed texts: {response_header['error']}")
+
+        return response_header, payload
+
+    def __get_connection(self):
+        if self.__connection is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout_in_seconds)
+            try:
+                connection.connect(self.socket_path)
+            except OSError:
+                connection.close()
+                raise
+            self.__connection = connection
+
+        return self.__connection
+
+    def __close_connection(self):
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __get_fallback_embedder(self):
+        if self.__fallback_embedder is None:
+            self.__fallback_embedder = self.fallback_embedder_factory()
+
+        return self.__fallback_embedder
@@ -0,0 +1,29 @@
+import json
+import socket
+import struct
+
+__HEADER_SIZE = struct.Struct("!II")
+
+
+def send_message(connection: socket.socket, header: dict, payload: bytes = b"") -> None:
+    encoded_header = json.dumps(header).encode("utf-8")
+    connection.sendall(__HEADER_SIZE.pack(len(encoded_header), len(payload)) + encoded_header + payload)
+
+
+def receive_message(connection: socket.socket) -> tuple[dict, bytes]:
+    header_size, payload_size = __HEADER_SIZE.unpack(__receive_exactly(connection, __HEADER_SIZE.size))
+    header = json.loads(__receive_exactly(connection, header_size).decode("utf-8"))
+    return header, __receive_exactly(connection, payload_size)
+
+
+def __receive_exactly(connection, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received_size = 0
+    while received_size < size:
+        chunk_size = connection.recv_into(view[received_size:])
+        if chunk_size == 0:
+            raise ConnectionError("Connection closed by the other side")
+        received_size += chunk_size
+
+    return bytes(buffer)
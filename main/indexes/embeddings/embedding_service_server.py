@@ -0,0 +1,156 @@
+import os
+import queue
+import socket
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings.base_embedding_service_server import BaseEmbeddingServiceServer
+from main.indexes.embeddings.embedding_service_protocol import send_message, receive_message
+
+
+class EmbeddingServiceServer(BaseEmbeddingServiceServer):
+    def __init__(self,
+                 socket_path: str,
+                 embedder_factory: Callable[[str], BaseEmbedder],
+                 max_batch_size: int = 256,
+                 max_batch_delay_in_seconds: float = 0.005,
+                 socket_permissions: int = 0o660):
+        self.socket_path = socket_path
+        self.embedder_factory = embedder_factory
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay_in_seconds = max_batch_delay_in_seconds
+        self.socket_permissions = socket_permissions
+
+        self.__embedders = {}
+        self.__embedders_lock = threading.Lock()
+        self.__requests = queue.Queue()
+        self.__server_socket = None
+        self.__stopped = threading.Event()
+
+    def serve_forever(self) -> None:
+        self.__server_socket = self.__bind_socket()
+        threading.Thread(target=self.__process_batches, name="embedding-batcher", daemon=True).start()
+        logging.info(f"Embedding service is listening on {self.socket_path}")
+
+        try:
+            while not self.__stopped.is_set():
+                try:
+                    connection, _ = self.__server_socket.accept()
+                except OSError:
+                    if self.__stopped.is_set():
+                        break
+                    raise
+                threading.Thread(target=self.__handle_connection, args=(connection,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.__stopped.set()
+        if self.__server_socket is not None:
+            self.__server_socket.close()
+            self.__server_socket = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def __bind_socket(self):
+        if os.path.exists(self.socket_path):
+            if self.__is_socket_in_use():
+                raise Exception(f"Embedding service is already running on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server_socket.bind(self.socket_path)
+        os.chmod(self.socket_path, self.socket_permissions)
+        server_socket.listen()
+        return server_socket
+
+    def __is_socket_in_use(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe_socket:
+            try:
+                probe_socket.connect(self.socket_path)
+                return True
+            except (ConnectionRefusedError, FileNotFoundError):
+                return False
+
+    def __handle_connection(self, connection):
+        with connection:
+            while True:
+                try:
+                    header, _ = receive_message(connection)
+                except (ConnectionError, OSError):
+                    return
+
+                try:
+                    response_header, payload = self.__handle_request(header)
+                except Exception as error:
+                    logging.exception(f"Error handling embedding request for {header.get('model')}")
+                    response_header, payload = {"error": str(error)}, b""
+
+                try:
+                    send_message(connection, response_header, payload)
+                except OSError:
+                    return
+
+    def __handle_request(self, header):
+        if header["type"] == "dimensions":
+            return {"dimensions": self.__get_embedder(header["model"]).get_number_of_dimensions()}, b""
+
+        if header["type"] == "embed":
+            future = Future()
+            self.__requests.put((header["model"], header["texts"], future))
+            embeddings = np.ascontiguousarray(future.result(), dtype=np.float32)
+            return {"shape": list(embeddings.shape)}, embeddings.tobytes()
+
+        raise ValueError(f"Unknown request type: {header['type']}")
+
+    def __process_batches(self):
+        while not self.__stopped.is_set():
+            requests = self.__collect_batch()
+
+            requests_by_model = {}
+            for model, texts, future in requests:
+                requests_by_model.setdefault(model, []).append((texts, future))
+
+            for model, model_requests in requests_by_model.items():
+                self.__embed_batch(model, model_requests)
+
+    def __collect_batch(self):
+        requests = [self.__requests.get()]
+        number_of_texts = len(requests[0][1])
+
+        while number_of_texts < self.max_batch_size:
+            try:
+                request = self.__requests.get(timeout=self.max_batch_delay_in_seconds)
+            except queue.Empty:
+                break
+            requests.append(request)
+            number_of_texts += len(request[1])
+
+        return requests
+
+    def __embed_batch(self, model, model_requests):
+        texts = [text for request_texts, _ in model_requests for text in request_texts]
+        try:
+            embeddings = self.__get_embedder(model).embed(texts) if texts else np.empty((0, 0), dtype=np.float32)
+        except Exception as error:
+            for _, future in model_requests:
+                future.set_exception(error)
+            return
+
+        offset = 0
+        for request_texts, future in model_requests:
+            future.set_result(embeddings[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+    def __get_embedder(self, model):
+        with self.__embedders_lock:
+            if model not in self.__embedders:
+                logging.info(f"Loading embedding model {model}")
+                self.__embedders[model] = self.embedder_factory(model)
+
+        return self.__embedders[model]
@@ -0,0 +1,32 @@
+import os
+import queue
+
+import numpy as np
+
+__embedder = None
+
+
+def initialize_worker(model_name: str, use_onnx_int8: bool, core_sets_queue) -> None:
+    global __embedder
+
+    import torch
+    from main.indexes.embeddings.sentence_embeder import SentenceEmbedder
+    from main.indexes.embeddings.onnx_embedder import OnnxEmbedder
+
+    try:
+        cores = core_sets_queue.get(timeout=10)
+    except queue.Empty:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(len(cores))
+
+    __embedder = OnnxEmbedder(model_name=model_name) if use_onnx_int8 else SentenceEmbedder(model_name=model_name)
+
+
+def embed_texts(texts: list[str]) -> np.ndarray:
+    return __embedder.embed(texts)
+
+
+def get_number_of_dimensions() -> int:
+    return __embedder.get_number_of_dimensions()
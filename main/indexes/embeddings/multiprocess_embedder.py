@@ -0,0 +1,73 @@
+import os
+import math
+import threading
+import multiprocessing
+import logging
+import numpy as np
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings import embedding_worker
+
+class MultiprocessEmbedder(BaseEmbedder):
+    def __init__(self, model_name: str, number_of_workers: int, use_onnx_int8: bool = False, min_texts_per_shard: int = 64, shards_per_worker: int = 4):
+        self.model_name = model_name
+        self.use_onnx_int8 = use_onnx_int8
+        self.number_of_workers = number_of_workers
+        self.min_texts_per_shard = min_texts_per_shard
+        self.shards_per_worker = shards_per_worker
+
+        self.__pool = None
+        self.__pool_lock = threading.Lock()
+        self.__number_of_dimensions = None
+
+    def embed(self, text) -> np.ndarray:
+        if isinstance(text, str):
+            return self.__get_pool().apply(embedding_worker.embed_texts, ([text],))[0]
+
+        texts = list(text)
+        if not texts:
+            return np.empty((0, self.get_number_of_dimensions()), dtype=np.float32)
+
+        number_of_shards = max(1, min(self.number_of_workers * self.shards_per_worker, len(texts) // self.min_texts_per_shard))
+        shard_size = math.ceil(len(texts) / number_of_shards)
+        shards = [texts[shard_start:shard_start + shard_size] for shard_start in range(0, len(texts), shard_size)]
+
+        return np.concatenate(self.__get_pool().map(embedding_worker.embed_texts, shards, chunksize=1))
+
+    def get_number_of_dimensions(self) -> int:
+        if self.__number_of_dimensions is None:
+            self.__number_of_dimensions = self.__get_pool().apply(embedding_worker.get_number_of_dimensions)
+
+        return self.__number_of_dimensions
+
+    def __get_pool(self):
+        if self.__pool is not None:
+            return self.__pool
+
+        with self.__pool_lock:
+            if self.__pool is None:
+                self.__pool = self.__create_pool()
+
+        return self.__pool
+
+    def __create_pool(self):
+        context = multiprocessing.get_context("spawn")
+
+        core_sets_queue = context.Queue()
+        core_sets = self.__split_cores()
+        for cores in core_sets:
+            core_sets_queue.put(cores)
+
+        logging.info(f"Starting {self.number_of_workers} embedding workers for {self.model_name} with core sets: {core_sets}")
+        return context.Pool(processes=self.number_of_workers,
+                            initializer=embedding_worker.initialize_worker,
+                            initargs=(self.model_name, self.use_onnx_int8, core_sets_queue))
+
+    def __split_cores(self):
+        available_cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+
+        core_sets = []
+        for worker_number in range(self.number_of_workers):
+            cores = available_cores[worker_number * len(available_cores) // self.number_of_workers:(worker_number + 1) * len(available_cores) // self.number_of_workers]
+            core_sets.append(cores or [available_cores[worker_number % len(available_cores)]])
+
+        return core_sets
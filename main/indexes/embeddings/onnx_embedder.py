@@ -0,0 +1,64 @@
+import os
+import shutil
+import logging
+import platform
+from sentence_transformers import SentenceTransformer
+from main.indexes.embeddings.sentence_embeder import SentenceEmbedder
+
+class OnnxEmbedder(SentenceEmbedder):
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2", models_path="./data/models", **kwargs):
+        super().__init__(model_name=model_name, model=self.__load_quantized_model(model_name, models_path), **kwargs)
+
+    def __load_quantized_model(self, model_name, models_path):
+        export_path = os.path.join(models_path, f"{model_name.replace('/', '_slash_')}_onnx_int8")
+        quantization_config = self.__choose_quantization_config()
+        file_name = f"onnx/model_qint8_{quantization_config}.onnx"
+
+        if not os.path.exists(os.path.join(export_path, file_name)):
+            self.__export_quantized_model(model_name, export_path, quantization_config, file_name)
+
+        return SentenceTransformer(export_path, backend="onnx", model_kwargs={"file_name": file_name})
+
+    def __export_quantized_model(self, model_name, export_path, quantization_config, file_name):
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        logging.info(f"Exporting {model_name} to ONNX with int8 dynamic quantization ({quantization_config}) into {export_path}")
+
+        # Several embedding worker processes can export the same model at the same time
+        temp_export_path = f"{export_path}.{os.getpid()}.tmp"
+        shutil.rmtree(temp_export_path, ignore_errors=True)
+
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save(temp_export_path)
+        export_dynamic_quantized_onnx_model(model, quantization_config, temp_export_path)
+
+        if not os.path.exists(os.path.join(export_path, file_name)):
+            shutil.rmtree(export_path, ignore_errors=True)
+            try:
+                os.replace(temp_export_path, export_path)
+            except OSError:
+                if not os.path.exists(os.path.join(export_path, file_name)):
+                    raise
+        shutil.rmtree(temp_export_path, ignore_errors=True)
+
+    def __choose_quantization_config(self):
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            return "arm64"
+
+        cpu_flags = self.__read_cpu_flags()
+        if "avx512_vnni" in cpu_flags:
+            return "avx512_vnni"
+        if "avx512f" in cpu_flags:
+            return "avx512"
+        return "avx2"
+
+    def __read_cpu_flags(self):
+        if not os.path.exists("/proc/cpuinfo"):
+            return set()
+
+        with open("/proc/cpuinfo") as cpu_info_file:
+            for line in cpu_info_file:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+
+        return set()
@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+from main.indexes.embeddings.base_query_embedding_cache import BaseQueryEmbeddingCache
+
+
+class QueryEmbeddingCache(BaseQueryEmbeddingCache):
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+
+        self.__embeddings = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, model_key: str, text: str) -> Optional[np.ndarray]:
+        key = (model_key, self.__normalize(text))
+        with self.__lock:
+            embedding = self.__embeddings.get(key)
+            if embedding is None:
+                self.__misses += 1
+                return None
+
+            self.__embeddings.move_to_end(key)
+            self.__hits += 1
+            return embedding
+
+    def put(self, model_key: str, text: str, embedding: np.ndarray) -> None:
+        embedding = np.array(embedding, copy=True)
+        embedding.flags.writeable = False
+
+        key = (model_key, self.__normalize(text))
+        with self.__lock:
+            self.__embeddings[key] = embedding
+            self.__embeddings.move_to_end(key)
+            while len(self.__embeddings) > self.max_size:
+                self.__embeddings.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            number_of_requests = self.__hits + self.__misses
+            return {
+                "size": len(self.__embeddings),
+                "maxSize": self.max_size,
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hitRate": round(self.__hits / number_of_requests, 4) if number_of_requests else 0.0,
+            }
+
+    def __normalize(self, text):
+        return " ".join(text.split())
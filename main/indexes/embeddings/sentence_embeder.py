@@ -1,14 +1,40 @@
+import time
+import logging
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings.token_budget_batching import build_token_budget_batches
 
 class SentenceEmbedder(BaseEmbedder):
-    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2", max_tokens_per_batch=16384, max_batch_size=256, model: SentenceTransformer = None):
         self.model_name = model_name
-        self.model = SentenceTransformer(model_name)
+        self.model = model or SentenceTransformer(model_name)
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_batch_size = max_batch_size
 
     def embed(self, text) -> np.ndarray:
-        return self.model.encode(text)
+        if isinstance(text, str) or len(text) <= 1:
+            return self.model.encode(text)
+
+        start_time = time.perf_counter()
+
+        token_lengths = self.__count_tokens(text)
+        embeddings = np.empty((len(text), self.get_number_of_dimensions()), dtype=np.float32)
+        for batch_indexes in build_token_budget_batches(token_lengths, self.max_tokens_per_batch, self.max_batch_size):
+            embeddings[batch_indexes] = self.model.encode([text[index] for index in batch_indexes], batch_size=len(batch_indexes))
+
+        duration = time.perf_counter() - start_time
+        logging.info(f"Embedded {len(text)} texts ({sum(token_lengths)} tokens) by {self.model_name} in {duration:.2f} seconds, {sum(token_lengths) / duration:.0f} tokens/sec")
+
+        return embeddings
     
     def get_number_of_dimensions(self) -> int:
         return self.model.get_sentence_embedding_dimension()
+
+    def __count_tokens(self, texts):
+        input_ids = self.model.tokenizer(list(texts),
+                                         truncation=True,
+                                         max_length=self.model.max_seq_length,
+                                         return_attention_mask=False,
+                                         return_token_type_ids=False)["input_ids"]
+        return [len(text_input_ids) for text_input_ids in input_ids]
@@ -0,0 +1,15 @@
+def build_token_budget_batches(token_lengths: list[int], max_tokens_per_batch: int, max_batch_size: int) -> list[list[int]]:
+    sorted_indexes = sorted(range(len(token_lengths)), key=lambda index: token_lengths[index], reverse=True)
+
+    batches = []
+    for index in sorted_indexes:
+        if batches:
+            batch = batches[-1]
+            padded_length = max(token_lengths[batch[0]], 1)
+            if len(batch) < max_batch_size and (len(batch) + 1) * padded_length <= max_tokens_per_batch:
+                batch.append(index)
+                continue
+
+        batches.append([index])
+
+    return batches
@@ -1,16 +1,35 @@
 import json
 import os
+import re
+import importlib
 import threading
-from typing import List
+from typing import List, Optional
 from .indexers.base_indexer import BaseIndexer
-from .indexers.faiss_indexer import FaissIndexer
-from .indexers.chroma_indexer import ChromaIndexer
-from .indexers.sqllite_indexer import SqlliteIndexer
 from .embeddings.base_embedder import BaseEmbedder
-from .embeddings.sentence_embeder import SentenceEmbedder
+from .embeddings.query_embedding_cache import QueryEmbeddingCache
+from .embeddings.cached_query_embedder_decorator import CachedQueryEmbedderDecorator
+from main.utils.file_lock import lock_file
+
+__ONNX_INT8_EMBEDDINGS_PREFIX = "embeddings_onnx_int8_"
+__FAISS_INDEXER_PREFIX = "indexer_FAISS_"
+__CHROMA_INDEXER_TYPE = "indexer_ChromaDb"
+
+# Heavy dependencies (faiss, chromadb, sentence_transformers) are imported only when a component is created
+__COMPONENT_CLASS_PATHS = {
+    "indexer_FAISS": "main.indexes.indexers.faiss_indexer.FaissIndexer",
+    "faiss_segments_storage": "main.indexes.indexers.faiss_segments_storage.FaissSegmentsStorage",
+    "indexer_ChromaDb": "main.indexes.indexers.chroma_indexer.ChromaIndexer",
+    "indexer_NumpyFlat": "main.indexes.indexers.numpy_flat_indexer.NumpyFlatIndexer",
+    "indexer_SqlLiteBM25": "main.indexes.indexers.sqllite_indexer.SqlliteIndexer",
+    "embedder_sentence": "main.indexes.embeddings.sentence_embeder.SentenceEmbedder",
+    "embedder_onnx_int8": "main.indexes.embeddings.onnx_embedder.OnnxEmbedder",
+    "embedder_multiprocess": "main.indexes.embeddings.multiprocess_embedder.MultiprocessEmbedder",
+    "embedder_service_client": "main.indexes.embeddings.embedding_service_client_embedder.EmbeddingServiceClientEmbedder",
+}
 
 __embedder_cache: dict[str, BaseEmbedder] = {}
 __embedder_cache_lock = threading.Lock()
+__query_embedding_cache = QueryEmbeddingCache()
 
 def __get_available_indexes(collection_name, persister):
     manifest_path = f"{collection_name}/manifest.json"
@@ -34,67 +53,144 @@ def __split_indexer_name(indexer_name):
         return parts[0], parts[1]
     raise ValueError(f"Invalid indexer name format: {indexer_name}")
 
-def __create_sentence_embedder(embedding_model) -> BaseEmbedder:
-    if embedding_model in __embedder_cache:
-        return __embedder_cache[embedding_model]
+def __create_sentence_embedder(embedding_model, embedding_workers=None) -> BaseEmbedder:
+    cache_key = f"{embedding_model}__workers{embedding_workers}" if embedding_workers else embedding_model
+    if cache_key in __embedder_cache:
+        return __embedder_cache[cache_key]
 
     with __embedder_cache_lock:
-        if embedding_model not in __embedder_cache:
-            __embedder_cache[embedding_model] = __create_sentence_embedder_uncached(embedding_model)
+        if cache_key not in __embedder_cache:
+            __embedder_cache[cache_key] = CachedQueryEmbedderDecorator(embedder=__create_sentence_embedder_uncached(embedding_model, embedding_workers),
+                                                                       cache=__query_embedding_cache,
+                                                                       model_key=__build_model_key(embedding_model))
+
+    return __embedder_cache[cache_key]
+
+def __create_sentence_embedder_uncached(embedding_model, embedding_workers) -> BaseEmbedder:
+    embedding_service_socket = os.environ.get("EMBEDDING_SERVICE_SOCKET")
+    if embedding_service_socket and not embedding_workers:
+        return __get_component_class("embedder_service_client")(socket_path=embedding_service_socket,
+                                                                model=embedding_model,
+                                                                fallback_embedder_factory=lambda: create_in_process_embedder(embedding_model))
+
+    return create_in_process_embedder(embedding_model, embedding_workers)
+
+def create_in_process_embedder(embedding_model, embedding_workers=None) -> BaseEmbedder:
+    model_name = __parse_embedding_model_name(embedding_model)
+    is_onnx_int8 = embedding_model.startswith(__ONNX_INT8_EMBEDDINGS_PREFIX)
+
+    if embedding_workers:
+        return __get_component_class("embedder_multiprocess")(model_name=model_name, number_of_workers=embedding_workers, use_onnx_int8=is_onnx_int8)
 
-    return __embedder_cache[embedding_model]
+    if is_onnx_int8:
+        return __get_component_class("embedder_onnx_int8")(model_name=model_name)
 
-def __create_sentence_embedder_uncached(embedding_model) -> BaseEmbedder:
-    model = __create_sentence_embedder_by_old_embedding_model_name(embedding_model)
-    if model is not None:
-        return model
+    return __get_component_class("embedder_sentence")(model_name=model_name)
 
-    parsed_model_name = embedding_model.replace("embeddings_", "").replace("_slash_", "/")
-    return SentenceEmbedder(model_name=parsed_model_name)
+def __get_component_class(component_type):
+    module_name, class_name = __COMPONENT_CLASS_PATHS[component_type].rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
 
-def __create_sentence_embedder_by_old_embedding_model_name(embedding_model):
+def __build_model_key(embedding_model):
+    model_name = __parse_embedding_model_name(embedding_model)
+    return f"onnx_int8:{model_name}" if embedding_model.startswith(__ONNX_INT8_EMBEDDINGS_PREFIX) else model_name
+
+def __parse_embedding_model_name(embedding_model):
+    embedding_model = embedding_model.replace(__ONNX_INT8_EMBEDDINGS_PREFIX, "embeddings_", 1)
+
+    model_name = __get_model_name_by_old_embedding_model_name(embedding_model)
+    if model_name is not None:
+        return model_name
+
+    return embedding_model.replace("embeddings_", "").replace("_slash_", "/")
+
+def __get_model_name_by_old_embedding_model_name(embedding_model):
     if embedding_model == "embeddings_all-MiniLM-L6-v2":
-        return SentenceEmbedder(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        return "sentence-transformers/all-MiniLM-L6-v2"
     
     if embedding_model == "embeddings_all-mpnet-base-v2":
-        return SentenceEmbedder(model_name="sentence-transformers/all-mpnet-base-v2")
+        return "sentence-transformers/all-mpnet-base-v2"
     
     if embedding_model == "embeddings_multi-qa-distilbert-cos-v1":
-        return SentenceEmbedder(model_name="sentence-transformers/multi-qa-distilbert-cos-v1")
+        return "sentence-transformers/multi-qa-distilbert-cos-v1"
 
     if embedding_model == "embeddings_bge-m3":
-        return SentenceEmbedder(model_name="BAAI/bge-m3")
+        return "BAAI/bge-m3"
     
     return None
 
-def create_indexer(indexer_name, collection_name=None, persister=None) -> BaseIndexer:
+def get_query_embedding_cache_stats() -> dict:
+    return __query_embedding_cache.get_stats()
+
+def find_embedding_model_name(indexer_names) -> Optional[str]:
+    for indexer_name in indexer_names:
+        _, embedding_model = __split_indexer_name(indexer_name)
+        if embedding_model is not None:
+            return __parse_embedding_model_name(embedding_model)
+
+    return None
+
+def create_indexer(indexer_name, collection_name=None, persister=None, embedding_workers=None) -> BaseIndexer:
     indexer_type, embedding_model = __split_indexer_name(indexer_name)
 
-    if indexer_type == "indexer_FAISS_IndexFlatL2":
-        return FaissIndexer(indexer_name, __create_sentence_embedder(embedding_model))
+    if indexer_type.startswith(__FAISS_INDEXER_PREFIX):
+        index_type, index_parameters = __parse_faiss_indexer_type(indexer_type)
+        return __get_component_class("indexer_FAISS")(indexer_name,
+                                                      __create_sentence_embedder(embedding_model, embedding_workers),
+                                                      storage_path=__build_storage_path(indexer_name, collection_name, persister),
+                                                      index_type=index_type,
+                                                      index_parameters=index_parameters)
     
-    if indexer_type == "indexer_ChromaDb":
+    if __is_chroma_indexer_type(indexer_type):
+        storage_path = __build_storage_path(indexer_name, collection_name, persister)
+        return __get_component_class(__CHROMA_INDEXER_TYPE)(indexer_name,
+                                                            __create_sentence_embedder(embedding_model, embedding_workers),
+                                                            storage_path,
+                                                            index_parameters=__parse_chroma_indexer_type(indexer_type))
+
+    if indexer_type == "indexer_NumpyFlat":
         storage_path = __build_storage_path(indexer_name, collection_name, persister)
-        return ChromaIndexer(indexer_name, __create_sentence_embedder(embedding_model), storage_path)
+        return __get_component_class(indexer_type)(indexer_name, __create_sentence_embedder(embedding_model, embedding_workers), storage_path)
 
     if indexer_type == "indexer_SqlLiteBM25":
         storage_path = __build_storage_path(indexer_name, collection_name, persister)
-        return SqlliteIndexer(indexer_name, storage_path)
+        return __get_component_class(indexer_type)(indexer_name, storage_path, bulk_load=True)
 
     raise ValueError(f"Unknown indexer name: {indexer_name}")
 
+def __parse_faiss_indexer_type(indexer_type):
+    index_type, *parameter_tokens = indexer_type[len(__FAISS_INDEXER_PREFIX):].split("_")
+    return index_type, __parse_index_parameters(indexer_type, parameter_tokens)
+
+def __is_chroma_indexer_type(indexer_type):
+    return indexer_type == __CHROMA_INDEXER_TYPE or indexer_type.startswith(f"{__CHROMA_INDEXER_TYPE}_")
+
+def __parse_chroma_indexer_type(indexer_type):
+    parameter_tokens = indexer_type[len(__CHROMA_INDEXER_TYPE) + 1:].split("_") if indexer_type != __CHROMA_INDEXER_TYPE else []
+    return __parse_index_parameters(indexer_type, parameter_tokens)
+
+def __parse_index_parameters(indexer_type, parameter_tokens):
+    index_parameters = {}
+    for parameter_token in parameter_tokens:
+        match = re.fullmatch(r"([A-Za-z]+)(\d+)", parameter_token)
+        if not match:
+            raise ValueError(f"Invalid index parameter '{parameter_token}' in indexer type: {indexer_type}, expected format is name followed by number (e.g. M32)")
+        index_parameters[match.group(1)] = int(match.group(2))
+
+    return index_parameters
+
 def __build_storage_path(indexer_name, collection_name, persister):
     return persister.get_absolute_path(f"{collection_name}/indexes/{indexer_name}/storage")
 
-def load_indexers(index_names, collection_name, persister) -> List[BaseIndexer]:
+def load_indexers(index_names, collection_name, persister, for_update=False) -> List[BaseIndexer]:
     if index_names is None:
         names = __get_available_indexes(collection_name, persister)
     else:
         names = index_names
-    return [load_indexer(name, collection_name, persister) for name in names]
+    return [load_indexer(name, collection_name, persister, for_update=for_update) for name in names]
 
 
-def load_indexer(indexer_name, collection_name, persister) -> BaseIndexer:
+def load_indexer(indexer_name, collection_name, persister, embedding_workers=None, for_update=False) -> BaseIndexer:
     if indexer_name is None:
         available_indexes = __get_available_indexes(collection_name, persister)
         
@@ -108,28 +204,57 @@ def load_indexer(indexer_name, collection_name, persister) -> BaseIndexer:
     
     indexer_type, embedding_model = __split_indexer_name(indexer_name)
 
-    if indexer_type == "indexer_FAISS_IndexFlatL2":
-        serialized_index = persister.read_bin_file(f"{collection_name}/indexes/{indexer_name}/indexer")
-        return FaissIndexer(indexer_name, __create_sentence_embedder(embedding_model), serialized_index)
+    if indexer_type.startswith(__FAISS_INDEXER_PREFIX):
+        return __load_faiss_indexer(indexer_name, indexer_type, embedding_model, collection_name, persister, embedding_workers, for_update)
     
-    if indexer_type == "indexer_ChromaDb":
+    if __is_chroma_indexer_type(indexer_type):
         storage_path = __build_storage_path(indexer_name, collection_name, persister)
         storage_dir_exists = os.path.isdir(storage_path)
+        index_parameters = __parse_chroma_indexer_type(indexer_type)
 
         if storage_dir_exists:
-            return ChromaIndexer(indexer_name, __create_sentence_embedder(embedding_model), storage_path)
+            return __get_component_class(__CHROMA_INDEXER_TYPE)(indexer_name, __create_sentence_embedder(embedding_model, embedding_workers), storage_path, index_parameters=index_parameters)
 
         serialized_data = persister.read_bin_file(f"{collection_name}/indexes/{indexer_name}/indexer")
-        return ChromaIndexer(indexer_name, __create_sentence_embedder(embedding_model), storage_path, serialized_data)
+        return __get_component_class(__CHROMA_INDEXER_TYPE)(indexer_name, __create_sentence_embedder(embedding_model, embedding_workers), storage_path, serialized_data, index_parameters=index_parameters)
+
+    if indexer_type == "indexer_NumpyFlat":
+        storage_path = __build_storage_path(indexer_name, collection_name, persister)
+        return __get_component_class(indexer_type)(indexer_name, __create_sentence_embedder(embedding_model, embedding_workers), storage_path)
 
     if indexer_type == "indexer_SqlLiteBM25":
         storage_path = __build_storage_path(indexer_name, collection_name, persister)
         storage_dir_exists = os.path.isdir(storage_path)
 
         if storage_dir_exists:
-            return SqlliteIndexer(indexer_name, storage_path)
+            return __get_component_class(indexer_type)(indexer_name, storage_path)
 
         serialized_data = persister.read_bin_file(f"{collection_name}/indexes/{indexer_name}/indexer")
-        return SqlliteIndexer(indexer_name, storage_path, serialized_data)
+        return __get_component_class(indexer_type)(indexer_name, storage_path, serialized_data)
+
+    raise ValueError(f"Unknown indexer name: {indexer_name}")
+
+def __load_faiss_indexer(indexer_name, indexer_type, embedding_model, collection_name, persister, embedding_workers, for_update):
+    index_type, index_parameters = __parse_faiss_indexer_type(indexer_type)
+    storage_path = __build_storage_path(indexer_name, collection_name, persister)
+    legacy_index_path = f"{collection_name}/indexes/{indexer_name}/indexer"
+    faiss_indexer_class = __get_component_class("indexer_FAISS")
+    embedder = __create_sentence_embedder(embedding_model, embedding_workers)
+    index_arguments = {"index_type": index_type, "index_parameters": index_parameters}
+
+    storage = __get_component_class("faiss_segments_storage")(storage_path)
+    if not storage.exists() and persister.is_path_exists(legacy_index_path):
+        if not for_update:
+            try:
+                # Searchers don't write, so the pickled index is searched in memory until an update migrates it
+                return faiss_indexer_class(indexer_name, embedder, persister.read_bin_file(legacy_index_path), **index_arguments)
+            except FileNotFoundError:
+                pass
+        else:
+            with lock_file(f"{storage_path}.lock"):
+                # Another update could migrate the index while this one was waiting for the lock
+                if not storage.exists():
+                    faiss_indexer_class(indexer_name, embedder, persister.read_bin_file(legacy_index_path), storage_path=storage_path, segments_storage=storage, **index_arguments)
+                    persister.remove_file(legacy_index_path)
 
-    raise ValueError(f"Unknown indexer name: {indexer_name}")
\ No newline at end of file
+    return faiss_indexer_class(indexer_name, embedder, storage_path=storage_path, load_existing_storage=True, segments_storage=storage, **index_arguments)
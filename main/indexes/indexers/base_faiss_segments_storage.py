@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import faiss
+import numpy as np
+
+
+class BaseFaissSegmentsStorage(ABC):
+    @abstractmethod
+    def exists(self) -> bool: ...
+
+    @abstractmethod
+    def read(self) -> tuple[Optional[faiss.Index], list[faiss.Index], np.ndarray]: ...
+
+    @abstractmethod
+    def read_base_into_memory(self) -> faiss.Index: ...
+
+    @abstractmethod
+    def save(self,
+             base_index: Optional[faiss.Index] = None,
+             new_delta_index: Optional[faiss.Index] = None,
+             tombstones: Optional[np.ndarray] = None,
+             drop_deltas: bool = False) -> None: ...
@@ -17,7 +17,7 @@ class BaseIndexer(ABC):
     def serialize(self) -> bytes: ...
 
     @abstractmethod
-    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]: ...
+    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None, search_params: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]: ...
 
     @abstractmethod
     def get_size(self) -> int: ...
@@ -27,3 +27,12 @@ class BaseIndexer(ABC):
 
     def is_persistent_storage(self) -> bool:
         return False
+
+    def warm_up(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def compact(self) -> None:
+        pass
@@ -5,20 +5,33 @@ import os
 import pickle
 import io
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional
 from datetime import datetime
 
 from main.indexes.filter_parser import parse_filter, FilterNode, FilterCondition
 from main.indexes.indexers.base_indexer import BaseIndexer
 from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.utils.page_cache import read_files_into_page_cache
 
 
 class ChromaIndexer(BaseIndexer):
     __SERIALIZED_ARCHIVE_MAGIC = b"CHROMA_ARCHIVE_V1\0"
+    __MAX_ADD_BATCH_SIZE = 5000
+    __HNSW_CONFIGURATION_KEYS = {
+        "M": "max_neighbors",
+        "efConstruction": "ef_construction",
+        "efSearch": "ef_search",
+    }
+
+    def __init__(self, name: str, embedder: BaseEmbedder, storage_path: str, serialized_data: Optional[bytes] = None, index_parameters: dict = {}):
+        unknown_parameters = set(index_parameters) - set(self.__HNSW_CONFIGURATION_KEYS)
+        if unknown_parameters:
+            raise ValueError(f"Unknown parameters {', '.join(sorted(unknown_parameters))} for ChromaDb index, supported: {', '.join(self.__HNSW_CONFIGURATION_KEYS)}")
 
-    def __init__(self, name: str, embedder: BaseEmbedder, storage_path: str, serialized_data: Optional[bytes] = None):
         self.name = name
         self.embedder = embedder
+        self.index_parameters = index_parameters
         self.__storage_path = storage_path
         self.__client = None
         self.__collection = None
@@ -33,14 +46,27 @@ class ChromaIndexer(BaseIndexer):
         return True
 
     def index_texts(self, ids: np.ndarray, texts: List[str], items_metadata: list[dict] = None) -> None:
-        embeddings = self.embedder.embed(texts)
-        str_ids = [str(int(id_val)) for id_val in ids]
+        if len(texts) == 0:
+            return
 
-        self.__add_in_batches(
-            ids=str_ids,
-            embeddings=embeddings.tolist(),
-            metadatas=self.__adjust_metadata(items_metadata)
-        )
+        str_ids = [str(int(id_val)) for id_val in ids]
+        metadatas = self.__adjust_metadata(items_metadata)
+        batch_size = self.__get_add_batch_size()
+
+        # Next sub-batch is embedded while the current one is written, so at most two sub-batches of vectors are in memory
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma-embedder") as executor:
+            next_embeddings = executor.submit(self.embedder.embed, texts[:batch_size])
+            for start in range(0, len(texts), batch_size):
+                embeddings = next_embeddings.result()
+                end = start + batch_size
+                if end < len(texts):
+                    next_embeddings = executor.submit(self.embedder.embed, texts[end:end + batch_size])
+
+                self.__get_collection().add(
+                    ids=str_ids[start:end],
+                    embeddings=embeddings,
+                    metadatas=metadatas[start:end]
+                )
 
     def remove_ids(self, ids: np.ndarray) -> None:
         str_ids = [str(int(id_val)) for id_val in ids]
@@ -49,7 +75,7 @@ class ChromaIndexer(BaseIndexer):
     def serialize(self) -> bytes:
         return self.__serialize_storage_to_archive()
 
-    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None, search_params: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
         query_embedding = self.embedder.embed(text)
         
         collection_size = self.get_size()
@@ -58,22 +84,29 @@ class ChromaIndexer(BaseIndexer):
         
         filter_expression = parse_filter(filter)
 
+        # Chroma searches HNSW with max(ef_search, n_results) candidates, so per query ef is applied by requesting more results
+        ef_search = (search_params or {}).get("efSearch", 0)
         results = self.__get_collection().query(
             query_embeddings=[query_embedding.tolist()],
-            n_results=min(number_of_results, collection_size),
-            where=self.__convert_filter_to_chroma(filter_expression)
+            n_results=min(max(number_of_results, ef_search), collection_size),
+            where=self.__convert_filter_to_chroma(filter_expression),
+            include=["distances"]
         )
         
         if not results["ids"][0]:
             return np.array([[]]), np.array([[]])
         
-        distances = np.array([results["distances"][0]])
-        ids = np.array([[int(id_val) for id_val in results["ids"][0]]])
+        distances = np.array([results["distances"][0][:number_of_results]])
+        ids = np.array([[int(id_val) for id_val in results["ids"][0][:number_of_results]]])
         
         return distances, ids
     
     def get_size(self) -> int:
         return self.__get_collection().count()
+
+    def warm_up(self) -> None:
+        read_files_into_page_cache(self.__storage_path)
+        self.search("warm up", number_of_results=1)
     
     def support_metadata(self) -> bool:
         return True
@@ -134,8 +167,13 @@ class ChromaIndexer(BaseIndexer):
             return {condition.field: value}
         return {condition.field: {self.__OPERATOR_MAP[condition.operator]: value}}
 
-    def __add_in_batches(self, ids: List[str], embeddings: List[List[float]], metadatas: List[dict], batch_size: int = 5000):
+    def __get_add_batch_size(self) -> int:
+        self.__get_collection()
+        return min(self.__MAX_ADD_BATCH_SIZE, self.__client.get_max_batch_size())
+
+    def __add_in_batches(self, ids: List[str], embeddings: List[List[float]], metadatas: List[dict]):
         total_items = len(ids)
+        batch_size = self.__get_add_batch_size()
         for i in range(0, total_items, batch_size):
             end_idx = min(i + batch_size, total_items)
             self.__get_collection().add(
@@ -152,10 +190,15 @@ class ChromaIndexer(BaseIndexer):
             )
             self.__collection = self.__client.get_or_create_collection(
                 name="documents",
-                metadata={"hnsw:space": "l2"}
+                configuration=self.__build_collection_configuration()
             )
         return self.__collection
 
+    def __build_collection_configuration(self):
+        # Applied only when the collection is created, existing collections keep their HNSW parameters
+        hnsw_configuration = {self.__HNSW_CONFIGURATION_KEYS[name]: value for name, value in self.index_parameters.items()}
+        return {"hnsw": {"space": "l2", **hnsw_configuration}}
+
     def __is_storage_archive(self, serialized_data: bytes) -> bool:
         return serialized_data.startswith(self.__SERIALIZED_ARCHIVE_MAGIC)
 
@@ -185,7 +228,7 @@ class ChromaIndexer(BaseIndexer):
             )
             self.__collection = self.__client.get_or_create_collection(
                 name="documents",
-                metadata={"hnsw:space": "l2"}
+                configuration=self.__build_collection_configuration()
             )
             self.__add_in_batches(
                 ids=collection_data["ids"],
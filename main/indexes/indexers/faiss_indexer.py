@@ -1,37 +1,451 @@
+import os
+import math
+import logging
 import faiss
 import numpy as np
-from typing import Tuple
+from typing import Tuple, Optional
 
+from main.indexes.filter_parser import parse_filter
+from main.indexes.metadata_table import MetadataTable
 from main.indexes.indexers.base_indexer import BaseIndexer
+from main.indexes.indexers.faiss_segments_storage import FaissSegmentsStorage
+from main.indexes.indexers.base_faiss_segments_storage import BaseFaissSegmentsStorage
 from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.utils.page_cache import read_files_into_page_cache
 
 
 class FaissIndexer(BaseIndexer):
-    def __init__(self, name, embedder: BaseEmbedder, serialized_index=None):
+    __SUPPORTED_PARAMETERS_BY_INDEX_TYPE = {
+        "IndexFlatL2": set(),
+        "HNSW": {"M", "efConstruction", "efSearch"},
+        "IVFFlat": {"nlist", "nprobe"},
+        "IVFPQ": {"nlist", "nprobe", "m", "nbits"},
+    }
+    __MIN_TRAINING_POINTS_PER_CENTROID = 39
+    __MAX_TRAINING_POINTS_PER_CENTROID = 256
+    __DRIFT_SAMPLE_SIZE = 1024
+    __METADATA_TABLE_FILE_NAME = "metadata.npz"
+
+    def __init__(self,
+                 name,
+                 embedder: BaseEmbedder,
+                 serialized_index=None,
+                 storage_path: Optional[str] = None,
+                 index_type: str = "IndexFlatL2",
+                 index_parameters: dict = {},
+                 drift_threshold: float = 1.5,
+                 min_vectors_for_drift_check: int = 256,
+                 max_number_of_delta_segments: int = 32,
+                 max_delta_ratio: float = 0.1,
+                 exact_search_filter_ratio: float = 0.05,
+                 load_existing_storage: bool = False,
+                 segments_storage: Optional[BaseFaissSegmentsStorage] = None):
+        if index_type not in self.__SUPPORTED_PARAMETERS_BY_INDEX_TYPE:
+            raise ValueError(f"Unknown FAISS index type: {index_type}, supported: {', '.join(self.__SUPPORTED_PARAMETERS_BY_INDEX_TYPE)}")
+
+        unknown_parameters = set(index_parameters) - self.__SUPPORTED_PARAMETERS_BY_INDEX_TYPE[index_type]
+        if unknown_parameters:
+            raise ValueError(f"Unknown parameters {', '.join(sorted(unknown_parameters))} for FAISS index type {index_type}")
+
         self.name = name
         self.embedder = embedder
+        self.index_type = index_type
+        self.index_parameters = index_parameters
+        self.drift_threshold = drift_threshold
+        self.min_vectors_for_drift_check = min_vectors_for_drift_check
+        self.max_number_of_delta_segments = max_number_of_delta_segments
+        self.max_delta_ratio = max_delta_ratio
+        self.exact_search_filter_ratio = exact_search_filter_ratio
+
+        self.__storage_path = storage_path
+        self.__storage = segments_storage or (FaissSegmentsStorage(storage_path) if storage_path is not None else None)
+        # Once the base segment is stored, new vectors go to small delta segments and removed ids are marked
+        # in the tombstones bitmap, so updates don't rewrite the whole index
+        self.__is_base_stored = False
+        self.__is_base_memory_mapped = False
+        self.__is_base_changed = False
+        self.__delta_indexes = []
+        self.__new_delta_index = None
+        self.__tombstones = np.empty(0, dtype=np.uint8)
+        self.__number_of_tombstones = 0
+        self.__are_tombstones_changed = False
+        self.__metadata_table = MetadataTable()
+
         if serialized_index is not None:
             self.faiss_index = faiss.deserialize_index(serialized_index)
+            self.__metadata_table = None
+            self.__is_base_changed = True
+            self.flush()
+        elif self.__storage is not None and self.__storage.exists():
+            self.faiss_index, self.__delta_indexes, tombstones = self.__storage.read()
+            self.__set_tombstones(tombstones)
+            self.__is_base_stored = self.faiss_index is not None
+            self.__is_base_memory_mapped = self.__is_base_stored
+            self.__metadata_table = self.__load_metadata_table()
+        elif load_existing_storage:
+            raise FileNotFoundError(f"FAISS index {name} has no segments manifest in {storage_path}")
+        elif self.__is_ivf():
+            self.faiss_index = None
         else:
-            self.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(embedder.get_number_of_dimensions()))
+            self.faiss_index = self.__create_index(embedder.get_number_of_dimensions())
+            self.__is_base_changed = True
 
     def get_name(self) -> str:
         return self.name
 
+    def is_persistent_storage(self) -> bool:
+        return self.__storage is not None
+
     def index_texts(self, ids, texts, items_metadata: list[dict] = None) -> None:
-        self.faiss_index.add_with_ids(self.embedder.embed(texts), np.array(ids, dtype=np.int64))
+        embeddings = np.ascontiguousarray(self.embedder.embed(texts), dtype=np.float32)
+        ids = np.array(ids, dtype=np.int64)
+        if self.__metadata_table is not None:
+            self.__metadata_table.add(ids, items_metadata)
+
+        if self.__is_base_stored:
+            if self.__new_delta_index is None:
+                self.__new_delta_index = faiss.IndexIDMap(faiss.IndexFlatL2(embeddings.shape[1]))
+            self.__new_delta_index.add_with_ids(embeddings, ids)
+            return
+
+        self.__add_to_base(ids, embeddings)
 
     def remove_ids(self, ids) -> None:
-        self.faiss_index.remove_ids(ids)
+        if len(ids) == 0:
+            return
+
+        ids = np.array(ids, dtype=np.int64)
+        if self.__metadata_table is not None:
+            self.__metadata_table.remove(ids)
+
+        if self.__is_base_stored:
+            self.__add_tombstones(ids)
+            return
+
+        if self.faiss_index is not None:
+            self.__remove_from_base(ids)
 
     def serialize(self) -> bytes:
+        if self.faiss_index is None:
+            raise ValueError(f"FAISS index {self.name} has no indexed vectors to serialize")
+
         return faiss.serialize_index(self.faiss_index)
 
-    def search(self, text, number_of_results=10, filter=None) -> Tuple[np.ndarray, np.ndarray]:
-        return self.faiss_index.search(np.expand_dims(self.embedder.embed(text), axis=0), number_of_results)
+    def flush(self) -> None:
+        if self.__storage is None:
+            return
+
+        if self.__metadata_table is not None and (self.__metadata_table.is_changed() or not self.__storage.exists()):
+            os.makedirs(self.__storage_path, exist_ok=True)
+            self.__metadata_table.save(os.path.join(self.__storage_path, self.__METADATA_TABLE_FILE_NAME))
+
+        if not self.__is_base_stored:
+            if self.faiss_index is None:
+                # Manifest of an untrained IVF index tells loaders that the index is empty rather than not stored yet
+                if not self.__storage.exists():
+                    self.__storage.save()
+            elif self.__is_base_changed:
+                self.__storage.save(base_index=self.faiss_index)
+                self.__is_base_stored = True
+                self.__is_base_changed = False
+            return
+
+        if self.__needs_compaction():
+            self.compact()
+            return
+
+        if self.__new_delta_index is None and not self.__are_tombstones_changed:
+            return
+
+        self.__storage.save(new_delta_index=self.__new_delta_index,
+                            tombstones=self.__tombstones if self.__are_tombstones_changed else None)
+        if self.__new_delta_index is not None:
+            self.__delta_indexes.append(self.__new_delta_index)
+            self.__new_delta_index = None
+        self.__are_tombstones_changed = False
+
+    def compact(self) -> None:
+        if not self.__is_base_stored or (not self.__get_delta_indexes() and self.__number_of_tombstones == 0):
+            return
+
+        logging.info(f"Merging {len(self.__get_delta_indexes())} delta segments and {self.__number_of_tombstones} removed vectors into the base segment of {self.name}")
+        if self.__is_base_memory_mapped:
+            self.faiss_index = self.__storage.read_base_into_memory()
+            self.__is_base_memory_mapped = False
+
+        removed_ids = np.flatnonzero(np.unpackbits(self.__tombstones, bitorder="little")).astype(np.int64)
+        if len(removed_ids) > 0:
+            self.__remove_from_base(removed_ids)
+
+        for delta_index in self.__get_delta_indexes():
+            delta_ids = faiss.vector_to_array(delta_index.id_map)
+            rows_to_keep = np.flatnonzero(~np.isin(delta_ids, removed_ids))
+            if len(rows_to_keep) > 0:
+                self.__add_to_base(delta_ids[rows_to_keep], delta_index.index.reconstruct_n(0, delta_index.ntotal)[rows_to_keep])
+
+        self.__storage.save(base_index=self.faiss_index, drop_deltas=True, tombstones=np.empty(0, dtype=np.uint8))
+        if self.__metadata_table is not None:
+            self.__metadata_table.save(os.path.join(self.__storage_path, self.__METADATA_TABLE_FILE_NAME), compact=True)
+        self.__delta_indexes = []
+        self.__new_delta_index = None
+        self.__set_tombstones(np.empty(0, dtype=np.uint8))
+        self.__is_base_changed = False
+
+    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None, search_params: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        query_embedding = np.expand_dims(self.embedder.embed(text), axis=0)
+        if self.get_size() == 0:
+            return np.array([[]]), np.array([[]])
+
+        filter_expression = parse_filter(filter)
+        if filter_expression is None:
+            segment_results = self.__search_segments(query_embedding, number_of_results, search_params, self.__create_tombstones_selector())
+        else:
+            allowed_ids_mask = self.__find_allowed_ids(filter_expression)
+            number_of_allowed_ids = int(allowed_ids_mask.sum())
+            if number_of_allowed_ids == 0:
+                return np.array([[]]), np.array([[]])
+
+            # Approximate search loses recall when most of the vectors are filtered out
+            if number_of_allowed_ids <= self.exact_search_filter_ratio * self.get_size():
+                segment_results = self.__search_segments_exactly(query_embedding, number_of_results, allowed_ids_mask)
+            else:
+                segment_results = self.__search_segments(query_embedding, number_of_results, search_params, self.__create_allowed_ids_selector(allowed_ids_mask))
+
+        if not segment_results:
+            return np.array([[]]), np.array([[]])
+
+        distances = np.concatenate([segment_distances[0] for segment_distances, _ in segment_results])
+        ids = np.concatenate([segment_ids[0] for _, segment_ids in segment_results])
+        found_results = np.flatnonzero(ids != -1)
+        best_results = found_results[np.argsort(distances[found_results], kind="stable")[:number_of_results]]
+        return np.expand_dims(distances[best_results], axis=0), np.expand_dims(ids[best_results], axis=0)
 
     def support_metadata(self) -> bool:
-        return False
+        return self.__metadata_table is not None
 
     def get_size(self) -> int:
-        return self.faiss_index.ntotal
\ No newline at end of file
+        number_of_vectors = sum(index.ntotal for index in [self.faiss_index, *self.__get_delta_indexes()] if index is not None)
+        return number_of_vectors - self.__number_of_tombstones
+
+    def warm_up(self) -> None:
+        if self.__storage_path is not None:
+            read_files_into_page_cache(self.__storage_path)
+        self.search("warm up", number_of_results=1)
+
+    def __search_segments(self, query_embedding, number_of_results, search_params, selector):
+        segment_results = []
+        for index in self.__get_segment_indexes():
+            parameters = self.__build_search_parameters(search_params, selector) if index is self.faiss_index else faiss.SearchParameters(sel=selector)
+            segment_results.append(index.search(query_embedding, number_of_results, params=parameters))
+
+        return segment_results
+
+    def __search_segments_exactly(self, query_embedding, number_of_results, allowed_ids_mask):
+        segment_results = []
+        for index in self.__get_segment_indexes():
+            if self.__is_ivf() and index is self.faiss_index:
+                parameters = faiss.SearchParametersIVF(nprobe=index.nlist, sel=self.__create_allowed_ids_selector(allowed_ids_mask))
+                segment_results.append(index.search(query_embedding, number_of_results, params=parameters))
+                continue
+
+            segment_ids = faiss.vector_to_array(index.id_map)
+            is_allowed = np.zeros(len(segment_ids), dtype=bool)
+            known_rows = segment_ids < len(allowed_ids_mask)
+            is_allowed[known_rows] = allowed_ids_mask[segment_ids[known_rows]]
+            rows = np.flatnonzero(is_allowed)
+            embeddings = index.index.reconstruct_batch(rows)
+            distances = ((embeddings - query_embedding) ** 2).sum(axis=1)
+            best_rows = np.argsort(distances, kind="stable")[:number_of_results]
+            segment_results.append((np.expand_dims(distances[best_rows], axis=0), np.expand_dims(segment_ids[rows[best_rows]], axis=0)))
+
+        return segment_results
+
+    def __find_allowed_ids(self, filter_expression):
+        if self.__metadata_table is None:
+            raise NotImplementedError(f"FAISS index {self.name} was created without metadata, recreate the collection to use filters")
+
+        allowed_ids_mask = self.__metadata_table.filter(filter_expression)
+        if self.__number_of_tombstones > 0:
+            tombstones_mask = np.unpackbits(self.__tombstones, bitorder="little", count=len(allowed_ids_mask)).astype(bool)
+            allowed_ids_mask &= ~tombstones_mask
+
+        return allowed_ids_mask
+
+    def __create_allowed_ids_selector(self, allowed_ids_mask):
+        allowed_ids_bitmap = np.packbits(allowed_ids_mask, bitorder="little")
+        selector = faiss.IDSelectorBitmap(len(allowed_ids_bitmap), faiss.swig_ptr(allowed_ids_bitmap))
+        # Selector does not own the bitmap memory
+        selector.bitmap_array = allowed_ids_bitmap
+        return selector
+
+    def __load_metadata_table(self):
+        metadata_table_path = os.path.join(self.__storage_path, self.__METADATA_TABLE_FILE_NAME)
+        return MetadataTable.load(metadata_table_path) if os.path.isfile(metadata_table_path) else None
+
+    def __get_segment_indexes(self):
+        return [index for index in [self.faiss_index, *self.__get_delta_indexes()] if index is not None and index.ntotal > 0]
+
+    def __get_delta_indexes(self):
+        return self.__delta_indexes + ([self.__new_delta_index] if self.__new_delta_index is not None else [])
+
+    def __needs_compaction(self):
+        delta_indexes = self.__get_delta_indexes()
+        number_of_changed_vectors = sum(delta_index.ntotal for delta_index in delta_indexes) + self.__number_of_tombstones
+        base_size = self.faiss_index.ntotal if self.faiss_index is not None else 0
+
+        return len(delta_indexes) > self.max_number_of_delta_segments or number_of_changed_vectors > self.max_delta_ratio * base_size
+
+    def __add_tombstones(self, ids):
+        tombstones = self.__tombstones
+        required_size = int(ids.max()) // 8 + 1
+        if required_size > len(tombstones):
+            tombstones = np.concatenate([tombstones, np.zeros(required_size - len(tombstones), dtype=np.uint8)])
+
+        np.bitwise_or.at(tombstones, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+        self.__set_tombstones(tombstones)
+        self.__are_tombstones_changed = True
+
+    def __set_tombstones(self, tombstones):
+        self.__tombstones = np.ascontiguousarray(tombstones, dtype=np.uint8)
+        self.__number_of_tombstones = int(np.unpackbits(self.__tombstones).sum())
+
+    def __create_tombstones_selector(self):
+        if self.__number_of_tombstones == 0:
+            return None
+
+        return faiss.IDSelectorNot(faiss.IDSelectorBitmap(len(self.__tombstones), faiss.swig_ptr(self.__tombstones)))
+
+    def __add_to_base(self, ids, embeddings):
+        self.__is_base_changed = True
+        if self.__is_ivf():
+            self.__index_ivf_embeddings(ids, embeddings)
+            return
+
+        self.faiss_index.add_with_ids(embeddings, ids)
+
+    def __remove_from_base(self, ids):
+        self.__is_base_changed = True
+        if self.index_type == "HNSW":
+            self.__rebuild_hnsw_without_ids(ids)
+            return
+
+        self.faiss_index.remove_ids(ids)
+
+    def __is_ivf(self):
+        return self.index_type in ("IVFFlat", "IVFPQ")
+
+    def __create_index(self, number_of_dimensions):
+        if self.index_type == "HNSW":
+            hnsw_index = faiss.IndexHNSWFlat(number_of_dimensions, self.index_parameters.get("M", 32))
+            hnsw_index.hnsw.efConstruction = self.index_parameters.get("efConstruction", 200)
+            hnsw_index.hnsw.efSearch = self.index_parameters.get("efSearch", 64)
+            return faiss.IndexIDMap(hnsw_index)
+
+        return faiss.IndexIDMap(faiss.IndexFlatL2(number_of_dimensions))
+
+    def __index_ivf_embeddings(self, ids, embeddings):
+        if self.faiss_index is None:
+            self.faiss_index = self.__create_trained_ivf_index(embeddings)
+        elif self.__is_drifted(embeddings):
+            existing_ids = self.__get_ivf_ids()
+            existing_embeddings = self.faiss_index.reconstruct_batch(existing_ids)
+            ids = np.concatenate([existing_ids, ids])
+            embeddings = np.concatenate([existing_embeddings, embeddings])
+            self.faiss_index = self.__create_trained_ivf_index(embeddings)
+
+        self.faiss_index.add_with_ids(embeddings, ids)
+
+    def __create_trained_ivf_index(self, embeddings):
+        number_of_vectors, number_of_dimensions = embeddings.shape
+
+        nlist = self.index_parameters.get("nlist", int(4 * math.sqrt(number_of_vectors)))
+        max_nlist = max(1, number_of_vectors // self.__MIN_TRAINING_POINTS_PER_CENTROID)
+        if nlist > max_nlist:
+            logging.warning(f"Not enough vectors ({number_of_vectors}) to train {nlist} IVF lists for {self.name}, {max_nlist} lists are used")
+            nlist = max_nlist
+
+        quantizer = faiss.IndexFlatL2(number_of_dimensions)
+        if self.index_type == "IVFPQ":
+            ivf_index = faiss.IndexIVFPQ(quantizer, number_of_dimensions, nlist, self.__get_pq_m(number_of_dimensions), self.__get_pq_nbits(number_of_vectors))
+        else:
+            ivf_index = faiss.IndexIVFFlat(quantizer, number_of_dimensions, nlist)
+
+        training_size = min(number_of_vectors, nlist * self.__MAX_TRAINING_POINTS_PER_CENTROID)
+        training_rows = np.random.default_rng().choice(number_of_vectors, size=training_size, replace=False)
+        logging.info(f"Training {self.index_type} index {self.name} with {nlist} lists on {training_size} vectors")
+        ivf_index.train(embeddings[np.sort(training_rows)])
+
+        ivf_index.nprobe = self.index_parameters.get("nprobe", min(nlist, 16))
+        # Hashtable direct map allows to reconstruct vectors by id, which is needed for retraining
+        ivf_index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return ivf_index
+
+    def __get_pq_m(self, number_of_dimensions):
+        m = self.index_parameters.get("m")
+        if m is None:
+            m = max(divisor for divisor in range(1, max(1, number_of_dimensions // 4) + 1) if number_of_dimensions % divisor == 0)
+
+        if number_of_dimensions % m != 0:
+            raise ValueError(f"Number of dimensions ({number_of_dimensions}) must be divisible by IVFPQ parameter m ({m})")
+
+        return m
+
+    def __get_pq_nbits(self, number_of_vectors):
+        nbits = self.index_parameters.get("nbits", 8)
+        max_nbits = max(1, int(math.log2(number_of_vectors)))
+        if nbits > max_nbits:
+            logging.warning(f"Not enough vectors ({number_of_vectors}) to train {2 ** nbits} PQ centroids for {self.name}, {max_nbits} bits are used")
+            return max_nbits
+
+        return nbits
+
+    def __is_drifted(self, embeddings):
+        if len(embeddings) < self.min_vectors_for_drift_check or self.faiss_index.ntotal == 0:
+            return False
+
+        existing_ids = self.__get_ivf_ids()
+        sample_ids = np.random.default_rng().choice(existing_ids, size=min(len(existing_ids), self.__DRIFT_SAMPLE_SIZE), replace=False)
+        existing_error = self.__calculate_quantization_error(self.faiss_index.reconstruct_batch(sample_ids))
+        new_error = self.__calculate_quantization_error(embeddings)
+
+        drift = new_error / existing_error if existing_error > 0 else 1.0
+        if drift <= self.drift_threshold:
+            return False
+
+        logging.info(f"IVF lists of {self.name} do not fit new vectors (quantization error ratio {drift:.2f}), the index is retrained")
+        return True
+
+    def __calculate_quantization_error(self, embeddings):
+        distances, _ = self.faiss_index.quantizer.search(embeddings, 1)
+        return float(distances.mean())
+
+    def __get_ivf_ids(self):
+        inverted_lists = self.faiss_index.invlists
+        ids = [faiss.rev_swig_ptr(inverted_lists.get_ids(list_number), inverted_lists.list_size(list_number)).copy()
+               for list_number in range(inverted_lists.nlist)
+               if inverted_lists.list_size(list_number) > 0]
+        return np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+
+    def __rebuild_hnsw_without_ids(self, ids_to_remove):
+        # HNSW graph does not support removal, so it is rebuilt from the remaining vectors
+        existing_ids = faiss.vector_to_array(self.faiss_index.id_map)
+        rows_to_keep = np.flatnonzero(~np.isin(existing_ids, ids_to_remove))
+        if len(rows_to_keep) == len(existing_ids):
+            return
+
+        embeddings = self.faiss_index.index.reconstruct_n(0, self.faiss_index.ntotal)[rows_to_keep]
+        self.faiss_index = self.__create_index(self.faiss_index.d)
+        self.faiss_index.add_with_ids(embeddings, existing_ids[rows_to_keep])
+
+    def __build_search_parameters(self, search_params, selector):
+        search_params = search_params or {}
+
+        # Search parameters override all index search settings, so defaults are taken from the index
+        if self.index_type == "HNSW":
+            default_ef_search = faiss.downcast_index(self.faiss_index.index).hnsw.efSearch
+            return faiss.SearchParametersHNSW(efSearch=search_params.get("efSearch", default_ef_search), sel=selector)
+
+        if self.__is_ivf():
+            return faiss.SearchParametersIVF(nprobe=search_params.get("nprobe", self.faiss_index.nprobe), sel=selector)
+
+        return faiss.SearchParameters(sel=selector)
@@ -0,0 +1,97 @@
+import os
+import json
+import faiss
+import numpy as np
+from typing import Optional
+
+from main.indexes.indexers.base_faiss_segments_storage import BaseFaissSegmentsStorage
+
+
+class FaissSegmentsStorage(BaseFaissSegmentsStorage):
+    __MANIFEST_FILE_NAME = "segments.json"
+
+    def __init__(self, storage_path: str):
+        self.storage_path = storage_path
+
+    def exists(self) -> bool:
+        return self.__read_manifest() is not None
+
+    def read(self) -> tuple[Optional[faiss.Index], list[faiss.Index], np.ndarray]:
+        manifest = self.__read_manifest()
+        if manifest is None:
+            return None, [], np.empty(0, dtype=np.uint8)
+
+        base_index = self.__read_memory_mapped_index(manifest["base"]) if manifest["base"] else None
+        delta_indexes = [self.__read_memory_mapped_index(file_name) for file_name in manifest["deltas"]]
+        tombstones = np.fromfile(self.__build_path(manifest["tombstones"]), dtype=np.uint8) if manifest["tombstones"] else np.empty(0, dtype=np.uint8)
+
+        return base_index, delta_indexes, tombstones
+
+    def read_base_into_memory(self) -> faiss.Index:
+        return faiss.read_index(self.__build_path(self.__read_manifest()["base"]))
+
+    def save(self,
+             base_index: Optional[faiss.Index] = None,
+             new_delta_index: Optional[faiss.Index] = None,
+             tombstones: Optional[np.ndarray] = None,
+             drop_deltas: bool = False) -> None:
+        os.makedirs(self.storage_path, exist_ok=True)
+        manifest = self.__read_manifest() or {"base": None, "deltas": [], "tombstones": None, "nextFileNumber": 1}
+        previous_file_names = self.__get_file_names(manifest)
+
+        if base_index is not None:
+            manifest["base"] = self.__write_index(base_index, manifest)
+
+        if drop_deltas:
+            manifest["deltas"] = []
+
+        if new_delta_index is not None:
+            manifest["deltas"].append(self.__write_index(new_delta_index, manifest))
+
+        if tombstones is not None:
+            manifest["tombstones"] = self.__write_tombstones(tombstones, manifest) if tombstones.any() else None
+
+        self.__write_manifest(manifest)
+
+        # Processes which memory-mapped removed segments keep reading them until they are closed
+        for file_name in previous_file_names - self.__get_file_names(manifest):
+            os.remove(self.__build_path(file_name))
+
+    def __write_index(self, index, manifest):
+        file_name = f"segment_{self.__take_file_number(manifest):06d}.faiss"
+        faiss.write_index(index, self.__build_path(file_name))
+        return file_name
+
+    def __write_tombstones(self, tombstones, manifest):
+        file_name = f"tombstones_{self.__take_file_number(manifest):06d}.bin"
+        tombstones.tofile(self.__build_path(file_name))
+        return file_name
+
+    def __take_file_number(self, manifest):
+        file_number = manifest["nextFileNumber"]
+        manifest["nextFileNumber"] += 1
+        return file_number
+
+    def __get_file_names(self, manifest):
+        return {file_name for file_name in [manifest["base"], *manifest["deltas"], manifest["tombstones"]] if file_name}
+
+    def __read_memory_mapped_index(self, file_name):
+        return faiss.read_index(self.__build_path(file_name), faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+
+    def __read_manifest(self):
+        manifest_path = self.__build_path(self.__MANIFEST_FILE_NAME)
+        if not os.path.isfile(manifest_path):
+            return None
+
+        with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+
+    def __write_manifest(self, manifest):
+        manifest_path = self.__build_path(self.__MANIFEST_FILE_NAME)
+        temporary_manifest_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temporary_manifest_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temporary_manifest_path, manifest_path)
+
+    def __build_path(self, file_name):
+        return os.path.join(self.storage_path, file_name)
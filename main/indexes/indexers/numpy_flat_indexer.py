@@ -0,0 +1,191 @@
+import os
+import json
+import numpy as np
+from typing import List, Tuple, Optional
+
+from main.indexes.filter_parser import parse_filter
+from main.indexes.metadata_table import MetadataTable
+from main.indexes.indexers.base_indexer import BaseIndexer
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.utils.page_cache import read_files_into_page_cache
+
+
+class NumpyFlatIndexer(BaseIndexer):
+    __MANIFEST_FILE_NAME = "vectors.json"
+    __METADATA_TABLE_FILE_NAME = "metadata.npz"
+    __SEARCH_BLOCK_SIZE = 16384
+
+    def __init__(self, name: str, embedder: BaseEmbedder, storage_path: str, max_removed_ratio: float = 0.1):
+        self.name = name
+        self.embedder = embedder
+        self.max_removed_ratio = max_removed_ratio
+        self.__storage_path = storage_path
+
+        metadata_table_path = self.__build_path(self.__METADATA_TABLE_FILE_NAME)
+        self.__metadata_table = MetadataTable.load(metadata_table_path) if os.path.isfile(metadata_table_path) else MetadataTable()
+        self.__load_vectors()
+
+    def get_name(self) -> str:
+        return self.name
+
+    def is_persistent_storage(self) -> bool:
+        return True
+
+    def index_texts(self, ids: np.ndarray, texts: List[str], items_metadata: list[dict] = None) -> None:
+        vectors = np.asarray(self.embedder.embed(texts), dtype=np.float16)
+        ids = np.array(ids, dtype=np.int64)
+
+        self.__vectors = vectors if self.__vectors is None else np.concatenate([self.__vectors, vectors])
+        self.__ids = np.concatenate([self.__ids, ids])
+        self.__squared_norms = np.concatenate([self.__squared_norms, self.__calculate_squared_norms(vectors)])
+        self.__is_removed = np.concatenate([self.__is_removed, np.zeros(len(ids), dtype=bool)])
+        self.__metadata_table.add(ids, items_metadata)
+        self.__are_vectors_changed = True
+
+    def remove_ids(self, ids: np.ndarray) -> None:
+        if len(ids) == 0:
+            return
+
+        ids = np.array(ids, dtype=np.int64)
+        self.__metadata_table.remove(ids)
+        is_removed = self.__is_removed | np.isin(self.__ids, ids)
+        if (is_removed != self.__is_removed).any():
+            self.__is_removed = is_removed
+            self.__are_tombstones_changed = True
+
+    def serialize(self) -> bytes:
+        raise NotImplementedError("NumpyFlatIndexer uses persistent storage, serialization is not needed")
+
+    def flush(self) -> None:
+        if self.__metadata_table.is_changed():
+            os.makedirs(self.__storage_path, exist_ok=True)
+            self.__metadata_table.save(self.__build_path(self.__METADATA_TABLE_FILE_NAME))
+
+        if not self.__are_vectors_changed and not self.__are_tombstones_changed:
+            return
+
+        manifest = self.__manifest or {"vectors": None, "ids": None, "squaredNorms": None, "tombstones": None, "nextFileNumber": 1}
+        previous_file_names = self.__get_file_names(manifest)
+        number_of_removed = int(self.__is_removed.sum())
+
+        if self.__are_vectors_changed or number_of_removed > self.max_removed_ratio * len(self.__ids):
+            rows_to_keep = ~self.__is_removed
+            manifest["vectors"] = self.__write_array(self.__vectors[rows_to_keep], "vectors", manifest)
+            manifest["ids"] = self.__write_array(self.__ids[rows_to_keep], "ids", manifest)
+            manifest["squaredNorms"] = self.__write_array(self.__squared_norms[rows_to_keep], "squared_norms", manifest)
+            manifest["tombstones"] = None
+        else:
+            manifest["tombstones"] = self.__write_array(self.__ids[self.__is_removed], "tombstones", manifest) if number_of_removed > 0 else None
+
+        self.__write_manifest(manifest)
+        for file_name in previous_file_names - self.__get_file_names(manifest):
+            os.remove(self.__build_path(file_name))
+
+        self.__load_vectors()
+
+    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None, search_params: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        query_embedding = np.asarray(self.embedder.embed(text), dtype=np.float32)
+        if self.get_size() == 0:
+            return np.array([[]]), np.array([[]])
+
+        filter_expression = parse_filter(filter)
+        if filter_expression is None:
+            rows = None
+            distances = self.__calculate_distances(query_embedding, slice(None))
+            distances[self.__is_removed] = np.inf
+        else:
+            rows = np.flatnonzero(self.__find_allowed_rows(filter_expression))
+            distances = self.__calculate_distances(query_embedding, rows)
+
+        number_of_results = min(number_of_results, int(np.isfinite(distances).sum()))
+        if number_of_results == 0:
+            return np.array([[]]), np.array([[]])
+
+        best_positions = np.argpartition(distances, number_of_results - 1)[:number_of_results]
+        best_positions = best_positions[np.argsort(distances[best_positions], kind="stable")]
+        best_rows = best_positions if rows is None else rows[best_positions]
+
+        return np.expand_dims(distances[best_positions], axis=0), np.expand_dims(self.__ids[best_rows], axis=0)
+
+    def get_size(self) -> int:
+        return len(self.__ids) - int(self.__is_removed.sum())
+
+    def support_metadata(self) -> bool:
+        return True
+
+    def warm_up(self) -> None:
+        read_files_into_page_cache(self.__storage_path)
+        self.search("warm up", number_of_results=1)
+
+    def __load_vectors(self):
+        self.__manifest = self.__read_manifest()
+        self.__are_vectors_changed = False
+        self.__are_tombstones_changed = False
+
+        if self.__manifest is None:
+            self.__vectors = None
+            self.__ids = np.empty(0, dtype=np.int64)
+            self.__squared_norms = np.empty(0, dtype=np.float32)
+            self.__is_removed = np.empty(0, dtype=bool)
+            return
+
+        # Float16 vectors are memory-mapped, so search starts without reading the whole file
+        self.__vectors = np.load(self.__build_path(self.__manifest["vectors"]), mmap_mode="r")
+        self.__ids = np.load(self.__build_path(self.__manifest["ids"]))
+        self.__squared_norms = np.load(self.__build_path(self.__manifest["squaredNorms"]))
+        removed_ids = np.load(self.__build_path(self.__manifest["tombstones"])) if self.__manifest["tombstones"] else np.empty(0, dtype=np.int64)
+        self.__is_removed = np.isin(self.__ids, removed_ids)
+
+    def __calculate_distances(self, query_embedding, rows):
+        # Squared L2 distance: |x|^2 - 2 * x.q + |q|^2, calculated by blocks to keep float32 copies of float16 vectors small
+        squared_norms = self.__squared_norms[rows]
+        number_of_rows = len(squared_norms)
+        distances = np.empty(number_of_rows, dtype=np.float32)
+
+        for start in range(0, number_of_rows, self.__SEARCH_BLOCK_SIZE):
+            end = min(start + self.__SEARCH_BLOCK_SIZE, number_of_rows)
+            block_rows = slice(start, end) if isinstance(rows, slice) else rows[start:end]
+            distances[start:end] = squared_norms[start:end] - 2 * (self.__vectors[block_rows] @ query_embedding)
+
+        distances += np.dot(query_embedding, query_embedding)
+        return np.maximum(distances, 0)
+
+    def __find_allowed_rows(self, filter_expression):
+        allowed_ids_mask = self.__metadata_table.filter(filter_expression)
+
+        is_allowed = np.zeros(len(self.__ids), dtype=bool)
+        known_rows = self.__ids < len(allowed_ids_mask)
+        is_allowed[known_rows] = allowed_ids_mask[self.__ids[known_rows]]
+        return is_allowed & ~self.__is_removed
+
+    def __calculate_squared_norms(self, vectors):
+        vectors = vectors.astype(np.float32)
+        return np.einsum("ij,ij->i", vectors, vectors)
+
+    def __write_array(self, array, prefix, manifest):
+        os.makedirs(self.__storage_path, exist_ok=True)
+        file_name = f"{prefix}_{manifest['nextFileNumber']:06d}.npy"
+        manifest["nextFileNumber"] += 1
+        np.save(self.__build_path(file_name), np.ascontiguousarray(array))
+        return file_name
+
+    def __get_file_names(self, manifest):
+        return {manifest[key] for key in ["vectors", "ids", "squaredNorms", "tombstones"] if manifest[key]}
+
+    def __read_manifest(self):
+        manifest_path = self.__build_path(self.__MANIFEST_FILE_NAME)
+        if not os.path.isfile(manifest_path):
+            return None
+
+        with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+
+    def __write_manifest(self, manifest):
+        manifest_path = self.__build_path(self.__MANIFEST_FILE_NAME)
+        temporary_manifest_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temporary_manifest_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temporary_manifest_path, manifest_path)
+
+    def __build_path(self, file_name):
+        return os.path.join(self.__storage_path, file_name)
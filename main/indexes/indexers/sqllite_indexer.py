@@ -1,21 +1,32 @@
 import sqlite3
 import json
 import os
+import logging
 import numpy as np
 from typing import List, Tuple, Optional
 
 from main.indexes.filter_parser import parse_filter, FilterNode, FilterCondition, FilterGroup
 from main.indexes.indexers.base_indexer import BaseIndexer
+from main.utils.page_cache import read_files_into_page_cache
 
 
 class SqlliteIndexer(BaseIndexer):
     __DB_FILE_NAME = "bm25.db"
+    __BULK_LOAD_CACHE_SIZE_IN_KB = 256 * 1024
+    __AUTOMERGE_SEGMENTS = 2
+    __MERGE_PAGES_AFTER_UPDATE = 1000
+    # Rows of contentless FTS5 tables can be deleted only since SQLite 3.43 (contentless_delete option)
+    __CONTENTLESS_DELETE_MIN_SQLITE_VERSION = (3, 43, 0)
 
-    def __init__(self, name: str, storage_path: str, serialized_data: Optional[bytes] = None):
+    def __init__(self, name: str, storage_path: str, serialized_data: Optional[bytes] = None, bulk_load: bool = False):
         self.name = name
         self.__storage_path = storage_path
         self.__db_path = os.path.join(storage_path, self.__DB_FILE_NAME)
         self.__conn = None
+        self.__is_contentless = False
+        self.__schema_version = None
+        self.__bulk_load = bulk_load
+        self.__is_changed = False
 
         if serialized_data is not None:
             self.__migrate_legacy_data(serialized_data)
@@ -27,54 +38,60 @@ class SqlliteIndexer(BaseIndexer):
         return self.name
 
     def index_texts(self, ids: np.ndarray, texts: List[str], items_metadata: list[dict] = None) -> None:
-        rows = [(str(int(id_val)), text) for id_val, text in zip(ids, texts)]
-        self.__get_conn().executemany(
-            "INSERT INTO documents(doc_id, content) VALUES (?, ?)", rows
+        conn = self.__get_writable_conn()
+        rows = [(self.__convert_id(id_val), text) for id_val, text in zip(ids, texts)]
+        conn.executemany(
+            f"INSERT INTO documents({self.__get_id_column()}, content) VALUES (?, ?)", rows
         )
 
         if items_metadata:
             metadata_rows = [(str(int(id_val)), json.dumps(meta)) for id_val, meta in zip(ids, items_metadata)]
-            self.__get_conn().executemany(
+            conn.executemany(
                 "INSERT OR REPLACE INTO metadata(doc_id, data) VALUES (?, ?)", metadata_rows
             )
 
-        self.__get_conn().commit()
+        conn.commit()
+        self.__is_changed = True
 
     def remove_ids(self, ids: np.ndarray) -> None:
+        conn = self.__get_writable_conn()
         str_ids = [str(int(id_val)) for id_val in ids]
         batch_size = 500
         for i in range(0, len(str_ids), batch_size):
             batch = str_ids[i:i + batch_size]
             placeholders = ",".join("?" * len(batch))
-            self.__get_conn().execute(
-                f"DELETE FROM documents WHERE doc_id IN ({placeholders})", batch
+            conn.execute(
+                f"DELETE FROM documents WHERE {self.__get_id_column()} IN ({placeholders})", [self.__convert_id(id_val) for id_val in batch]
             )
-            self.__get_conn().execute(
+            conn.execute(
                 f"DELETE FROM metadata WHERE doc_id IN ({placeholders})", batch
             )
-        self.__get_conn().commit()
+        conn.commit()
+        self.__is_changed = True
 
     def serialize(self) -> bytes:
         raise NotImplementedError("SqlliteIndexer uses persistent storage, serialization is not needed")
 
-    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    def search(self, text: str, number_of_results: int = 10, filter: Optional[str] = None, search_params: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
         query = self.__prepare_query(text)
         filter_expression = parse_filter(filter)
+        conn = self.__get_conn()
+        id_column = self.__get_id_column()
 
         if filter_expression:
             where_clause, filter_params = self.__convert_filter_to_sql(filter_expression)
-            cursor = self.__get_conn().execute(
-                "SELECT doc_id, bm25(documents) as score "
+            cursor = conn.execute(
+                f"SELECT {id_column}, bm25(documents) as score "
                 "FROM documents "
                 "WHERE documents MATCH ? "
-                f"AND doc_id IN (SELECT doc_id FROM metadata WHERE {where_clause}) "
+                f"AND {id_column} IN (SELECT {self.__get_metadata_id_expression()} FROM metadata WHERE {where_clause}) "
                 "ORDER BY bm25(documents) "
                 "LIMIT ?",
                 (query, *filter_params, number_of_results)
             )
         else:
-            cursor = self.__get_conn().execute(
-                "SELECT doc_id, bm25(documents) as score "
+            cursor = conn.execute(
+                f"SELECT {id_column}, bm25(documents) as score "
                 "FROM documents "
                 "WHERE documents MATCH ? "
                 "ORDER BY bm25(documents) "
@@ -93,27 +110,119 @@ class SqlliteIndexer(BaseIndexer):
         return np.array([scores]), np.array([ids])
 
     def get_size(self) -> int:
-        cursor = self.__get_conn().execute("SELECT COUNT(*) FROM documents")
-        return cursor.fetchone()[0]
+        conn = self.__get_conn()
+        # Contentless table has no rows to scan, every indexed row has its size record
+        table_name = "documents_docsize" if self.__is_contentless else "documents"
+        return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
 
     def support_metadata(self) -> bool:
         return True
 
+    def flush(self) -> None:
+        if not self.__is_changed:
+            return
+
+        conn = self.__get_conn()
+        if self.__bulk_load:
+            # Built index is merged into a single segment, later updates are merged automatically by FTS5
+            conn.execute("INSERT INTO documents(documents) VALUES ('optimize')")
+            conn.execute("INSERT INTO documents(documents, rank) VALUES ('automerge', ?)", (self.__AUTOMERGE_SEGMENTS,))
+            conn.commit()
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("PRAGMA synchronous=FULL")
+            self.__bulk_load = False
+        else:
+            conn.execute("INSERT INTO documents(documents, rank) VALUES ('merge', ?)", (self.__MERGE_PAGES_AFTER_UPDATE,))
+            conn.commit()
+
+        self.__is_changed = False
+        logging.info(f"BM25 index {self.name}: {self.__get_number_of_segments()} FTS5 segments, {self.get_size()} chunks, {os.path.getsize(self.__db_path) / 1024 / 1024:.1f} MB")
+
+    def warm_up(self) -> None:
+        read_files_into_page_cache(self.__db_path)
+        self.search("warm up", number_of_results=1)
+
     def __get_conn(self):
         if self.__conn is None:
             os.makedirs(self.__storage_path, exist_ok=True)
             db_exists = os.path.exists(self.__db_path)
             self.__conn = sqlite3.connect(self.__db_path)
+            if self.__bulk_load:
+                # Database is built from scratch and can be rebuilt if the build fails, so durability is traded for speed
+                self.__conn.execute("PRAGMA journal_mode=WAL")
+                self.__conn.execute("PRAGMA synchronous=OFF")
+                self.__conn.execute(f"PRAGMA cache_size=-{self.__BULK_LOAD_CACHE_SIZE_IN_KB}")
+                self.__conn.execute("PRAGMA temp_store=MEMORY")
             if not db_exists:
-                self.__conn.execute(
-                    "CREATE VIRTUAL TABLE documents USING fts5(doc_id UNINDEXED, content)"
-                )
+                self.__conn.execute(self.__build_create_documents_table_sql("documents"))
                 self.__conn.execute(
                     "CREATE TABLE metadata (doc_id TEXT PRIMARY KEY, data JSON)"
                 )
                 self.__conn.commit()
+        self.__refresh_table_format()
         return self.__conn
 
+    def __get_writable_conn(self):
+        conn = self.__get_conn()
+        # Migration runs only on writes, so read-only searchers never change the database
+        if not self.__is_contentless and self.__is_contentless_supported():
+            self.__migrate_to_contentless_table()
+        return conn
+
+    def __refresh_table_format(self):
+        # Table can be migrated to the contentless format by another process while the connection is open
+        schema_version = self.__conn.execute("PRAGMA schema_version").fetchone()[0]
+        if schema_version != self.__schema_version:
+            self.__schema_version = schema_version
+            self.__is_contentless = self.__is_contentless_table()
+
+    def __is_contentless_supported(self) -> bool:
+        return sqlite3.sqlite_version_info >= self.__CONTENTLESS_DELETE_MIN_SQLITE_VERSION
+
+    def __build_create_documents_table_sql(self, table_name: str) -> str:
+        if self.__is_contentless_supported():
+            # Only the inverted index is stored, chunks text is kept in collection documents
+            return f"CREATE VIRTUAL TABLE {table_name} USING fts5(content, content='', contentless_delete=1)"
+        return f"CREATE VIRTUAL TABLE {table_name} USING fts5(doc_id UNINDEXED, content)"
+
+    def __is_contentless_table(self) -> bool:
+        row = self.__conn.execute("SELECT sql FROM sqlite_master WHERE name='documents'").fetchone()
+        return row is not None and "content=''" in row[0]
+
+    def __migrate_to_contentless_table(self):
+        self.__conn.execute("BEGIN IMMEDIATE")
+        # Another writer could migrate the table while this one was waiting for the write lock
+        if self.__is_contentless_table():
+            self.__conn.rollback()
+        else:
+            logging.info(f"Migrating BM25 index {self.name} to contentless FTS5 table, chunks text is removed from the index")
+            self.__conn.execute(self.__build_create_documents_table_sql("documents_contentless"))
+            self.__conn.execute("INSERT INTO documents_contentless(rowid, content) SELECT CAST(doc_id AS INTEGER), content FROM documents")
+            self.__conn.execute("DROP TABLE documents")
+            self.__conn.execute("ALTER TABLE documents_contentless RENAME TO documents")
+            self.__conn.commit()
+            self.__vacuum()
+
+        self.__refresh_table_format()
+
+    def __vacuum(self):
+        try:
+            self.__conn.execute("VACUUM")
+        except sqlite3.OperationalError as error:
+            logging.warning(f"BM25 index {self.name} is not vacuumed after migration ({error}), space of removed chunks text is reused by later updates")
+
+    def __get_id_column(self) -> str:
+        return "rowid" if self.__is_contentless else "doc_id"
+
+    def __get_metadata_id_expression(self) -> str:
+        return "CAST(doc_id AS INTEGER)" if self.__is_contentless else "doc_id"
+
+    def __convert_id(self, id_val):
+        return int(id_val) if self.__is_contentless else str(int(id_val))
+
+    def __get_number_of_segments(self) -> int:
+        return self.__get_conn().execute("SELECT COUNT(DISTINCT segid) FROM documents_idx").fetchone()[0]
+
     def __migrate_legacy_data(self, serialized_data: bytes):
         os.makedirs(self.__storage_path, exist_ok=True)
         with open(self.__db_path, "wb") as f:
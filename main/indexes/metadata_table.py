@@ -0,0 +1,226 @@
+import os
+import re
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from main.indexes.filter_parser import FilterNode, FilterCondition
+from main.indexes.base_metadata_table import BaseMetadataTable
+
+
+class MetadataTable(BaseMetadataTable):
+    __DATE_FIELDS = {"createdAt", "lastModifiedAt"}
+    __MISSING_CODE = -1
+    __MIN_CAPACITY = 1024
+    __MAX_NUMBER_OF_DELTAS = 16
+    __DELTA_FILE_NAME_PATTERN = re.compile(r"_delta_(\d+)\.npz$")
+
+    def __init__(self):
+        self.__values_by_field = {}
+        self.__codes_by_value_by_field = {}
+        self.__codes_by_field = {}
+        self.__capacity = 0
+        self.__is_changed = False
+        self.__is_stored = False
+        self.__changed_ids = []
+        self.__numbers_of_saved_values_by_field = {}
+        self.__last_delta_number = 0
+        self.__number_of_deltas = 0
+
+    def add(self, ids: np.ndarray, items_metadata: Optional[list[dict]]) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+
+        self.__ensure_capacity(int(ids.max()) + 1)
+        self.__clear_rows(ids)
+        for item_id, metadata in zip(ids, items_metadata or []):
+            for field, value in (metadata or {}).items():
+                if value is not None:
+                    codes = self.__get_codes(field)
+                    codes[item_id] = self.__get_value_code(field, str(value))
+        self.__changed_ids.append(ids)
+        self.__is_changed = True
+
+    def remove(self, ids: np.ndarray) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        ids = ids[ids < self.__capacity]
+        if len(ids) == 0:
+            return
+
+        self.__clear_rows(ids)
+        self.__changed_ids.append(ids)
+        self.__is_changed = True
+
+    def filter(self, node: FilterNode) -> np.ndarray:
+        if isinstance(node, FilterCondition):
+            return self.__filter_condition(node)
+
+        masks = [self.filter(child) for child in node.children]
+        if node.logical_operator == "and":
+            return np.logical_and.reduce(masks)
+        return np.logical_or.reduce(masks)
+
+    def is_changed(self) -> bool:
+        return self.__is_changed
+
+    def save(self, path: str, compact: bool = False) -> None:
+        changed_ids = np.unique(np.concatenate(self.__changed_ids)) if self.__changed_ids else np.empty(0, dtype=np.int64)
+        # Small updates are appended as delta files, so a flush doesn't rewrite the codes of every row
+        if (not compact and self.__is_stored and self.__number_of_deltas < self.__MAX_NUMBER_OF_DELTAS
+                and 4 * len(changed_ids) < self.__capacity):
+            self.__save_delta(path, changed_ids)
+        else:
+            self.__save_base(path)
+
+        self.__changed_ids = []
+        self.__numbers_of_saved_values_by_field = {field: len(values) for field, values in self.__values_by_field.items()}
+        self.__is_stored = True
+        self.__is_changed = False
+
+    @staticmethod
+    def load(path: str) -> "MetadataTable":
+        table = MetadataTable()
+        with np.load(path, allow_pickle=False) as columns:
+            table.__capacity = int(columns["capacity"])
+            table.__last_delta_number = int(columns["lastDeltaNumber"]) if "lastDeltaNumber" in columns.files else 0
+            for key in columns.files:
+                if key.startswith("values:"):
+                    field = key[len("values:"):]
+                    table.__values_by_field[field] = columns[key].tolist()
+                    table.__codes_by_value_by_field[field] = {value: code for code, value in enumerate(table.__values_by_field[field])}
+                    table.__codes_by_field[field] = columns[f"codes:{field}"]
+
+        for delta_number, delta_path in MetadataTable.__find_delta_paths(path):
+            if delta_number > table.__last_delta_number:
+                table.__apply_delta(delta_path)
+                table.__last_delta_number = delta_number
+                table.__number_of_deltas += 1
+
+        table.__numbers_of_saved_values_by_field = {field: len(values) for field, values in table.__values_by_field.items()}
+        table.__is_stored = True
+        return table
+
+    def __save_base(self, path):
+        columns = {}
+        for field, values in self.__values_by_field.items():
+            columns[f"values:{field}"] = np.array(values, dtype=np.str_)
+            columns[f"codes:{field}"] = self.__codes_by_field[field]
+
+        self.__write_columns(path, capacity=np.array(self.__capacity), lastDeltaNumber=np.array(self.__last_delta_number), **columns)
+
+        # Deltas are removed only after the base which includes them is written, so an interrupted save loses nothing
+        for _, delta_path in self.__find_delta_paths(path):
+            os.remove(delta_path)
+        self.__number_of_deltas = 0
+
+    def __save_delta(self, path, changed_ids):
+        columns = {}
+        for field, codes in self.__codes_by_field.items():
+            number_of_saved_values = self.__numbers_of_saved_values_by_field.get(field, 0)
+            changed_codes = codes[changed_ids]
+            if number_of_saved_values < len(self.__values_by_field[field]) or (changed_codes != self.__MISSING_CODE).any():
+                columns[f"values:{field}"] = np.array(self.__values_by_field[field][number_of_saved_values:], dtype=np.str_)
+                columns[f"codes:{field}"] = changed_codes
+
+        self.__last_delta_number += 1
+        self.__write_columns(self.__build_delta_path(path, self.__last_delta_number),
+                             capacity=np.array(self.__capacity), ids=changed_ids, **columns)
+        self.__number_of_deltas += 1
+
+    def __apply_delta(self, delta_path):
+        with np.load(delta_path, allow_pickle=False) as columns:
+            ids = columns["ids"]
+            self.__ensure_capacity(int(columns["capacity"]))
+            # Rows of the delta without codes were removed
+            self.__clear_rows(ids)
+            for key in columns.files:
+                if key.startswith("values:"):
+                    field = key[len("values:"):]
+                    codes = self.__get_codes(field)
+                    for value in columns[key].tolist():
+                        self.__get_value_code(field, value)
+                    codes[ids] = columns[f"codes:{field}"]
+
+    def __write_columns(self, path, **columns):
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as table_file:
+            np.savez(table_file, **columns)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def __find_delta_paths(path):
+        directory_path = os.path.dirname(path) or "."
+        delta_file_name_prefix = os.path.basename(os.path.splitext(path)[0])
+        delta_paths = []
+        for file_name in os.listdir(directory_path):
+            match = MetadataTable.__DELTA_FILE_NAME_PATTERN.search(file_name)
+            if match and file_name[:match.start()] == delta_file_name_prefix:
+                delta_paths.append((int(match.group(1)), os.path.join(directory_path, file_name)))
+
+        return sorted(delta_paths)
+
+    @staticmethod
+    def __build_delta_path(path, delta_number):
+        return f"{os.path.splitext(path)[0]}_delta_{delta_number:06d}.npz"
+
+    def __filter_condition(self, condition):
+        if condition.field not in self.__codes_by_field:
+            return np.zeros(self.__capacity, dtype=bool)
+
+        expected_value = self.__convert_value(condition.field, condition.value)
+        matching_codes = [self.__compare(self.__convert_value(condition.field, value), condition.operator, expected_value)
+                          for value in self.__values_by_field[condition.field]]
+        # Missing value code -1 selects the trailing False
+        return np.array(matching_codes + [False], dtype=bool)[self.__codes_by_field[condition.field]]
+
+    def __compare(self, value, operator, expected_value):
+        if operator == "=":
+            return value == expected_value
+        if operator == "!=":
+            return value != expected_value
+        if operator == ">":
+            return value > expected_value
+        if operator == ">=":
+            return value >= expected_value
+        if operator == "<":
+            return value < expected_value
+        return value <= expected_value
+
+    def __convert_value(self, field, value):
+        if field not in self.__DATE_FIELDS:
+            return value
+
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return int(datetime.fromisoformat(value).timestamp())
+
+    def __clear_rows(self, ids):
+        for codes in self.__codes_by_field.values():
+            codes[ids] = self.__MISSING_CODE
+
+    def __get_codes(self, field):
+        if field not in self.__codes_by_field:
+            self.__values_by_field[field] = []
+            self.__codes_by_value_by_field[field] = {}
+            self.__codes_by_field[field] = np.full(self.__capacity, self.__MISSING_CODE, dtype=np.int32)
+
+        return self.__codes_by_field[field]
+
+    def __get_value_code(self, field, value):
+        codes_by_value = self.__codes_by_value_by_field[field]
+        if value not in codes_by_value:
+            codes_by_value[value] = len(self.__values_by_field[field])
+            self.__values_by_field[field].append(value)
+
+        return codes_by_value[value]
+
+    def __ensure_capacity(self, required_capacity):
+        if required_capacity <= self.__capacity:
+            return
+
+        capacity = max(required_capacity, 2 * self.__capacity, self.__MIN_CAPACITY)
+        for field, codes in self.__codes_by_field.items():
+            self.__codes_by_field[field] = np.concatenate([codes, np.full(capacity - len(codes), self.__MISSING_CODE, dtype=np.int32)])
+        self.__capacity = capacity
@@ -0,0 +1,34 @@
+import time
+
+import numpy as np
+
+from main.indexes.indexers.base_indexer import BaseIndexer
+
+
+def sweep_ef_search(indexer: BaseIndexer, queries: list[str], ef_search_values: list[int], number_of_results: int = 10) -> list[dict]:
+    # Search with candidates list as big as the index visits the whole HNSW graph, its results are used as exact ones
+    exact_ids = [__search(indexer, query, number_of_results, indexer.get_size())[0] for query in queries]
+
+    results = []
+    for ef_search in ef_search_values:
+        recalls = []
+        durations = []
+        for query, query_exact_ids in zip(queries, exact_ids):
+            ids, duration = __search(indexer, query, number_of_results, ef_search)
+            recalls.append(len(set(ids) & set(query_exact_ids)) / len(query_exact_ids) if query_exact_ids else 1.0)
+            durations.append(duration)
+
+        results.append({
+            "efSearch": ef_search,
+            "recall": round(float(np.mean(recalls)), 4),
+            "meanLatencyInMs": round(float(np.mean(durations)) * 1000, 3),
+            "p95LatencyInMs": round(float(np.percentile(durations, 95)) * 1000, 3),
+        })
+
+    return results
+
+
+def __search(indexer, query, number_of_results, ef_search):
+    start_time = time.perf_counter()
+    _, ids = indexer.search(query, number_of_results, search_params={"efSearch": ef_search})
+    return ids[0].tolist(), time.perf_counter() - start_time
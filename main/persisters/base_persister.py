@@ -29,3 +29,6 @@ class BasePersister(ABC):
 
     @abstractmethod
     def read_folder_files(self, relative_path: str) -> List[str]: ...
+
+    @abstractmethod
+    def get_absolute_path(self, relative_path: str) -> str: ...
@@ -63,7 +63,7 @@ class DiskPersister(BasePersister):
                 files.append(os.path.relpath(os.path.join(root, filename), path))
         return files
 
-    def get_absolute_path(self, relative_path):
+    def get_absolute_path(self, relative_path) -> str:
         return os.path.abspath(os.path.join(self.base_path, relative_path))
 
     def __make_sure_path_exists(self, path):
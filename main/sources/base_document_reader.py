@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generator
+from typing import Generator, Optional
 
 
 class BaseDocumentReader(ABC):
@@ -11,3 +11,9 @@ class BaseDocumentReader(ABC):
 
     @abstractmethod
     def get_reader_details(self) -> dict: ...
+
+    def get_state(self) -> Optional[dict]:
+        return None
+
+    def get_removed_document_ids(self) -> list[str]:
+        return []
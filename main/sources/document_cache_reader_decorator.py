@@ -1,52 +1,197 @@
+import os
+import re
+import gzip
 import json
 import hashlib
 import logging
-from typing import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Generator, Optional
 from main.sources.base_document_reader import BaseDocumentReader
 from main.persisters.base_persister import BasePersister
+from main.utils.file_lock import lock_file
 
 class CacheReaderDecorator(BaseDocumentReader):
-    def __init__(self, reader: BaseDocumentReader, persister: BasePersister):
+    __INDEX_FILE_NAME = "index.json"
+    __REGISTRY_FILE_PATH = "registry.json"
+    __REGISTRY_LOCK_FILE_PATH = "registry.lock"
+    __CACHE_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}(_completed)?$")
+
+    def __init__(self,
+                 reader: BaseDocumentReader,
+                 persister: BasePersister,
+                 max_cache_size_in_bytes: int = 5 * 1024 ** 3,
+                 max_cache_age: timedelta = timedelta(days=30),
+                 max_documents_per_segment: int = 1000):
         self.reader = reader
         self.persister = persister
+        self.max_cache_size_in_bytes = max_cache_size_in_bytes
+        self.max_cache_age = max_cache_age
+        self.max_documents_per_segment = max_documents_per_segment
 
     def read_all_documents(self) -> Generator:
         cache_key = self.__build_cache_key()
 
-        if self.persister.is_path_exists(cache_key) and self.persister.is_path_exists(f"{cache_key}_completed"):
+        if self.__is_cache_completed(cache_key):
             logging.info(f"Cache hit during 'read_all_documents' for {cache_key}")
-            for file_name in self.persister.read_folder_files(cache_key):
-                yield json.loads(self.persister.read_text_file(f"{cache_key}/{file_name}"))
-        else:
-            self.persister.remove_folder(cache_key)
-            self.persister.create_folder(cache_key)
-            document_index = -1
-            for document in self.reader.read_all_documents():
-                document_index += 1
-                self.persister.save_text_file(json.dumps(document, indent=2, ensure_ascii=False), f"{cache_key}/{document_index}.json")
-
-                yield document
-            
-            self.persister.save_text_file("", f"{cache_key}_completed")
-    
+            self.__touch_registry_entry(cache_key)
+            for segment in self.__read_index(cache_key)["segments"]:
+                yield from self.__read_segment(cache_key, segment["fileName"])
+            return
+
+        self.__remove_cache_files(cache_key)
+        self.persister.create_folder(cache_key)
+        self.__register_cache(cache_key)
+
+        segments = []
+        segment_writer = None
+        for document in self.reader.read_all_documents():
+            if segment_writer is None or segments[-1]["numberOfDocuments"] >= self.max_documents_per_segment:
+                segment_writer = self.__open_next_segment(cache_key, segments, segment_writer)
+
+            segment_writer.write(json.dumps(document, ensure_ascii=False))
+            segment_writer.write("\n")
+            segments[-1]["numberOfDocuments"] += 1
+
+            yield document
+
+        if segment_writer is not None:
+            segment_writer.close()
+
+        self.__complete_cache(cache_key, segments)
+
     def get_number_of_documents(self) -> int:
         cache_key = self.__build_cache_key()
-        
-        if self.persister.is_path_exists(cache_key) and self.persister.is_path_exists(f"{cache_key}_completed"):
+
+        if self.__is_cache_completed(cache_key):
             logging.info(f"Cache hit during 'get_number_of_documents' for {cache_key}")
-            return len(self.persister.read_folder_files(cache_key))
+            return self.__read_index(cache_key)["numberOfDocuments"]
         else:
             return self.reader.get_number_of_documents()
 
     def get_reader_details(self) -> dict:
         return self.reader.get_reader_details()
 
+    def get_state(self) -> Optional[dict]:
+        return self.reader.get_state()
+
+    def get_removed_document_ids(self) -> list[str]:
+        return self.reader.get_removed_document_ids()
+
     def remove_cache(self) -> None:
         cache_key = self.__build_cache_key()
 
+        with self.__lock_registry():
+            self.__remove_cache_files(cache_key)
+
+            registry = self.__read_registry()
+            registry.pop(cache_key, None)
+            self.__save_registry(registry)
+
+    def __build_cache_key(self):
+        hash_object = hashlib.sha256(json.dumps(self.reader.get_reader_details()).encode('utf-8'))
+        return hash_object.hexdigest()
+
+    def __is_cache_completed(self, cache_key):
+        return self.persister.is_path_exists(f"{cache_key}/{self.__INDEX_FILE_NAME}")
+
+    def __read_index(self, cache_key):
+        return json.loads(self.persister.read_text_file(f"{cache_key}/{self.__INDEX_FILE_NAME}"))
+
+    def __read_segment(self, cache_key, segment_file_name):
+        with gzip.open(self.persister.get_absolute_path(f"{cache_key}/{segment_file_name}"), "rt", encoding="utf-8") as segment_file:
+            for line in segment_file:
+                yield json.loads(line)
+
+    def __open_next_segment(self, cache_key, segments, current_segment_writer):
+        if current_segment_writer is not None:
+            current_segment_writer.close()
+
+        segment_file_name = f"segment_{len(segments)}.jsonl.gz"
+        segments.append({ "fileName": segment_file_name, "numberOfDocuments": 0 })
+
+        return gzip.open(self.persister.get_absolute_path(f"{cache_key}/{segment_file_name}"), "wt", encoding="utf-8", compresslevel=6)
+
+    def __complete_cache(self, cache_key, segments):
+        for segment in segments:
+            segment["sizeInBytes"] = os.path.getsize(self.persister.get_absolute_path(f"{cache_key}/{segment['fileName']}"))
+
+        index = {
+            "numberOfDocuments": sum(segment["numberOfDocuments"] for segment in segments),
+            "sizeInBytes": sum(segment["sizeInBytes"] for segment in segments),
+            "segments": segments,
+        }
+        self.persister.save_text_file(json.dumps(index, indent=2), f"{cache_key}/{self.__INDEX_FILE_NAME}")
+
+        with self.__lock_registry():
+            registry = self.__read_registry()
+            registry[cache_key] = {
+                "lastAccessTime": datetime.now(timezone.utc).isoformat(),
+                "sizeInBytes": index["sizeInBytes"],
+            }
+            self.__evict(registry, protected_cache_key=cache_key)
+            self.__save_registry(registry)
+
+    def __register_cache(self, cache_key):
+        with self.__lock_registry():
+            registry = self.__read_registry()
+            # Cache is registered before it is written, so creates running in parallel don't remove it as unregistered
+            registry[cache_key] = {
+                "lastAccessTime": datetime.now(timezone.utc).isoformat(),
+                "sizeInBytes": 0,
+                "isInProgress": True,
+            }
+            self.__save_registry(registry)
+
+    def __touch_registry_entry(self, cache_key):
+        with self.__lock_registry():
+            registry = self.__read_registry()
+            registry[cache_key] = {
+                "lastAccessTime": datetime.now(timezone.utc).isoformat(),
+                "sizeInBytes": self.__read_index(cache_key)["sizeInBytes"],
+            }
+            self.__save_registry(registry)
+
+    def __evict(self, registry, protected_cache_key):
+        self.__remove_unregistered_caches(registry, protected_cache_key)
+
+        expiration_time = datetime.now(timezone.utc) - self.max_cache_age
+        for cache_key in [key for key, entry in registry.items() if key != protected_cache_key and datetime.fromisoformat(entry["lastAccessTime"]) < expiration_time]:
+            logging.info(f"Removing expired cache {cache_key}")
+            self.__remove_cache_files(cache_key)
+            del registry[cache_key]
+
+        total_size = sum(entry["sizeInBytes"] for entry in registry.values())
+        for cache_key, entry in sorted(registry.items(), key=lambda item: item[1]["lastAccessTime"]):
+            if total_size <= self.max_cache_size_in_bytes:
+                break
+            if cache_key == protected_cache_key or entry.get("isInProgress"):
+                continue
+
+            logging.info(f"Removing least recently used cache {cache_key} to keep caches size under {self.max_cache_size_in_bytes} bytes")
+            self.__remove_cache_files(cache_key)
+            total_size -= entry["sizeInBytes"]
+            del registry[cache_key]
+
+    def __remove_unregistered_caches(self, registry, protected_cache_key):
+        for entry_name in os.listdir(self.persister.get_absolute_path("")):
+            cache_key = entry_name.removesuffix("_completed")
+            if not self.__CACHE_KEY_PATTERN.match(entry_name) or cache_key in registry or cache_key == protected_cache_key:
+                continue
+
+            logging.info(f"Removing unregistered cache {entry_name}")
+            self.__remove_cache_files(cache_key)
+
+    def __remove_cache_files(self, cache_key):
         self.persister.remove_folder(cache_key)
         self.persister.remove_file(f"{cache_key}_completed")
 
-    def __build_cache_key(self):
-        hash_object = hashlib.sha256(json.dumps(self.reader.get_reader_details()).encode('utf-8')) 
-        return hash_object.hexdigest()
\ No newline at end of file
+    def __lock_registry(self):
+        return lock_file(self.persister.get_absolute_path(self.__REGISTRY_LOCK_FILE_PATH))
+
+    def __read_registry(self):
+        if not self.persister.is_path_exists(self.__REGISTRY_FILE_PATH):
+            return {}
+        return json.loads(self.persister.read_text_file(self.__REGISTRY_FILE_PATH))
+
+    def __save_registry(self, registry):
+        self.persister.save_text_file(json.dumps(registry, indent=2), self.__REGISTRY_FILE_PATH)
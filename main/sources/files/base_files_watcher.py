@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class BaseFilesWatcher(ABC):
+    @abstractmethod
+    def wait_for_changes(self) -> Optional[list[str]]: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class BaseParsedContentCache(ABC):
+    @abstractmethod
+    def read(self, file_hash: str, parser_details: dict) -> Optional[list[dict]]: ...
+
+    @abstractmethod
+    def save(self, file_hash: str, parser_details: dict, content: list[dict]) -> None: ...
@@ -14,6 +14,8 @@ class FilesDocumentConverter(BaseDocumentConverter):
         }
 
     def convert(self, document) -> list[dict]:
+        texts, chunks = self.__read_content(document)
+
         return [{
             "id": document['fileRelativePath'],
             "url": self.__build_url(document),
@@ -22,23 +24,28 @@ class FilesDocumentConverter(BaseDocumentConverter):
                 "lastModifiedAt": document['modifiedTime'],
                 **self.__build_folder_metadata(document['fileRelativePath']),
             },
-            "text": self.__build_document_text(document),
-            "chunks": self.__split_to_chunks(document)
+            "text": self.__build_document_text(document, texts),
+            "chunks": chunks,
+            **self.__build_duplicates(document),
         }]
     
-    def __build_document_text(self, document):
-        content = self.__convert_to_text([content_part['text'] for content_part in document['content']], "")
+    def __build_document_text(self, document, texts):
+        content = self.__convert_to_text(texts, "")
         return self.__convert_to_text([document['fileRelativePath'], content])
     
     def __convert_to_text(self, elements, delimiter="\n\n"):
         return delimiter.join([element for element in elements if element]).strip()
     
-    def __split_to_chunks(self, document):
+    # Content of large files is a generator of page parts, so it is iterated only once
+    def __read_content(self, document):
+        texts = []
         chunks = [{
                 "indexedData": document['fileRelativePath']
             }]
         
         for content_part in document['content']:
+            texts.append(content_part['text'])
+
             if content_part['text'].strip():
                 for chunk in self.__text_splitter.split_text(content_part['text']):
                     chunks.append({
@@ -46,8 +53,16 @@ class FilesDocumentConverter(BaseDocumentConverter):
                         "indexedData": chunk
                     })
 
-            
-        return chunks
+        return texts, chunks
+
+    def __build_duplicates(self, document) -> dict:
+        duplicate_paths = document.get('duplicateFileRelativePaths')
+        if not duplicate_paths:
+            return {}
+
+        return {
+            "duplicateFileRelativePaths": duplicate_paths,
+        }
 
     def __build_folder_metadata(self, path) -> dict:
         folders = os.path.dirname(path).split(os.sep)
@@ -1,11 +1,28 @@
+import io
 import os
 import logging
 import json
 import datetime
+import hashlib
 import re
-from unstructured.partition.auto import partition
+import stat
+import time
+import zipfile
 from typing import Generator
 from main.sources.base_document_reader import BaseDocumentReader
+from main.sources.files.base_parsed_content_cache import BaseParsedContentCache
+from main.sources.files.text_file_readers import TEXT_FILE_EXTENSIONS, HTML_FILE_EXTENSIONS, read_text_file, read_html_file
+
+# Unstructured takes seconds to import, so it is imported only when a file needs to be parsed by it
+def partition(**kwargs):
+    from unstructured.partition.auto import partition as unstructured_partition
+    return unstructured_partition(**kwargs)
+
+
+def get_unstructured_version():
+    from unstructured.__version__ import __version__
+    return __version__
+
 
 EXCLUDED_FILE_EXTENSIONS = [
     ".DS_Store",
@@ -108,56 +125,96 @@ EXCLUDED_FILE_EXTENSIONS = [
 ]
 
 class FilesDocumentReader(BaseDocumentReader):
+    __STREAMED_CONTENT_TYPES_BY_EXTENSION = {
+        ".pdf": "application/pdf",
+        ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    }
+    __PRESENTATION_PART_NAME = "ppt/presentation.xml"
+    __SLIDE_ID_PATTERN = re.compile(r"<p:sldId\b[^>]*/>")
+
     def __init__(self, base_path: str, 
                  include_patterns=[".*"], 
                  exclude_patterns=[], 
                  fail_fast: bool = False, 
-                 start_from_time = None):
+                 start_from_time = None,
+                 previous_state: dict = None,
+                 parsed_content_cache: BaseParsedContentCache = None,
+                 streaming_threshold_in_bytes: int = 100 * 1024 * 1024,
+                 pages_per_streaming_range: int = 50,
+                 strategies_by_extension: dict[str, list[str]] = {},
+                 min_characters_per_page: int = 20,
+                 changed_paths: list[str] = None):
         self.base_path = base_path
 
         self.include_patterns = include_patterns
         self.exclude_patterns = exclude_patterns
         self.compiled_include_patterns = [re.compile(pattern) for pattern in include_patterns]
         self.compiled_exclude_patterns = [re.compile(pattern) for pattern in exclude_patterns]
+        self.excluded_file_extensions = tuple(EXCLUDED_FILE_EXTENSIONS)
 
         self.fail_fast = fail_fast
         self.start_from_time = start_from_time
+        self.previous_file_states = previous_state["files"] if previous_state else None
+        self.changed_paths = changed_paths
 
         self.file_readers = {
-            ".json": self.__read_text_file, # By some reason unstructured lib tries to read json files as ndjson and fails
+            **{extension: read_text_file for extension in TEXT_FILE_EXTENSIONS},
+            **{extension: read_html_file for extension in HTML_FILE_EXTENSIONS},
         }
         self.default_reader = self.__read_file_by_unstructured_lib
+        self.parsed_content_cache = parsed_content_cache
+        self.streaming_threshold_in_bytes = streaming_threshold_in_bytes
+        self.pages_per_streaming_range = pages_per_streaming_range
+        self.strategies_by_extension = strategies_by_extension
+        self.min_characters_per_page = min_characters_per_page
+
+        self.__scanned_files = None
+        self.__current_file_states = None
+        self.__duplicate_paths_by_document_path = None
+        self.__changed_files = None
+        self.__failed_files = set()
+        self.__file_hash_errors = {}
+        self.__parsing_stats_by_strategy = {}
 
     def read_all_documents(self) -> Generator:
         result_stats = {
             "successFiles": [],
             "errorFiles": [],
+            "parsingStatsByExtension": {},
+            "parsedContentCacheHits": 0,
+            "parsingStatsByStrategy": {},
         }
+        self.__parsing_stats_by_strategy = result_stats["parsingStatsByStrategy"]
+
+        for relative_path, file_path, file_stat, duplicate_paths in self.__get_changed_files():
+            file_stat = file_stat or os.stat(file_path)
+            file_hash_error = self.__file_hash_errors.get(relative_path)
+            if file_hash_error is not None:
+                file_content, error, duration = None, file_hash_error, 0.0
+            else:
+                file_content, error, duration = self.__read_file(file_path, self.__current_file_states[relative_path]["hash"], result_stats)
 
-        for file_path in self.__read_file_pathes():
-            file_content, error = self.__read_file(file_path)
+            if isinstance(file_content, Generator):
+                yield from self.__read_streamed_file(relative_path, file_path, file_stat, duplicate_paths, file_content, duration, result_stats)
+                continue
 
-            self.__update_result_stats(result_stats, file_path, error)
+            self.__update_result_stats(result_stats, file_path, error, duration)
 
             if error:
+                self.__failed_files.add(relative_path)
+
                 if self.fail_fast:
                     raise RuntimeError(f"Error reading file {file_path}") from error
 
-                logging.exception(f"Error reading file {file_path}", error)
+                logging.exception(f"Error reading file {file_path}", exc_info=error)
                 continue
             
-            yield {
-               "fileRelativePath": os.path.relpath(file_path, self.base_path),
-               "fileFullPath": file_path,
-               "createdTime": self.__read_file_creation_time(file_path).isoformat(timespec='seconds'),
-               "modifiedTime": self.__read_file_modification_time(file_path).isoformat(timespec='seconds'),
-               "content": file_content
-            }
+            yield self.__build_document(relative_path, file_path, file_stat, duplicate_paths, file_content)
         
         logging.info(f"Files reading stats: \n{json.dumps(result_stats, indent=2, ensure_ascii=False)}")
 
     def get_number_of_documents(self) -> int:
-        return len(self.__read_file_pathes())
+        return len(self.__get_changed_files())
 
     def get_reader_details(self) -> dict:
         return {
@@ -166,48 +223,320 @@ class FilesDocumentReader(BaseDocumentReader):
             "includePatterns": self.include_patterns,
             "excludePatterns": self.exclude_patterns,
             "failFast": self.fail_fast,
+            "streamingThresholdInBytes": self.streaming_threshold_in_bytes,
+            "strategiesByExtension": self.strategies_by_extension,
+            "minCharactersPerPage": self.min_characters_per_page,
         }  
 
-    def __update_result_stats(self, result_stats, file_path, error):
+    def get_state(self) -> dict:
+        previous_file_states = self.previous_file_states or {}
+        file_states = {}
+        for relative_path, file_state in self.__get_current_file_states().items():
+            if relative_path not in self.__failed_files:
+                file_states[relative_path] = file_state
+            elif relative_path in previous_file_states:
+                # Failed file keeps its previous state, so its indexed chunks are still removed once the file is deleted
+                file_states[relative_path] = previous_file_states[relative_path]
+
+        return {"files": file_states}
+
+    def get_removed_document_ids(self) -> list[str]:
+        if self.previous_file_states is None:
+            return []
+
+        current_file_states = self.__get_current_file_states()
+        return [
+            relative_path
+            for relative_path, previous_file_state in self.previous_file_states.items()
+            if "duplicateOf" not in previous_file_state
+            and (relative_path not in current_file_states or "duplicateOf" in current_file_states[relative_path])
+        ]
+
+    def __build_document(self, relative_path, file_path, file_stat, duplicate_paths, content):
+        return {
+           "fileRelativePath": relative_path,
+           "fileFullPath": file_path,
+           "createdTime": self.__convert_timestamp_to_iso(file_stat.st_ctime),
+           "modifiedTime": self.__convert_timestamp_to_iso(file_stat.st_mtime),
+           "duplicateFileRelativePaths": duplicate_paths,
+           "content": content
+        }
+
+    def __read_streamed_file(self, relative_path, file_path, file_stat, duplicate_paths, content, duration, result_stats):
+        # First page range is read before the document is emitted, so a file failing right away doesn't replace its indexed chunks with an empty document
+        start_time = time.perf_counter()
+        try:
+            first_part = next(content, None)
+        except Exception as error:
+            self.__update_result_stats(result_stats, file_path, error, duration + time.perf_counter() - start_time)
+            self.__handle_streamed_file_error(relative_path, file_path, error, "nothing is indexed")
+            return
+
+        duration += time.perf_counter() - start_time
+        first_parts = [] if first_part is None else [first_part]
+        yield self.__build_document(relative_path, file_path, file_stat, duplicate_paths,
+                                    self.__read_streamed_content(relative_path, file_path, first_parts, content, duration, result_stats))
+
+    def __read_streamed_content(self, relative_path, file_path, first_parts, content, duration, result_stats):
+        yield from first_parts
+
+        error = None
+        while True:
+            # Only the time spent reading is measured, not the time the consumer spends on the yielded parts
+            start_time = time.perf_counter()
+            try:
+                part = next(content)
+            except StopIteration:
+                break
+            except Exception as e:
+                error = e
+                break
+            finally:
+                duration += time.perf_counter() - start_time
+
+            yield part
+
+        self.__update_result_stats(result_stats, file_path, error, duration)
+        if error:
+            self.__handle_streamed_file_error(relative_path, file_path, error, "only pages read before the error are indexed")
+
+    def __handle_streamed_file_error(self, relative_path, file_path, error, consequence):
+        # Previous state is kept for the failed file, so it is read again by the next update
+        self.__failed_files.add(relative_path)
+
+        if self.fail_fast:
+            raise RuntimeError(f"Error reading file {file_path}") from error
+
+        logging.exception(f"Error reading file {file_path}, {consequence}", exc_info=error)
+
+    def __update_result_stats(self, result_stats, file_path, error, duration):
         if error:
             result_stats["errorFiles"].append(file_path)
         else:
             result_stats["successFiles"].append(file_path)
+
+        file_extension = self.__get_file_extension(file_path) or "<none>"
+        extension_stats = result_stats["parsingStatsByExtension"].setdefault(file_extension, {
+            "numberOfFiles": 0,
+            "durationInSeconds": 0.0,
+        })
+        extension_stats["numberOfFiles"] += 1
+        extension_stats["durationInSeconds"] = round(extension_stats["durationInSeconds"] + duration, 3)
  
-    def __read_file(self, file_path: str):
-        file_extension = os.path.splitext(file_path)[1].lower()
-        file_reader = self.file_readers.get(file_extension, self.default_reader)
+    def __read_file(self, file_path: str, file_hash, result_stats):
+        file_reader = self.file_readers.get(self.__get_file_extension(file_path))
 
+        start_time = time.perf_counter()
         try:
-            return file_reader(file_path), None
+            if file_reader is not None:
+                return file_reader(file_path), None, time.perf_counter() - start_time
+
+            return self.__read_file_by_default_reader(file_path, file_hash, result_stats), None, time.perf_counter() - start_time
         except Exception as e:
-            return None, e
-        
-    def __read_file_modification_time(self, file_path: str):
-        mod_time = os.path.getmtime(file_path)
-        return datetime.datetime.fromtimestamp(mod_time)
-    
-    def __read_file_creation_time(self, file_path: str):
-        creation_time = os.path.getctime(file_path)
-        return datetime.datetime.fromtimestamp(creation_time)
-
-    def __read_file_pathes(self):
-        file_paths = []
-        for root, _, files in os.walk(self.base_path):
-            for file_name in files:
-                full_path = os.path.join(root, file_name)
-                relative_path = os.path.relpath(full_path, self.base_path)
-
-                if (
-                    os.path.isfile(full_path)
-                    and self.__is_file_included(relative_path)
-                    and not any(relative_path.endswith(ext) for ext in EXCLUDED_FILE_EXTENSIONS)
-                    and not self.__is_file_excluded(relative_path)
-                    and (self.start_from_time is None or self.__read_file_modification_time(full_path) > self.start_from_time)
-                ):
-                    file_paths.append(full_path)
-
-        return file_paths
+            return None, e, time.perf_counter() - start_time
+
+    def __read_file_by_default_reader(self, file_path, file_hash, result_stats):
+        # Streamed files are not cached, because their content is never held in memory as a whole
+        if self.parsed_content_cache is None or file_hash is None or self.__is_streamed_file(file_path):
+            return self.default_reader(file_path)
+
+        parser_details = self.__get_default_reader_details(file_path)
+
+        cached_content = self.parsed_content_cache.read(file_hash, parser_details)
+        if cached_content is not None:
+            result_stats["parsedContentCacheHits"] += 1
+            return cached_content
+
+        content = self.default_reader(file_path)
+        self.parsed_content_cache.save(file_hash, parser_details, content)
+        return content
+
+    def __get_default_reader_details(self, file_path):
+        return {
+            "parser": "unstructured",
+            "version": get_unstructured_version(),
+            "strategies": self.__get_strategies(file_path),
+        }
+
+    def __get_strategies(self, file_path):
+        return self.strategies_by_extension.get(self.__get_file_extension(file_path), ["auto"])
+
+    def __get_file_extension(self, file_path):
+        return os.path.splitext(file_path)[1].lower()
+
+    def __convert_timestamp_to_iso(self, timestamp):
+        return datetime.datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+
+    def __get_changed_files(self):
+        if self.__changed_files is not None:
+            return self.__changed_files
+
+        scanned_files = self.__scan_files()
+        self.__get_current_file_states()
+        previous_duplicate_paths_by_document_path = self.__build_previous_duplicate_paths_by_document_path()
+
+        self.__changed_files = []
+        for relative_path, duplicate_paths in self.__duplicate_paths_by_document_path.items():
+            if self.__is_document_changed(relative_path, duplicate_paths, previous_duplicate_paths_by_document_path):
+                file_path, file_stat = scanned_files[relative_path]
+                self.__changed_files.append((relative_path, file_path, file_stat, duplicate_paths))
+
+        return self.__changed_files
+
+    def __build_previous_duplicate_paths_by_document_path(self):
+        previous_duplicate_paths_by_document_path = {}
+        for relative_path, previous_file_state in (self.previous_file_states or {}).items():
+            if "duplicateOf" in previous_file_state:
+                previous_duplicate_paths_by_document_path.setdefault(previous_file_state["duplicateOf"], []).append(relative_path)
+
+        return previous_duplicate_paths_by_document_path
+
+    def __is_document_changed(self, relative_path, duplicate_paths, previous_duplicate_paths_by_document_path):
+        if self.previous_file_states is None:
+            return self.start_from_time is None or any(
+                datetime.datetime.fromtimestamp(self.__scan_files()[path][1].st_mtime) > self.start_from_time
+                for path in [relative_path, *duplicate_paths]
+            )
+
+        previous_file_state = self.previous_file_states.get(relative_path)
+        if (
+            previous_file_state is None
+            or "duplicateOf" in previous_file_state
+            or previous_file_state.get("hash") is None
+            or previous_file_state.get("hash") != self.__current_file_states[relative_path]["hash"]
+        ):
+            return True
+
+        return sorted(previous_duplicate_paths_by_document_path.get(relative_path, [])) != duplicate_paths
+
+    def __get_current_file_states(self):
+        if self.__current_file_states is not None:
+            return self.__current_file_states
+
+        file_states = {
+            relative_path: self.__build_file_state(relative_path, file_path, file_stat)
+            for relative_path, (file_path, file_stat) in self.__scan_files().items()
+        }
+
+        paths_by_content = {}
+        for relative_path, file_state in file_states.items():
+            content_key = file_state["hash"] or f"path:{relative_path}"
+            paths_by_content.setdefault(content_key, []).append(relative_path)
+
+        self.__duplicate_paths_by_document_path = {}
+        for content_key, relative_paths in paths_by_content.items():
+            document_path = self.__choose_document_path(content_key, sorted(relative_paths))
+            duplicate_paths = sorted(path for path in relative_paths if path != document_path)
+
+            self.__duplicate_paths_by_document_path[document_path] = duplicate_paths
+            for duplicate_path in duplicate_paths:
+                file_states[duplicate_path]["duplicateOf"] = document_path
+
+        self.__current_file_states = file_states
+        return self.__current_file_states
+
+    def __choose_document_path(self, content_key, relative_paths):
+        for relative_path in relative_paths:
+            previous_file_state = (self.previous_file_states or {}).get(relative_path)
+            if previous_file_state is not None and "duplicateOf" not in previous_file_state and previous_file_state.get("hash") == content_key:
+                return relative_path
+
+        return relative_paths[0]
+
+    def __build_file_state(self, relative_path, file_path, file_stat):
+        if file_stat is None:
+            return {key: value for key, value in self.previous_file_states[relative_path].items() if key != "duplicateOf"}
+
+        file_state = {
+            "size": file_stat.st_size,
+            "mtimeNs": file_stat.st_mtime_ns,
+            "inode": file_stat.st_ino,
+        }
+
+        previous_file_state = (self.previous_file_states or {}).get(relative_path)
+        if previous_file_state is not None and previous_file_state.get("hash") and all(previous_file_state.get(key) == value for key, value in file_state.items()):
+            file_state["hash"] = previous_file_state["hash"]
+        else:
+            try:
+                file_state["hash"] = self.__calculate_file_hash(file_path)
+            except OSError as error:
+                # Unreadable file is reported when the documents are read, so it gets to the error files like other read errors
+                self.__file_hash_errors[relative_path] = error
+                file_state["hash"] = None
+
+        return file_state
+
+    def __calculate_file_hash(self, file_path):
+        with open(file_path, "rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    def __scan_files(self):
+        if self.__scanned_files is not None:
+            return self.__scanned_files
+
+        if self.changed_paths is None or self.previous_file_states is None:
+            self.__scanned_files = {}
+            self.__scan_directory(self.base_path, "", self.__scanned_files)
+        else:
+            self.__scanned_files = self.__scan_changed_paths()
+
+        return self.__scanned_files
+
+    def __scan_changed_paths(self):
+        changed_paths = set(self.changed_paths)
+
+        scanned_files = {
+            relative_path: (os.path.join(self.base_path, relative_path), None)
+            for relative_path in self.previous_file_states
+            if not self.__is_path_or_parent_in(relative_path, changed_paths)
+        }
+
+        for relative_path in changed_paths:
+            file_path = os.path.join(self.base_path, relative_path)
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+
+            if stat.S_ISDIR(file_stat.st_mode):
+                if os.path.islink(file_path):
+                    continue
+                self.__scan_directory(file_path, relative_path, scanned_files)
+            elif stat.S_ISREG(file_stat.st_mode) and self.__is_file_matched(relative_path):
+                scanned_files[relative_path] = (file_path, file_stat)
+
+        return scanned_files
+
+    def __is_path_or_parent_in(self, relative_path, paths):
+        while relative_path:
+            if relative_path in paths:
+                return True
+            relative_path = os.path.dirname(relative_path)
+
+        return False
+
+    def __scan_directory(self, base_directory_path, base_relative_directory_path, scanned_files):
+        directories_to_scan = [(base_directory_path, base_relative_directory_path)]
+        while directories_to_scan:
+            directory_path, relative_directory_path = directories_to_scan.pop()
+
+            with os.scandir(directory_path) as entries:
+                for entry in entries:
+                    relative_path = os.path.join(relative_directory_path, entry.name) if relative_directory_path else entry.name
+
+                    if entry.is_dir(follow_symlinks=False):
+                        directories_to_scan.append((entry.path, relative_path))
+                        continue
+
+                    if entry.is_file() and self.__is_file_matched(relative_path):
+                        scanned_files[relative_path] = (entry.path, entry.stat())
+
+    def __is_file_matched(self, relative_path: str):
+        return (
+            not relative_path.endswith(self.excluded_file_extensions)
+            and self.__is_file_included(relative_path)
+            and not self.__is_file_excluded(relative_path)
+        )
     
     def __is_file_included(self, file_path: str):
         return any(pattern.fullmatch(file_path) for pattern in self.compiled_include_patterns)
@@ -215,17 +544,43 @@ class FilesDocumentReader(BaseDocumentReader):
     def __is_file_excluded(self, file_path: str):
         return any(pattern.fullmatch(file_path) for pattern in self.compiled_exclude_patterns)
 
-    def __read_text_file(self, file_path: str):
-        with open(file_path, 'r') as file:
-            file_content = file.read()
-            return [
-                {
-                    "text": file_content
-                }
-            ]
-
     def __read_file_by_unstructured_lib(self, file_path: str):
-        elements = partition(filename=file_path)
+        if self.__is_streamed_file(file_path):
+            return self.__read_file_by_page_ranges(file_path)
+
+        return self.__read_by_strategies(file_path, lambda strategy: self.__read_file_by_unstructured_strategy(file_path, strategy))
+
+    def __read_by_strategies(self, file_path, read_by_strategy):
+        strategies = self.__get_strategies(file_path)
+
+        for index, strategy in enumerate(strategies):
+            start_time = time.perf_counter()
+            content = read_by_strategy(strategy)
+            number_of_characters = sum(len(part["text"]) for part in content)
+            is_last_strategy = index == len(strategies) - 1
+            is_almost_empty = number_of_characters < self.min_characters_per_page * max(len(content), 1)
+
+            self.__update_strategy_stats(strategy, time.perf_counter() - start_time, number_of_characters, is_fallback=not is_last_strategy and is_almost_empty)
+
+            if is_last_strategy or not is_almost_empty:
+                return content
+
+            logging.info(f"Strategy '{strategy}' extracted only {number_of_characters} characters from {file_path}, falling back to '{strategies[index + 1]}'")
+
+    def __update_strategy_stats(self, strategy, duration, number_of_characters, is_fallback):
+        strategy_stats = self.__parsing_stats_by_strategy.setdefault(strategy, {
+            "numberOfFiles": 0,
+            "numberOfFallbacks": 0,
+            "numberOfCharacters": 0,
+            "durationInSeconds": 0.0,
+        })
+        strategy_stats["numberOfFiles"] += 1
+        strategy_stats["numberOfFallbacks"] += 1 if is_fallback else 0
+        strategy_stats["numberOfCharacters"] += number_of_characters
+        strategy_stats["durationInSeconds"] = round(strategy_stats["durationInSeconds"] + duration, 3)
+
+    def __read_file_by_unstructured_strategy(self, file_path: str, strategy: str):
+        elements = partition(filename=file_path, strategy=strategy)
 
         if not elements:
             logging.warning(f"No text content found in file: {file_path}")
@@ -236,10 +591,71 @@ class FilesDocumentReader(BaseDocumentReader):
                 "text": "\n\n".join([element.text for element in elements if hasattr(element, 'text')]).strip(),
             }]
 
+        return self.__convert_to_page_content_parts(elements)
+
+    def __is_streamed_file(self, file_path):
+        return (self.__get_file_extension(file_path) in self.__STREAMED_CONTENT_TYPES_BY_EXTENSION
+                and os.path.getsize(file_path) >= self.streaming_threshold_in_bytes)
+
+    def __read_file_by_page_ranges(self, file_path: str):
+        extension = self.__get_file_extension(file_path)
+        content_type = self.__STREAMED_CONTENT_TYPES_BY_EXTENSION[extension]
+        page_ranges = self.__split_pdf_file(file_path) if extension == ".pdf" else self.__split_presentation_file(file_path)
+
+        has_content = False
+        for range_start, range_file in page_ranges:
+            # Strategy fallback is decided per range, so only the elements of one range are held in memory
+            content = self.__read_by_strategies(file_path, lambda strategy: self.__read_page_range(file_path, content_type, range_start, range_file, strategy))
+            has_content = has_content or bool(content)
+            yield from content
+
+        if not has_content:
+            logging.warning(f"No text content found in file: {file_path}")
+
+    def __read_page_range(self, file_path, content_type, range_start, range_file, strategy):
+        range_file.seek(0)
+        elements = partition(file=range_file, metadata_filename=file_path, content_type=content_type, strategy=strategy)
+        return self.__convert_to_page_content_parts(elements, page_number_offset=range_start)
+
+    def __split_pdf_file(self, file_path):
+        from pypdf import PdfReader, PdfWriter
+
+        pdf_reader = PdfReader(file_path)
+        number_of_pages = len(pdf_reader.pages)
+        logging.info(f"Reading large file {file_path} with {number_of_pages} pages by ranges of {self.pages_per_streaming_range} pages")
+
+        for range_start in range(0, number_of_pages, self.pages_per_streaming_range):
+            pdf_writer = PdfWriter()
+            for page in pdf_reader.pages[range_start:range_start + self.pages_per_streaming_range]:
+                pdf_writer.add_page(page)
+
+            range_file = io.BytesIO()
+            pdf_writer.write(range_file)
+            yield range_start, range_file
+
+    def __split_presentation_file(self, file_path):
+        with zipfile.ZipFile(file_path) as presentation_file:
+            presentation_xml = presentation_file.read(self.__PRESENTATION_PART_NAME).decode("utf-8")
+            slide_ids = self.__SLIDE_ID_PATTERN.findall(presentation_xml)
+            logging.info(f"Reading large file {file_path} with {len(slide_ids)} slides by ranges of {self.pages_per_streaming_range} slides")
+
+            for range_start in range(0, len(slide_ids), self.pages_per_streaming_range):
+                # Slides outside of the range are dropped from the slide list only, their parts stay in the package but are not parsed
+                range_slide_ids = set(slide_ids[range_start:range_start + self.pages_per_streaming_range])
+                range_presentation_xml = self.__SLIDE_ID_PATTERN.sub(lambda match: match.group(0) if match.group(0) in range_slide_ids else "", presentation_xml)
+
+                range_file = io.BytesIO()
+                with zipfile.ZipFile(range_file, "w") as range_presentation_file:
+                    for entry in presentation_file.infolist():
+                        entry_content = range_presentation_xml if entry.filename == self.__PRESENTATION_PART_NAME else presentation_file.read(entry)
+                        range_presentation_file.writestr(entry.filename, entry_content, compress_type=entry.compress_type)
+                yield range_start, range_file
+
+    def __convert_to_page_content_parts(self, elements, page_number_offset=0):
         return [
             {
                 "metadata": {
-                    "pageNumber": page_number
+                    "pageNumber": page_number + page_number_offset if page_number is not None else None
                 }, 
                 "text": "\n\n".join(texts).strip()
             } 
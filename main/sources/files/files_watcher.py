@@ -0,0 +1,167 @@
+import os
+import re
+import time
+import errno
+import struct
+import select
+import ctypes
+import ctypes.util
+import logging
+from typing import Optional
+
+from main.sources.files.base_files_watcher import BaseFilesWatcher
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW
+
+
+class FilesWatcher(BaseFilesWatcher):
+    __EVENT_HEADER = struct.Struct("iIII")
+    __READ_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self,
+                 base_path: str,
+                 include_patterns=[".*"],
+                 exclude_patterns=[],
+                 excluded_file_extensions=[],
+                 debounce_time_in_seconds: float = 2.0,
+                 max_batch_delay_in_seconds: float = 30.0):
+        self.base_path = base_path
+        self.compiled_include_patterns = [re.compile(pattern) for pattern in include_patterns]
+        self.compiled_exclude_patterns = [re.compile(pattern) for pattern in exclude_patterns]
+        self.excluded_file_extensions = tuple(excluded_file_extensions)
+        self.debounce_time_in_seconds = debounce_time_in_seconds
+        self.max_batch_delay_in_seconds = max_batch_delay_in_seconds
+
+        self.__libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.__file_descriptor = self.__libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.__file_descriptor < 0:
+            raise self.__build_os_error("Cannot initialize inotify")
+
+        self.__relative_paths_by_watch_descriptor = {}
+        self.__add_watches(base_path, "")
+
+    def wait_for_changes(self) -> Optional[list[str]]:
+        changed_paths = set()
+        first_event_time = None
+
+        while True:
+            if first_event_time is None:
+                timeout = None
+            else:
+                timeout = min(self.debounce_time_in_seconds, first_event_time + self.max_batch_delay_in_seconds - time.monotonic())
+                if timeout <= 0:
+                    break
+
+            ready_file_descriptors, _, _ = select.select([self.__file_descriptor], [], [], timeout)
+            if not ready_file_descriptors:
+                break
+
+            if not self.__read_events(changed_paths):
+                return None
+
+            if changed_paths and first_event_time is None:
+                first_event_time = time.monotonic()
+
+        return sorted(changed_paths)
+
+    def close(self) -> None:
+        os.close(self.__file_descriptor)
+
+    def __read_events(self, changed_paths):
+        try:
+            buffer = os.read(self.__file_descriptor, self.__READ_BUFFER_SIZE)
+        except BlockingIOError:
+            return True
+
+        offset = 0
+        while offset < len(buffer):
+            watch_descriptor, mask, _, name_length = self.__EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.__EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                logging.warning(f"Events queue of the files watcher for {self.base_path} overflowed, full rescan is needed")
+                return False
+
+            self.__handle_event(watch_descriptor, mask, name, changed_paths)
+
+        return True
+
+    def __handle_event(self, watch_descriptor, mask, name, changed_paths):
+        if mask & IN_IGNORED:
+            self.__relative_paths_by_watch_descriptor.pop(watch_descriptor, None)
+            return
+
+        relative_directory_path = self.__relative_paths_by_watch_descriptor.get(watch_descriptor)
+        if relative_directory_path is None or not name:
+            return
+
+        relative_path = os.path.join(relative_directory_path, name) if relative_directory_path else name
+
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self.__add_watches(os.path.join(self.base_path, relative_path), relative_path)
+            if mask & IN_MOVED_FROM:
+                self.__remove_watches(relative_path)
+            changed_paths.add(relative_path)
+            return
+
+        if self.__is_file_matched(relative_path):
+            changed_paths.add(relative_path)
+
+    def __add_watches(self, directory_path, relative_directory_path):
+        directories_to_watch = [(directory_path, relative_directory_path)]
+        while directories_to_watch:
+            directory_path, relative_directory_path = directories_to_watch.pop()
+
+            watch_descriptor = self.__libc.inotify_add_watch(self.__file_descriptor, os.fsencode(directory_path), WATCH_MASK)
+            if watch_descriptor < 0:
+                if ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR):
+                    continue
+                raise self.__build_os_error(f"Cannot watch directory {directory_path}")
+            self.__relative_paths_by_watch_descriptor[watch_descriptor] = relative_directory_path
+
+            try:
+                with os.scandir(directory_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            relative_path = os.path.join(relative_directory_path, entry.name) if relative_directory_path else entry.name
+                            directories_to_watch.append((entry.path, relative_path))
+            except FileNotFoundError:
+                continue
+
+    def __remove_watches(self, relative_directory_path):
+        prefix = relative_directory_path + os.sep
+        for watch_descriptor, relative_path in list(self.__relative_paths_by_watch_descriptor.items()):
+            if relative_path == relative_directory_path or relative_path.startswith(prefix):
+                self.__libc.inotify_rm_watch(self.__file_descriptor, watch_descriptor)
+                del self.__relative_paths_by_watch_descriptor[watch_descriptor]
+
+    def __is_file_matched(self, relative_path):
+        return (
+            not relative_path.endswith(self.excluded_file_extensions)
+            and any(pattern.fullmatch(relative_path) for pattern in self.compiled_include_patterns)
+            and not any(pattern.fullmatch(relative_path) for pattern in self.compiled_exclude_patterns)
+        )
+
+    def __build_os_error(self, message):
+        error_number = ctypes.get_errno()
+        return OSError(error_number, f"{message}: {os.strerror(error_number)}")
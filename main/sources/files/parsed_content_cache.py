@@ -0,0 +1,37 @@
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+from typing import Optional
+
+from main.persisters.base_persister import BasePersister
+from main.sources.files.base_parsed_content_cache import BaseParsedContentCache
+
+
+class ParsedContentCache(BaseParsedContentCache):
+    def __init__(self, persister: BasePersister):
+        self.__persister = persister
+
+    def read(self, file_hash: str, parser_details: dict) -> Optional[list[dict]]:
+        cache_file_path = self.__build_cache_file_path(file_hash, parser_details)
+        if not self.__persister.is_path_exists(cache_file_path):
+            return None
+
+        with gzip.open(self.__persister.get_absolute_path(cache_file_path), "rt", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+
+    def save(self, file_hash: str, parser_details: dict, content: list[dict]) -> None:
+        cache_file_path = self.__persister.get_absolute_path(self.__build_cache_file_path(file_hash, parser_details))
+        os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+
+        # Caches are shared between collections, so the file is moved into place only when it's fully written
+        file_descriptor, temp_file_path = tempfile.mkstemp(dir=os.path.dirname(cache_file_path), suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            with gzip.open(temp_file, "wt", encoding="utf-8") as cache_file:
+                json.dump(content, cache_file, ensure_ascii=False)
+        os.replace(temp_file_path, cache_file_path)
+
+    def __build_cache_file_path(self, file_hash, parser_details):
+        parser_key = hashlib.sha256(json.dumps(parser_details, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        return f"{file_hash[:2]}/{file_hash}_{parser_key}.json.gz"
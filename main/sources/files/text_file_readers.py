@@ -0,0 +1,153 @@
+import codecs
+
+from bs4 import BeautifulSoup
+
+TEXT_FILE_EXTENSIONS = [
+    # Plain text and documentation
+    ".txt",
+    ".text",
+    ".md",
+    ".markdown",
+    ".rst",
+    ".adoc",
+    ".log",
+    # Data and configuration
+    ".csv",
+    ".tsv",
+    ".json",
+    ".jsonl",
+    ".yaml",
+    ".yml",
+    ".toml",
+    ".ini",
+    ".cfg",
+    ".conf",
+    ".properties",
+    ".env",
+    ".sql",
+    ".graphql",
+    ".proto",
+    # Source code
+    ".py",
+    ".java",
+    ".kt",
+    ".kts",
+    ".scala",
+    ".groovy",
+    ".gradle",
+    ".js",
+    ".mjs",
+    ".cjs",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".vue",
+    ".svelte",
+    ".css",
+    ".scss",
+    ".less",
+    ".go",
+    ".rs",
+    ".c",
+    ".h",
+    ".cc",
+    ".cpp",
+    ".hpp",
+    ".cs",
+    ".swift",
+    ".m",
+    ".rb",
+    ".php",
+    ".pl",
+    ".lua",
+    ".r",
+    ".dart",
+    ".sh",
+    ".bash",
+    ".zsh",
+    ".ps1",
+    ".bat",
+    ".tf",
+]
+
+HTML_FILE_EXTENSIONS = [
+    ".html",
+    ".htm",
+    ".xhtml",
+]
+
+__BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+__HTML_BLOCK_TAGS = ["p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote", "section", "article", "header", "footer", "table", "ul", "ol", "dt", "dd"]
+
+__FALLBACK_ENCODINGS = ["utf-8", "cp1252"]
+
+__READ_BLOCK_SIZE = 1024 * 1024
+
+
+def read_text_file(file_path: str) -> list[dict]:
+    return [
+        {
+            "text": __read_text(file_path)
+        }
+    ]
+
+
+def read_html_file(file_path: str) -> list[dict]:
+    soup = BeautifulSoup(__read_text(file_path), "html.parser")
+    for element in soup(["script", "style", "noscript", "template"]):
+        element.decompose()
+    for element in soup(__HTML_BLOCK_TAGS):
+        element.insert_before("\n")
+        element.insert_after("\n")
+
+    lines = [" ".join(line.split()) for line in soup.get_text().splitlines()]
+    return [
+        {
+            "text": "\n".join([line for line in lines if line])
+        }
+    ]
+
+
+def __read_text(file_path):
+    for encoding in __detect_encodings(file_path):
+        try:
+            text = __read_text_with_encoding(file_path, encoding)
+        except UnicodeDecodeError:
+            continue
+
+        # Binary content often decodes without errors, but real text never contains NUL characters
+        if "\x00" in text:
+            raise ValueError(f"File {file_path} has binary content")
+        return text
+
+    raise ValueError(f"Cannot detect encoding of file {file_path}")
+
+
+def __detect_encodings(file_path):
+    with open(file_path, "rb") as file:
+        head = file.read(4)
+
+    for byte_order_mark, encoding in __BYTE_ORDER_MARKS:
+        if head.startswith(byte_order_mark):
+            return [encoding]
+
+    return __FALLBACK_ENCODINGS
+
+
+def __read_text_with_encoding(file_path, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    text_parts = []
+
+    with open(file_path, "rb") as file:
+        while block := file.read(__READ_BLOCK_SIZE):
+            text_parts.append(decoder.decode(block))
+        text_parts.append(decoder.decode(b"", final=True))
+
+    return "".join(text_parts).replace("\r\n", "\n")
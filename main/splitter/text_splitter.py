@@ -16,6 +16,7 @@ class TextSplitter(BaseTextSplitter):
 
     def get_details(self) -> dict:
         return {
+            "type": "characters",
             "chunkSize": self.__chunk_size,
             "chunkOverlap": self.__chunk_overlap,
         }
@@ -0,0 +1,17 @@
+from main.splitter.base_text_splitter import BaseTextSplitter
+
+
+def create_text_splitter(splitter_type="characters", chunk_size=None, chunk_overlap=None, model_name=None) -> BaseTextSplitter:
+    if splitter_type == "characters":
+        from main.splitter.text_splitter import TextSplitter
+        return TextSplitter(chunk_size=chunk_size or 1000,
+                            chunk_overlap=chunk_overlap if chunk_overlap is not None else 100)
+
+    if splitter_type == "tokens":
+        if model_name is None:
+            raise ValueError("Tokens text splitter requires an embedding model, but none of the indexers uses embeddings")
+
+        from main.splitter.token_text_splitter import TokenTextSplitter
+        return TokenTextSplitter(model_name, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    raise ValueError(f"Unknown text splitter type: {splitter_type}")
@@ -0,0 +1,77 @@
+import bisect
+import json
+
+from tokenizers import Tokenizer
+from main.splitter.base_text_splitter import BaseTextSplitter
+
+
+class TokenTextSplitter(BaseTextSplitter):
+    __BOUNDARY_SEPARATORS = ["\n\n", "\n", ". ", " "]
+
+    def __init__(self, model_name: str, chunk_size: int = None, chunk_overlap: int = None, tokenizer: Tokenizer = None):
+        self.__model_name = model_name
+        self.__tokenizer = tokenizer or Tokenizer.from_pretrained(model_name)
+        self.__tokenizer.no_truncation()
+        self.__tokenizer.no_padding()
+
+        self.__chunk_size = chunk_size or self.__calculate_max_chunk_size()
+        self.__chunk_overlap = chunk_overlap if chunk_overlap is not None else self.__chunk_size // 10
+
+        if self.__chunk_overlap >= self.__chunk_size:
+            raise ValueError(f"Chunk overlap ({self.__chunk_overlap}) must be smaller than chunk size ({self.__chunk_size})")
+
+    def split_text(self, text) -> list[str]:
+        offsets = [offset for offset in self.__tokenizer.encode(text, add_special_tokens=False).offsets if offset[1] > offset[0]]
+        token_start_positions = [offset[0] for offset in offsets]
+
+        chunks = []
+        start_token = 0
+        while start_token < len(offsets):
+            end_token = min(start_token + self.__chunk_size, len(offsets))
+            if end_token < len(offsets):
+                end_token = self.__find_boundary_token(text, offsets, token_start_positions, start_token, end_token)
+
+            chunk = text[offsets[start_token][0]:offsets[end_token - 1][1]].strip()
+            if chunk:
+                chunks.append(chunk)
+
+            if end_token >= len(offsets):
+                break
+            start_token = max(start_token + 1, end_token - self.__chunk_overlap)
+
+        return chunks
+
+    def get_details(self) -> dict:
+        return {
+            "type": "tokens",
+            "model": self.__model_name,
+            "chunkSize": self.__chunk_size,
+            "chunkOverlap": self.__chunk_overlap,
+        }
+
+    def __find_boundary_token(self, text, offsets, token_start_positions, start_token, end_token):
+        min_boundary_token = start_token + self.__chunk_size // 2
+        search_start = offsets[min_boundary_token][0]
+        search_end = offsets[end_token][0]
+
+        for separator in self.__BOUNDARY_SEPARATORS:
+            separator_position = text.rfind(separator, search_start, search_end)
+            if separator_position == -1:
+                continue
+
+            boundary_token = bisect.bisect_left(token_start_positions, separator_position + len(separator), lo=min_boundary_token, hi=end_token)
+            if boundary_token > min_boundary_token:
+                return boundary_token
+
+        return end_token
+
+    def __calculate_max_chunk_size(self):
+        from huggingface_hub import hf_hub_download
+
+        with open(hf_hub_download(self.__model_name, "sentence_bert_config.json")) as config_file:
+            max_sequence_length = json.load(config_file)["max_seq_length"]
+
+        post_processor = self.__tokenizer.post_processor
+        number_of_special_tokens = post_processor.num_special_tokens_to_add(False) if post_processor is not None else 0
+
+        return max_sequence_length - number_of_special_tokens
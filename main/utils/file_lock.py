@@ -0,0 +1,14 @@
+import os
+import fcntl
+from contextlib import contextmanager
+
+
+@contextmanager
+def lock_file(lock_file_path: str):
+    os.makedirs(os.path.dirname(lock_file_path) or ".", exist_ok=True)
+    with open(lock_file_path, "a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
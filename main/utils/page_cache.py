@@ -0,0 +1,22 @@
+import os
+
+__READ_BLOCK_SIZE = 1024 * 1024
+
+
+def read_files_into_page_cache(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+
+    file_paths = [path] if os.path.isfile(path) else [
+        os.path.join(root, file_name)
+        for root, _, file_names in os.walk(path)
+        for file_name in file_names
+    ]
+
+    number_of_read_bytes = 0
+    for file_path in file_paths:
+        with open(file_path, "rb") as file:
+            while block := file.read(__READ_BLOCK_SIZE):
+                number_of_read_bytes += len(block)
+
+    return number_of_read_bytes
@@ -0,0 +1,20 @@
+import time
+import atexit
+import logging
+import threading
+
+
+def run_periodically_and_at_exit(action, interval_in_seconds: int, name: str) -> None:
+    if interval_in_seconds > 0:
+        threading.Thread(target=__run_periodically, args=(action, interval_in_seconds), name=name, daemon=True).start()
+
+    atexit.register(action)
+
+
+def __run_periodically(action, interval_in_seconds):
+    while True:
+        time.sleep(interval_in_seconds)
+        try:
+            action()
+        except Exception:
+            logging.exception("Error running periodic action")
@@ -0,0 +1,45 @@
+import argparse
+import json
+import logging
+
+from main.utils.logger import setup_root_logger
+from main.persisters.disk_persister import DiskPersister
+from main.indexes.indexer_factory import load_indexer
+from main.indexes.search_parameters_sweep import sweep_ef_search
+
+setup_root_logger()
+
+ap = argparse.ArgumentParser()
+ap.add_argument("-collection", "--collection", required=True, help="Collection name, its chunks are used as search queries")
+ap.add_argument("-index", "--index", required=False, default=None, help="Index name (HNSW based: ChromaDb or FAISS HNSW). Required if collection has several indexes.")
+ap.add_argument("-efSearch", "--efSearch", nargs="+", required=False, type=int, default=[16, 32, 64, 128, 256, 512], help="Values of HNSW search candidates list size to measure (default: 16 32 64 128 256 512)")
+ap.add_argument("-numberOfQueries", "--numberOfQueries", required=False, default=100, type=int, help="Number of collection chunks used as queries (default: 100)")
+ap.add_argument("-numberOfResults", "--numberOfResults", required=False, default=10, type=int, help="Number of search results compared with exact search (default: 10)")
+args = vars(ap.parse_args())
+
+
+def read_queries(persister, collection_name, number_of_queries):
+    queries = []
+    for document_file_name in sorted(persister.read_folder_files(f"{collection_name}/documents")):
+        document = json.loads(persister.read_text_file(f"{collection_name}/documents/{document_file_name}"))
+        queries.append(document["chunks"][-1]["indexedData"])
+        if len(queries) >= number_of_queries:
+            break
+
+    return queries
+
+
+persister = DiskPersister(base_path="./data/collections")
+queries = read_queries(persister, args['collection'], args['numberOfQueries'])
+if not queries:
+    raise Exception(f"No chunks found in collection {args['collection']}")
+
+indexer = load_indexer(args['index'], args['collection'], persister)
+result = {
+    "index": indexer.get_name(),
+    "numberOfChunks": indexer.get_size(),
+    "numberOfQueries": len(queries),
+    "results": sweep_ef_search(indexer, queries, args['efSearch'], args['numberOfResults']),
+}
+
+logging.info(f"Search parameters sweep result:\n{json.dumps(result, indent=2)}")
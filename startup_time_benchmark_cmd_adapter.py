@@ -0,0 +1,54 @@
+import argparse
+import glob
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+
+from main.utils.logger import setup_root_logger
+
+setup_root_logger()
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "faiss", "chromadb", "unstructured", "langchain_text_splitters", "onnxruntime"]
+
+ap = argparse.ArgumentParser()
+ap.add_argument("-adapters", "--adapters", nargs="*", default=None, help="Adapter scripts to measure (default: all *_adapter.py scripts except this one)")
+ap.add_argument("-runs", "--runs", required=False, default=5, type=int, help="Number of runs per adapter, median is reported (default: 5)")
+ap.add_argument("-maxSeconds", "--maxSeconds", required=False, default=None, type=float, help="Fail if median startup time of any adapter exceeds this number of seconds")
+args = vars(ap.parse_args())
+
+
+def measure_startup_time(adapter):
+    durations = []
+    for _ in range(args['runs']):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, adapter, "--help"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        durations.append(time.perf_counter() - start_time)
+
+    return statistics.median(durations)
+
+
+def find_imported_heavy_modules(adapter):
+    result = subprocess.run([sys.executable, "-X", "importtime", adapter, "--help"], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    imported_modules = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    return [module for module in HEAVY_MODULES if module in imported_modules]
+
+
+adapters = args['adapters'] or sorted(adapter for adapter in glob.glob("*_adapter.py") if adapter != "startup_time_benchmark_cmd_adapter.py")
+
+results = []
+for adapter in adapters:
+    results.append({
+        "adapter": adapter,
+        "medianStartupTimeInSeconds": round(measure_startup_time(adapter), 3),
+        "importedHeavyModules": find_imported_heavy_modules(adapter),
+    })
+
+logging.info(f"Startup time benchmark results:\n{json.dumps(results, indent=2)}")
+
+if args['maxSeconds'] is not None:
+    slow_adapters = [result['adapter'] for result in results if result['medianStartupTimeInSeconds'] > args['maxSeconds']]
+    if slow_adapters:
+        raise Exception(f"Startup time exceeds {args['maxSeconds']}s for: {', '.join(slow_adapters)}")
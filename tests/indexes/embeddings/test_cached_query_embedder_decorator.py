@@ -0,0 +1,68 @@
+import numpy as np
+
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings.query_embedding_cache import QueryEmbeddingCache
+from main.indexes.embeddings.cached_query_embedder_decorator import CachedQueryEmbedderDecorator
+
+
+class CountingEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.embedded_texts = []
+
+    def embed(self, text) -> np.ndarray:
+        self.embedded_texts.append(text)
+        if isinstance(text, list):
+            return np.array([[float(len(item))] for item in text], dtype=np.float32)
+        return np.array([float(len(text))], dtype=np.float32)
+
+    def get_number_of_dimensions(self) -> int:
+        return 1
+
+
+class TestCachedQueryEmbedderDecorator:
+    def test_repeated_query_is_embedded_once(self):
+        embedder = CountingEmbedder()
+        decorator = CachedQueryEmbedderDecorator(embedder, QueryEmbeddingCache(), model_key="model")
+
+        first = decorator.embed("how to deploy")
+        second = decorator.embed("  how   to\tdeploy ")
+
+        assert embedder.embedded_texts == ["how to deploy"]
+        assert np.array_equal(first, second)
+
+    def test_cache_is_shared_between_embedders_of_same_model(self):
+        cache = QueryEmbeddingCache()
+        first_embedder = CountingEmbedder()
+        second_embedder = CountingEmbedder()
+
+        CachedQueryEmbedderDecorator(first_embedder, cache, model_key="model").embed("query")
+        CachedQueryEmbedderDecorator(second_embedder, cache, model_key="model").embed("query")
+        CachedQueryEmbedderDecorator(second_embedder, cache, model_key="other-model").embed("query")
+
+        assert first_embedder.embedded_texts == ["query"]
+        assert second_embedder.embedded_texts == ["query"]
+        assert cache.get_stats()["hits"] == 1
+
+    def test_batches_of_texts_are_not_cached(self):
+        embedder = CountingEmbedder()
+        decorator = CachedQueryEmbedderDecorator(embedder, QueryEmbeddingCache(), model_key="model")
+
+        decorator.embed(["a", "b"])
+        decorator.embed(["a", "b"])
+
+        assert len(embedder.embedded_texts) == 2
+
+    def test_least_recently_used_query_is_evicted(self):
+        cache = QueryEmbeddingCache(max_size=2)
+        embedder = CountingEmbedder()
+        decorator = CachedQueryEmbedderDecorator(embedder, cache, model_key="model")
+
+        decorator.embed("a")
+        decorator.embed("b")
+        decorator.embed("a")
+        decorator.embed("c")
+        decorator.embed("a")
+        decorator.embed("b")
+
+        assert embedder.embedded_texts == ["a", "b", "c", "b"]
+        assert cache.get_stats() == {"size": 2, "maxSize": 2, "hits": 2, "misses": 4, "hitRate": 0.3333}
@@ -0,0 +1,24 @@
+import numpy as np
+
+from main.indexes.embeddings.embedding_parity import compare_embeddings
+
+
+class TestCompareEmbeddings:
+    def test_identical_embeddings_have_full_parity(self):
+        embeddings = np.random.default_rng(0).random((50, 16), dtype=np.float32)
+
+        result = compare_embeddings(embeddings, embeddings * 2, number_of_neighbours=5)
+
+        assert result["numberOfTexts"] == 50
+        assert result["minCosineSimilarity"] > 0.9999
+        assert result["meanNeighboursOverlap"] == 1.0
+
+    def test_unrelated_embeddings_have_low_parity(self):
+        rng = np.random.default_rng(0)
+        reference_embeddings = rng.normal(size=(200, 32))
+        candidate_embeddings = rng.normal(size=(200, 32))
+
+        result = compare_embeddings(reference_embeddings, candidate_embeddings, number_of_neighbours=10)
+
+        assert abs(result["meanCosineSimilarity"]) < 0.1
+        assert result["meanNeighboursOverlap"] < 0.2
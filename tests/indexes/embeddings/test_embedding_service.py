@@ -0,0 +1,92 @@
+import os
+import time
+import threading
+
+import numpy as np
+import pytest
+
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.embeddings.embedding_service_server import EmbeddingServiceServer
+from main.indexes.embeddings.embedding_service_client_embedder import EmbeddingServiceClientEmbedder
+
+
+class LengthEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, text) -> np.ndarray:
+        texts = [text] if isinstance(text, str) else list(text)
+        self.batches.append(texts)
+        embeddings = np.array([[float(len(item)), 1.0] for item in texts], dtype=np.float32)
+        return embeddings[0] if isinstance(text, str) else embeddings
+
+    def get_number_of_dimensions(self) -> int:
+        return 2
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "embedding_service.sock")
+
+
+@pytest.fixture
+def service(socket_path):
+    embedder = LengthEmbedder()
+    server = EmbeddingServiceServer(socket_path, embedder_factory=lambda model: embedder, max_batch_delay_in_seconds=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    yield embedder
+    server.close()
+
+
+def never_called_factory():
+    raise AssertionError("Fallback embedder should not be created")
+
+
+class TestEmbeddingService:
+    def test_client_embeds_through_service(self, socket_path, service):
+        client = EmbeddingServiceClientEmbedder(socket_path, "model", fallback_embedder_factory=never_called_factory)
+
+        assert client.embed("abc").tolist() == [3.0, 1.0]
+        assert client.embed(["a", "abcd"]).tolist() == [[1.0, 1.0], [4.0, 1.0]]
+        assert client.get_number_of_dimensions() == 2
+
+    def test_concurrent_requests_are_batched(self, socket_path, service):
+        clients = [EmbeddingServiceClientEmbedder(socket_path, "model", fallback_embedder_factory=never_called_factory) for _ in range(8)]
+        results = {}
+        barrier = threading.Barrier(len(clients))
+
+        def embed(number, client):
+            barrier.wait()
+            results[number] = client.embed("x" * number)
+
+        threads = [threading.Thread(target=embed, args=(number, client)) for number, client in enumerate(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert {number: embedding[0] for number, embedding in results.items()} == {number: float(number) for number in range(8)}
+        assert len(service.batches) < len(clients)
+
+    def test_client_falls_back_to_in_process_embedder(self, socket_path):
+        fallback_embedder = LengthEmbedder()
+        client = EmbeddingServiceClientEmbedder(socket_path, "model", fallback_embedder_factory=lambda: fallback_embedder)
+
+        assert client.embed("abc").tolist() == [3.0, 1.0]
+        assert client.get_number_of_dimensions() == 2
+        assert fallback_embedder.batches == [["abc"]]
+
+    def test_large_batches_are_embedded_in_process(self, socket_path, service):
+        fallback_embedder = LengthEmbedder()
+        client = EmbeddingServiceClientEmbedder(socket_path, "model", fallback_embedder_factory=lambda: fallback_embedder, max_texts_per_request=2)
+
+        assert client.embed(["a", "ab"]).tolist() == [[1.0, 1.0], [2.0, 1.0]]
+        assert client.embed(["a", "ab", "abc"]).tolist() == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert service.batches == [["a", "ab"]]
+        assert fallback_embedder.batches == [["a", "ab", "abc"]]
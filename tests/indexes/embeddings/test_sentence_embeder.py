@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+from main.indexes.embeddings.sentence_embeder import SentenceEmbedder
+
+
+class StubTokenizer:
+    def __call__(self, texts, truncation, max_length, return_attention_mask, return_token_type_ids):
+        return {"input_ids": [list(range(min(len(text.split()), max_length))) for text in texts]}
+
+
+class StubModel:
+    max_seq_length = 512
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=32):
+        if isinstance(texts, str):
+            return self.__embed(texts)
+
+        self.batch_sizes.append(batch_size)
+        return np.array([self.__embed(text) for text in texts], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def __embed(self, text):
+        return np.array([len(text.split()), len(text), sum(map(ord, text)) % 997], dtype=np.float32)
+
+
+class TestSentenceEmbedder:
+    def test_embeddings_keep_order_of_texts_batched_by_length(self):
+        texts = [" ".join(["word"] * ((index * 7) % 23 + 1)) + f" {index}" for index in range(50)]
+        model = StubModel()
+        embedder = SentenceEmbedder(model_name="stub", max_tokens_per_batch=64, max_batch_size=8, model=model)
+
+        embeddings = embedder.embed(texts)
+
+        assert len(model.batch_sizes) > 1
+        for index, text in enumerate(texts):
+            assert np.array_equal(embeddings[index], embedder.embed(text))
@@ -0,0 +1,27 @@
+from main.indexes.embeddings.token_budget_batching import build_token_budget_batches
+
+
+class TestBuildTokenBudgetBatches:
+    def test_groups_texts_of_similar_length(self):
+        token_lengths = [10, 200, 12, 190, 11]
+
+        batches = build_token_budget_batches(token_lengths, max_tokens_per_batch=400, max_batch_size=10)
+
+        assert batches == [[1, 3], [2, 4, 0]]
+
+    def test_respects_max_batch_size(self):
+        batches = build_token_budget_batches([1] * 5, max_tokens_per_batch=1000, max_batch_size=2)
+
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    def test_text_longer_than_budget_gets_own_batch(self):
+        batches = build_token_budget_batches([500, 500], max_tokens_per_batch=100, max_batch_size=10)
+
+        assert batches == [[0], [1]]
+
+    def test_every_text_is_in_exactly_one_batch(self):
+        token_lengths = [(index * 37) % 256 for index in range(1000)]
+
+        batches = build_token_budget_batches(token_lengths, max_tokens_per_batch=4096, max_batch_size=64)
+
+        assert sorted(index for batch in batches for index in batch) == list(range(1000))
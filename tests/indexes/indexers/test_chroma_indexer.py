@@ -92,6 +92,19 @@ class TestChromaIndexerNewStorage:
         distances, ids = indexer.search("hello")
         assert ids.shape == (1, 0)
 
+    def test_warm_up(self, storage_dir):
+        ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir).warm_up()
+
+        indexer = ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir)
+        indexer.index_texts(
+            np.array([0, 1]),
+            ["hello world", "foo bar"],
+            items_metadata=[{"k": "1"}, {"k": "2"}],
+        )
+
+        ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir).warm_up()
+        assert indexer.get_size() == 2
+
     def test_serialize_still_produces_archive(self, storage_dir):
         indexer = ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir)
         indexer.index_texts(
@@ -104,6 +117,59 @@ class TestChromaIndexerNewStorage:
         assert data.startswith(b"CHROMA_ARCHIVE_V1\0")
 
 
+class RecordingEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.batch_sizes = []
+
+    def embed(self, text) -> np.ndarray:
+        if isinstance(text, str):
+            return np.array([float(text.split()[-1]), 0.0], dtype=np.float32)
+        self.batch_sizes.append(len(text))
+        return np.array([[float(item.split()[-1]), 0.0] for item in text], dtype=np.float32)
+
+    def get_number_of_dimensions(self) -> int:
+        return 2
+
+
+class TestChromaIndexerPipelinedAdd:
+    def test_texts_are_embedded_and_added_by_sub_batches(self, storage_dir):
+        embedder = RecordingEmbedder()
+        indexer = ChromaIndexer("test_indexer", embedder, storage_dir)
+        texts = [f"text {number}" for number in range(10001)]
+
+        indexer.index_texts(np.arange(len(texts)), texts, items_metadata=[{"k": "v"}] * len(texts))
+
+        assert embedder.batch_sizes == [5000, 5000, 1]
+        assert indexer.get_size() == 10001
+        assert indexer.search("text 10000", number_of_results=1)[1][0].tolist() == [10000]
+
+
+class TestChromaIndexerHnswParameters:
+    def test_hnsw_parameters_are_applied_to_new_collection(self, storage_dir):
+        indexer = ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir, index_parameters={"M": 8, "efConstruction": 50, "efSearch": 20})
+        indexer.index_texts(np.array([0]), ["a"], items_metadata=[{"k": "v"}])
+
+        import chromadb
+        from chromadb.config import Settings
+        client = chromadb.PersistentClient(path=storage_dir, settings=Settings(anonymized_telemetry=False))
+        hnsw_configuration = client.get_collection("documents").configuration["hnsw"]
+
+        assert (hnsw_configuration["max_neighbors"], hnsw_configuration["ef_construction"], hnsw_configuration["ef_search"]) == (8, 50, 20)
+
+    def test_unknown_parameter_is_rejected(self, storage_dir):
+        with pytest.raises(ValueError):
+            ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir, index_parameters={"nprobe": 8})
+
+    def test_search_with_ef_search_returns_requested_number_of_results(self, storage_dir):
+        indexer = ChromaIndexer("test_indexer", FakeEmbedder(), storage_dir)
+        indexer.index_texts(np.arange(50), [f"text {number}" for number in range(50)], items_metadata=[{"k": "v"}] * 50)
+
+        distances, ids = indexer.search("text", number_of_results=3, search_params={"efSearch": 40})
+
+        assert ids.shape == (1, 3)
+        assert distances[0].tolist() == sorted(distances[0].tolist())
+
+
 class TestChromaIndexerLegacyMigration:
     def test_migrate_archive_format(self, storage_dir):
         temp_dir = tempfile.mkdtemp()
@@ -0,0 +1,261 @@
+import os
+import zlib
+
+import numpy as np
+import pytest
+
+from main.indexes.indexers.faiss_indexer import FaissIndexer
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+
+
+class ClusteredEmbedder(BaseEmbedder):
+    """Texts like "far:12" are embedded around a distant center, others around the origin."""
+
+    def __init__(self, dimensions=16):
+        self.__dimensions = dimensions
+
+    def embed(self, text) -> np.ndarray:
+        if isinstance(text, str):
+            return self.__embed_text(text)
+        return np.array([self.__embed_text(item) for item in text], dtype=np.float32)
+
+    def get_number_of_dimensions(self) -> int:
+        return self.__dimensions
+
+    def __embed_text(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        center = 100.0 if text.startswith("far:") else 0.0
+        return (center + rng.random(self.__dimensions)).astype(np.float32)
+
+
+def build_texts(prefix, number_of_texts):
+    return [f"{prefix}{number}" for number in range(number_of_texts)]
+
+
+def index_texts(indexer, first_id, texts):
+    indexer.index_texts(np.arange(first_id, first_id + len(texts)), texts)
+
+
+@pytest.mark.parametrize("index_type, index_parameters", [
+    ("IndexFlatL2", {}),
+    ("HNSW", {"M": 16, "efConstruction": 40}),
+    ("IVFFlat", {"nlist": 8}),
+    ("IVFPQ", {"nlist": 4, "m": 4, "nbits": 4}),
+])
+class TestFaissIndexerTypes:
+    def test_finds_indexed_text(self, index_type, index_parameters):
+        indexer = FaissIndexer("test", ClusteredEmbedder(), index_type=index_type, index_parameters=index_parameters)
+        texts = build_texts("near:", 500)
+        index_texts(indexer, 0, texts)
+
+        _, ids = indexer.search(texts[42], number_of_results=5, search_params={"efSearch": 64, "nprobe": 8})
+
+        assert indexer.get_size() == 500
+        assert 42 in ids[0].tolist()
+
+    def test_removes_ids_and_survives_serialization(self, index_type, index_parameters):
+        indexer = FaissIndexer("test", ClusteredEmbedder(), index_type=index_type, index_parameters=index_parameters)
+        texts = build_texts("near:", 500)
+        index_texts(indexer, 0, texts)
+
+        indexer.remove_ids(np.array([42, 43]))
+        loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), indexer.serialize(), index_type=index_type, index_parameters=index_parameters)
+        _, ids = loaded_indexer.search(texts[42], number_of_results=5)
+
+        assert loaded_indexer.get_size() == 498
+        assert 42 not in ids[0].tolist()
+
+
+class TestFaissIndexer:
+    def test_empty_index_search(self):
+        indexer = FaissIndexer("test", ClusteredEmbedder(), index_type="IVFFlat")
+
+        _, ids = indexer.search("near:1")
+
+        assert ids.shape == (1, 0)
+
+    def test_unknown_parameter_is_rejected(self):
+        with pytest.raises(ValueError):
+            FaissIndexer("test", ClusteredEmbedder(), index_type="HNSW", index_parameters={"nlist": 8})
+
+    def test_ivf_index_is_retrained_when_new_vectors_drift(self):
+        indexer = FaissIndexer("test", ClusteredEmbedder(), index_type="IVFFlat", index_parameters={"nlist": 8}, min_vectors_for_drift_check=100)
+        index_texts(indexer, 0, build_texts("near:", 500))
+        centroids_before = indexer.faiss_index.quantizer.reconstruct_n(0, indexer.faiss_index.nlist)
+
+        index_texts(indexer, 500, build_texts("far:", 500))
+        centroids_after = indexer.faiss_index.quantizer.reconstruct_n(0, indexer.faiss_index.nlist)
+
+        assert indexer.get_size() == 1000
+        assert centroids_after.max() > 50 > centroids_before.max()
+        _, ids = indexer.search("far:7", number_of_results=1)
+        assert ids[0].tolist() == [507]
+
+
+class TestFaissIndexerStorage:
+    def test_index_is_stored_in_native_file_and_memory_mapped(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        texts = build_texts("near:", 300)
+        indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        index_texts(indexer, 0, texts)
+        indexer.flush()
+
+        loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        _, ids = loaded_indexer.search(texts[7], number_of_results=1)
+
+        assert loaded_indexer.is_persistent_storage() is True
+        assert os.path.isfile(os.path.join(storage_path, "segments.json"))
+        assert ids[0].tolist() == [7]
+
+    def test_memory_mapped_index_can_be_updated(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        texts = build_texts("near:", 300)
+        indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path)
+        index_texts(indexer, 0, texts)
+        indexer.flush()
+
+        memory_mapped_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path)
+        memory_mapped_indexer.remove_ids(np.array([7]))
+        index_texts(memory_mapped_indexer, 300, ["near:new"])
+        memory_mapped_indexer.flush()
+
+        loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path)
+        assert loaded_indexer.get_size() == 300
+        assert loaded_indexer.search("near:new", number_of_results=1)[1][0].tolist() == [300]
+
+    def test_loading_storage_without_manifest_fails(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        os.makedirs(storage_path)
+
+        with pytest.raises(FileNotFoundError):
+            FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, load_existing_storage=True)
+
+    def test_empty_index_is_stored_and_loaded(self, tmp_path):
+        for index_type in ["IndexFlatL2", "IVFFlat"]:
+            storage_path = str(tmp_path / index_type)
+            FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type=index_type).flush()
+
+            loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type=index_type, load_existing_storage=True)
+            index_texts(loaded_indexer, 0, build_texts("text", 50))
+            loaded_indexer.flush()
+
+            assert FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type=index_type, load_existing_storage=True).get_size() == 50
+            assert loaded_indexer.support_metadata() is True
+
+    def test_serialized_index_is_migrated_to_native_file(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = FaissIndexer("test", ClusteredEmbedder())
+        index_texts(indexer, 0, build_texts("near:", 10))
+
+        FaissIndexer("test", ClusteredEmbedder(), indexer.serialize(), storage_path=storage_path)
+
+        assert FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path).get_size() == 10
+
+    def test_update_is_stored_as_delta_segment_with_tombstones(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        index_texts(indexer, 0, build_texts("near:", 300))
+        indexer.flush()
+        base_files = set(os.listdir(storage_path))
+
+        updated_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        updated_indexer.remove_ids(np.array([7]))
+        index_texts(updated_indexer, 300, ["near:7"])
+        updated_indexer.flush()
+
+        loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        _, ids = loaded_indexer.search("near:7", number_of_results=2)
+
+        assert base_files - {"segments.json"} <= set(os.listdir(storage_path))
+        assert len(os.listdir(storage_path)) == len(base_files) + 3
+        assert loaded_indexer.get_size() == 300
+        assert ids[0].tolist()[0] == 300
+        assert 7 not in ids[0].tolist()
+
+    def test_compaction_merges_deltas_into_base(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="IVFFlat", index_parameters={"nlist": 4})
+        index_texts(indexer, 0, build_texts("near:", 300))
+        indexer.flush()
+
+        updated_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="IVFFlat", index_parameters={"nlist": 4})
+        updated_indexer.remove_ids(np.array([1, 2]))
+        index_texts(updated_indexer, 300, ["near:new"])
+        updated_indexer.flush()
+        updated_indexer.compact()
+
+        loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="IVFFlat", index_parameters={"nlist": 4})
+
+        assert sorted(os.listdir(storage_path)) == ["metadata.npz", "segment_000004.faiss", "segments.json"]
+        assert loaded_indexer.get_size() == 299
+        assert loaded_indexer.search("near:new", number_of_results=1, search_params={"nprobe": 4})[1][0].tolist() == [300]
+
+    def test_big_update_is_compacted_on_flush(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path)
+        index_texts(indexer, 0, build_texts("near:", 100))
+        indexer.flush()
+
+        updated_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path)
+        index_texts(updated_indexer, 100, build_texts("other:", 20))
+        updated_indexer.flush()
+
+        assert sorted(os.listdir(storage_path)) == ["metadata.npz", "segment_000002.faiss", "segments.json"]
+        assert FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path).get_size() == 120
+
+
+def build_metadata(number_of_texts):
+    return [{"space": "small" if number % 50 == 0 else "big", "lastModifiedAt": f"2026-01-{number % 28 + 1:02d}T00:00:00Z"}
+            for number in range(number_of_texts)]
+
+
+@pytest.mark.parametrize("index_type, index_parameters", [
+    ("IndexFlatL2", {}),
+    ("HNSW", {"M": 16, "efConstruction": 40}),
+    ("IVFFlat", {"nlist": 8, "nprobe": 1}),
+])
+class TestFaissIndexerFilter:
+    def test_selective_filter_is_searched_exactly(self, index_type, index_parameters):
+        indexer = FaissIndexer("test", ClusteredEmbedder(), index_type=index_type, index_parameters=index_parameters)
+        texts = build_texts("near:", 500)
+        indexer.index_texts(np.arange(500), texts, items_metadata=build_metadata(500))
+
+        _, ids = indexer.search(texts[42], number_of_results=20, filter='space = "small"')
+
+        assert indexer.support_metadata() is True
+        assert sorted(ids[0].tolist()) == list(range(0, 500, 50))
+
+    def test_broad_filter_excludes_not_matching_ids(self, index_type, index_parameters):
+        indexer = FaissIndexer("test", ClusteredEmbedder(), index_type=index_type, index_parameters=index_parameters)
+        texts = build_texts("near:", 500)
+        indexer.index_texts(np.arange(500), texts, items_metadata=build_metadata(500))
+
+        _, ids = indexer.search(texts[100], number_of_results=10, filter='space = "big" and lastModifiedAt >= "2026-01-02"', search_params={"efSearch": 64, "nprobe": 8})
+
+        assert len(ids[0]) == 10
+        assert all(number % 50 != 0 and number % 28 != 0 for number in ids[0].tolist())
+
+
+class TestFaissIndexerStoredFilter:
+    def test_filter_covers_delta_segments_and_tombstones(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        indexer.index_texts(np.arange(300), build_texts("near:", 300), items_metadata=build_metadata(300))
+        indexer.flush()
+
+        updated_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        updated_indexer.remove_ids(np.array([50]))
+        updated_indexer.index_texts(np.array([300]), ["near:new"], items_metadata=[{"space": "small"}])
+        updated_indexer.flush()
+
+        loaded_indexer = FaissIndexer("test", ClusteredEmbedder(), storage_path=storage_path, index_type="HNSW")
+        _, ids = loaded_indexer.search("near:new", number_of_results=10, filter='space = "small"')
+
+        assert ids[0].tolist()[0] == 300
+        assert sorted(ids[0].tolist()) == [0, 100, 150, 200, 250, 300]
+
+    def test_filter_is_not_supported_for_index_without_metadata(self, tmp_path):
+        indexer = FaissIndexer("test", ClusteredEmbedder())
+        index_texts(indexer, 0, build_texts("near:", 10))
+
+        assert FaissIndexer("test", ClusteredEmbedder(), indexer.serialize(), storage_path=str(tmp_path / "storage")).support_metadata() is False
@@ -0,0 +1,97 @@
+import os
+import zlib
+
+import numpy as np
+
+from main.indexes.indexers.numpy_flat_indexer import NumpyFlatIndexer
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+
+
+class RandomEmbedder(BaseEmbedder):
+    def embed(self, text) -> np.ndarray:
+        if isinstance(text, str):
+            return self.__embed_text(text)
+        return np.array([self.__embed_text(item) for item in text], dtype=np.float32)
+
+    def get_number_of_dimensions(self) -> int:
+        return 8
+
+    def __embed_text(self, text):
+        return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).random(8).astype(np.float32)
+
+
+def create_indexer(storage_path):
+    return NumpyFlatIndexer("test", RandomEmbedder(), str(storage_path))
+
+
+def build_texts(number_of_texts):
+    return [f"text {number}" for number in range(number_of_texts)]
+
+
+class TestNumpyFlatIndexer:
+    def test_finds_nearest_vectors_in_l2_order(self, tmp_path):
+        indexer = create_indexer(tmp_path)
+        texts = build_texts(100)
+        indexer.index_texts(np.arange(100), texts)
+
+        distances, ids = indexer.search(texts[42], number_of_results=5)
+
+        vectors = RandomEmbedder().embed(texts).astype(np.float16).astype(np.float32)
+        expected_distances = ((vectors - RandomEmbedder().embed(texts[42])) ** 2).sum(axis=1)
+        assert ids[0].tolist() == np.argsort(expected_distances)[:5].tolist()
+        assert np.allclose(distances[0], np.sort(expected_distances)[:5], atol=1e-3)
+
+    def test_vectors_are_stored_as_float16_memmap(self, tmp_path):
+        indexer = create_indexer(tmp_path)
+        indexer.index_texts(np.arange(10), build_texts(10))
+        indexer.flush()
+
+        vectors_file_name = next(file_name for file_name in os.listdir(tmp_path) if file_name.startswith("vectors_"))
+        vectors = np.load(tmp_path / vectors_file_name, mmap_mode="r")
+        assert vectors.dtype == np.float16
+        assert vectors.shape == (10, 8)
+        assert create_indexer(tmp_path).search("text 3", number_of_results=1)[1][0].tolist() == [3]
+
+    def test_removed_ids_are_stored_as_tombstones(self, tmp_path):
+        indexer = create_indexer(tmp_path)
+        indexer.index_texts(np.arange(100), build_texts(100))
+        indexer.flush()
+
+        updated_indexer = create_indexer(tmp_path)
+        updated_indexer.remove_ids(np.array([3]))
+        updated_indexer.flush()
+
+        loaded_indexer = create_indexer(tmp_path)
+        assert any(file_name.startswith("tombstones_") for file_name in os.listdir(tmp_path))
+        assert loaded_indexer.get_size() == 99
+        assert 3 not in loaded_indexer.search("text 3", number_of_results=10)[1][0].tolist()
+
+    def test_update_compacts_removed_vectors(self, tmp_path):
+        indexer = create_indexer(tmp_path)
+        indexer.index_texts(np.arange(100), build_texts(100))
+        indexer.flush()
+
+        updated_indexer = create_indexer(tmp_path)
+        updated_indexer.remove_ids(np.array([3]))
+        updated_indexer.index_texts(np.array([100]), ["text 3"])
+        updated_indexer.flush()
+
+        loaded_indexer = create_indexer(tmp_path)
+        assert sorted(os.listdir(tmp_path)) == ["ids_000005.npy", "metadata.npz", "metadata_delta_000001.npz", "squared_norms_000006.npy", "vectors.json", "vectors_000004.npy"]
+        assert loaded_indexer.get_size() == 100
+        assert loaded_indexer.search("text 3", number_of_results=1)[1][0].tolist() == [100]
+
+    def test_filter_limits_search_to_matching_ids(self, tmp_path):
+        indexer = create_indexer(tmp_path)
+        indexer.index_texts(np.arange(100), build_texts(100), items_metadata=[{"project": "A" if number % 10 == 0 else "B"} for number in range(100)])
+        indexer.remove_ids(np.array([20]))
+        indexer.flush()
+
+        _, ids = create_indexer(tmp_path).search("text 5", number_of_results=20, filter='project = "A"')
+
+        assert sorted(ids[0].tolist()) == [0, 10, 30, 40, 50, 60, 70, 80, 90]
+
+    def test_empty_index_search(self, tmp_path):
+        _, ids = create_indexer(tmp_path).search("text")
+
+        assert ids.shape == (1, 0)
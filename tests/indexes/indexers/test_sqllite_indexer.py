@@ -0,0 +1,147 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pytest
+
+from main.indexes.indexers.sqllite_indexer import SqlliteIndexer
+
+
+def index_batches(indexer, number_of_batches, first_id=0, batch_size=50):
+    for batch_number in range(number_of_batches):
+        ids = np.arange(first_id + batch_number * batch_size, first_id + (batch_number + 1) * batch_size)
+        indexer.index_texts(ids, [f"chunk number{id_val} about topic{id_val % 7}" for id_val in ids], items_metadata=[{"k": str(id_val % 2)} for id_val in ids])
+
+
+def count_segments(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        return conn.execute("SELECT COUNT(DISTINCT segid) FROM documents_idx").fetchone()[0]
+
+
+class TestSqlliteIndexerBulkLoad:
+    def test_bulk_load_is_optimized_on_flush(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = SqlliteIndexer("bm25", storage_path, bulk_load=True)
+        index_batches(indexer, 10)
+        db_path = os.path.join(storage_path, "bm25.db")
+        assert count_segments(db_path) > 1
+
+        indexer.flush()
+
+        assert count_segments(db_path) == 1
+        assert not os.path.exists(f"{db_path}-wal")
+        assert indexer.search("number42", number_of_results=1)[1][0].tolist() == [42]
+        assert indexer.search("topic3", number_of_results=5, filter='k = "1"')[1].shape == (1, 5)
+
+    def test_updates_are_merged_on_flush(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = SqlliteIndexer("bm25", storage_path, bulk_load=True)
+        index_batches(indexer, 2)
+        indexer.flush()
+
+        updated_indexer = SqlliteIndexer("bm25", storage_path)
+        index_batches(updated_indexer, 10, first_id=100)
+        updated_indexer.remove_ids(np.array([42]))
+        updated_indexer.flush()
+
+        assert count_segments(os.path.join(storage_path, "bm25.db")) <= 2
+        assert updated_indexer.get_size() == 599
+        assert updated_indexer.search("number42")[1].shape == (1, 0)
+
+
+def list_tables(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+def create_index_with_stored_text(tmp_path):
+    storage_path = str(tmp_path / "storage")
+    os.makedirs(storage_path)
+    db_path = os.path.join(storage_path, "bm25.db")
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.execute("CREATE VIRTUAL TABLE documents USING fts5(doc_id UNINDEXED, content)")
+        conn.execute("CREATE TABLE metadata (doc_id TEXT PRIMARY KEY, data JSON)")
+        conn.executemany("INSERT INTO documents(doc_id, content) VALUES (?, ?)", [("5", "first chunk"), ("7", "second chunk")])
+        conn.executemany("INSERT INTO metadata(doc_id, data) VALUES (?, ?)", [("5", '{"k": "a"}'), ("7", '{"k": "b"}')])
+        conn.commit()
+
+    return db_path
+
+
+CONTENTLESS_DELETE_SUPPORTED = sqlite3.sqlite_version_info >= (3, 43, 0)
+
+
+class TestSqlliteIndexerContentlessTable:
+    @pytest.mark.skipif(not CONTENTLESS_DELETE_SUPPORTED, reason="contentless_delete requires SQLite 3.43+")
+    def test_chunks_text_is_not_stored(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = SqlliteIndexer("bm25", storage_path)
+        index_batches(indexer, 2)
+        indexer.remove_ids(np.array([42]))
+
+        assert "documents_content" not in list_tables(os.path.join(storage_path, "bm25.db"))
+        assert indexer.get_size() == 99
+        assert indexer.search("number43", number_of_results=1)[1][0].tolist() == [43]
+        assert indexer.search("number42")[1].shape == (1, 0)
+        assert sorted(indexer.search("topic3", number_of_results=50, filter='k = "1"')[1][0].tolist()) == [id_val for id_val in range(100) if id_val % 7 == 3 and id_val % 2 == 1]
+
+    @pytest.mark.skipif(not CONTENTLESS_DELETE_SUPPORTED, reason="contentless_delete requires SQLite 3.43+")
+    def test_index_with_stored_text_is_migrated_on_write(self, tmp_path):
+        db_path = create_index_with_stored_text(tmp_path)
+        indexer = SqlliteIndexer("bm25", os.path.dirname(db_path))
+
+        assert indexer.search("chunk", filter='k = "b"')[1][0].tolist() == [7]
+        assert "documents_content" in list_tables(db_path)
+
+        indexer.remove_ids(np.array([5]))
+
+        assert "documents_content" not in list_tables(db_path)
+        assert indexer.get_size() == 1
+
+    def test_migration_runs_once_and_is_seen_by_open_searchers(self, tmp_path, monkeypatch):
+        db_path = create_index_with_stored_text(tmp_path)
+        storage_path = os.path.dirname(db_path)
+        searcher = SqlliteIndexer("bm25", storage_path)
+        assert searcher.search("chunk", filter='k = "b"')[1][0].tolist() == [7]
+
+        # Contentless tables without contentless_delete exist in all FTS5 versions and support inserts and search
+        monkeypatch.setattr(SqlliteIndexer, "_SqlliteIndexer__CONTENTLESS_DELETE_MIN_SQLITE_VERSION", (0, 0, 0))
+        monkeypatch.setattr(SqlliteIndexer, "_SqlliteIndexer__build_create_documents_table_sql", lambda self, table_name: f"CREATE VIRTUAL TABLE {table_name} USING fts5(content, content='')")
+
+        assert searcher.search("second")[1][0].tolist() == [7]
+        assert "documents_content" in list_tables(db_path)
+
+        first_writer = SqlliteIndexer("bm25", storage_path)
+        second_writer = SqlliteIndexer("bm25", storage_path)
+        assert second_writer.search("chunk")[1].shape == (1, 2)
+
+        first_writer.index_texts(np.array([9]), ["third chunk"], items_metadata=[{"k": "b"}])
+        # Writer which has seen the table before the migration re-checks it under the write lock
+        second_writer._SqlliteIndexer__migrate_to_contentless_table()
+        second_writer.index_texts(np.array([11]), ["fourth chunk"], items_metadata=[{"k": "b"}])
+
+        assert "documents_content" not in list_tables(db_path)
+        assert second_writer.get_size() == 4
+        assert sorted(searcher.search("chunk", filter='k = "b"')[1][0].tolist()) == [7, 9, 11]
+
+    def test_text_is_stored_for_old_sqlite_version(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqlliteIndexer, "_SqlliteIndexer__CONTENTLESS_DELETE_MIN_SQLITE_VERSION", (99, 0, 0))
+        db_path = create_index_with_stored_text(tmp_path)
+        indexer = SqlliteIndexer("bm25", os.path.dirname(db_path))
+
+        indexer.remove_ids(np.array([5]))
+        indexer.index_texts(np.array([9]), ["third chunk"])
+
+        assert "documents_content" in list_tables(db_path)
+        assert sorted(indexer.search("chunk")[1][0].tolist()) == [7, 9]
+
+    @pytest.mark.skipif(CONTENTLESS_DELETE_SUPPORTED, reason="SQLite supports contentless_delete")
+    def test_text_is_stored_when_contentless_delete_is_not_supported(self, tmp_path):
+        storage_path = str(tmp_path / "storage")
+        indexer = SqlliteIndexer("bm25", storage_path)
+        index_batches(indexer, 1)
+        indexer.remove_ids(np.array([3]))
+
+        assert "documents_content" in list_tables(os.path.join(storage_path, "bm25.db"))
+        assert indexer.get_size() == 49
@@ -0,0 +1,162 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from main.indexes import indexer_factory
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.persisters.disk_persister import DiskPersister
+from main.core.documents_collection_creator import DocumentCollectionCreator
+from main.sources.base_document_reader import BaseDocumentReader
+from main.sources.base_document_converter import BaseDocumentConverter
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "faiss", "chromadb", "unstructured", "langchain_text_splitters"]
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def find_loaded_heavy_modules(*module_names):
+    code = "; ".join([
+        "import sys, json",
+        *[f"import {module_name}" for module_name in module_names],
+        f"print(json.dumps([module for module in {HEAVY_MODULES!r} if module in sys.modules]))",
+    ])
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_PATH, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+class TinyReader(BaseDocumentReader):
+    TEXTS = ["quick brown fox", "lazy dog sleeps", "fox jumps over the dog"]
+
+    def read_all_documents(self):
+        for index, text in enumerate(self.TEXTS):
+            yield {"id": f"doc{index}", "text": text}
+
+    def get_number_of_documents(self) -> int:
+        return len(self.TEXTS)
+
+    def get_reader_details(self) -> dict:
+        return {"type": "tiny"}
+
+
+class TinyConverter(BaseDocumentConverter):
+    def convert(self, document) -> list[dict]:
+        return [{
+            "id": document["id"],
+            "url": f"https://example.com/{document['id']}",
+            "modifiedTime": datetime.now(timezone.utc).isoformat(),
+            "text": document["text"],
+            "chunks": [{"indexedData": document["text"]}],
+        }]
+
+    def get_details(self) -> dict:
+        return {"type": "tiny"}
+
+
+def create_tiny_bm25_collection(base_path):
+    persister = DiskPersister(base_path=os.path.join(base_path, "data", "collections"))
+    DocumentCollectionCreator(collection_name="tiny",
+                              document_reader=TinyReader(),
+                              document_converter=TinyConverter(),
+                              document_indexers=[indexer_factory.create_indexer("indexer_SqlLiteBM25", "tiny", persister)],
+                              persister=persister).run()
+
+
+class TestLazyImports:
+    def test_factories_do_not_import_heavy_dependencies(self):
+        assert find_loaded_heavy_modules("main.indexes.indexer_factory",
+                                         "main.factories.search_collection_factory",
+                                         "main.factories.update_collection_factory",
+                                         "main.factories.create_collection_factory",
+                                         "main.factories.fetch_collection_factory") == []
+
+    def test_files_reader_does_not_import_heavy_dependencies(self):
+        assert find_loaded_heavy_modules("main.sources.files.files_document_reader",
+                                         "main.sources.files.files_document_converter") == []
+
+    def test_numpy_flat_indexer_does_not_import_vector_databases(self):
+        assert find_loaded_heavy_modules("main.indexes.indexers.numpy_flat_indexer") == []
+
+    def test_sqllite_indexer_is_created_without_embedding_dependencies(self, tmp_path):
+        code = "; ".join([
+            "import sys, json",
+            "from main.indexes.indexer_factory import create_indexer",
+            "from main.persisters.disk_persister import DiskPersister",
+            f"create_indexer('indexer_SqlLiteBM25', 'collection', DiskPersister(base_path={str(tmp_path)!r})).get_size()",
+            f"print(json.dumps([module for module in {HEAVY_MODULES!r} if module in sys.modules]))",
+        ])
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_PATH, capture_output=True, text=True, check=True)
+        assert json.loads(result.stdout) == []
+
+    def test_bm25_collection_is_searched_and_fetched_without_heavy_dependencies(self, tmp_path):
+        create_tiny_bm25_collection(str(tmp_path))
+        code = "; ".join([
+            "import sys, json",
+            "from main.factories.search_collection_factory import create_collection_searcher",
+            "from main.factories.fetch_collection_factory import create_collection_fetcher",
+            "results = create_collection_searcher('tiny').search('fox jumps')['results']",
+            "document = create_collection_fetcher('tiny').fetch(results[0]['id'])",
+            f"print(json.dumps({{'text': document['text'], 'heavyModules': [module for module in {HEAVY_MODULES!r} if module in sys.modules]}}))",
+        ])
+        result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env={**os.environ, "PYTHONPATH": ROOT_PATH},
+                                capture_output=True, text=True, check=True)
+
+        assert json.loads(result.stdout.splitlines()[-1]) == {"text": "fox jumps over the dog", "heavyModules": []}
+
+
+class IdentityEmbedder(BaseEmbedder):
+    def embed(self, text) -> np.ndarray:
+        if isinstance(text, str):
+            return np.full(4, float(len(text)), dtype=np.float32)
+        return np.array([self.embed(item) for item in text], dtype=np.float32)
+
+    def get_number_of_dimensions(self) -> int:
+        return 4
+
+
+class TestFaissIndexLoading:
+    INDEXER_NAME = "indexer_FAISS_IndexFlatL2__embeddings_test"
+
+    @pytest.fixture
+    def persister(self, tmp_path, monkeypatch):
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(indexer_factory, "__create_sentence_embedder", lambda embedding_model, embedding_workers=None: IdentityEmbedder())
+        return DiskPersister(base_path=str(tmp_path))
+
+    def save_legacy_index(self, persister):
+        from main.indexes.indexers.faiss_indexer import FaissIndexer
+
+        indexer = FaissIndexer(self.INDEXER_NAME, IdentityEmbedder())
+        indexer.index_texts(np.arange(3), ["a", "bb", "ccc"])
+        persister.save_bin_file(indexer.serialize(), f"collection/indexes/{self.INDEXER_NAME}/indexer")
+
+    def test_searcher_reads_legacy_index_without_migrating_it(self, persister):
+        self.save_legacy_index(persister)
+        os.makedirs(persister.get_absolute_path(f"collection/indexes/{self.INDEXER_NAME}/storage"))
+
+        indexer = indexer_factory.load_indexer(self.INDEXER_NAME, "collection", persister)
+
+        assert indexer.get_size() == 3
+        assert indexer.is_persistent_storage() is False
+        assert persister.is_path_exists(f"collection/indexes/{self.INDEXER_NAME}/indexer")
+
+    def test_update_migrates_legacy_index_once(self, persister):
+        self.save_legacy_index(persister)
+
+        indexer = indexer_factory.load_indexer(self.INDEXER_NAME, "collection", persister, for_update=True)
+        storage_files = sorted(os.listdir(persister.get_absolute_path(f"collection/indexes/{self.INDEXER_NAME}/storage")))
+        reloaded_indexer = indexer_factory.load_indexer(self.INDEXER_NAME, "collection", persister, for_update=True)
+
+        assert indexer.get_size() == reloaded_indexer.get_size() == 3
+        assert not persister.is_path_exists(f"collection/indexes/{self.INDEXER_NAME}/indexer")
+        assert storage_files == ["segment_000001.faiss", "segments.json"]
+
+    def test_storage_without_manifest_is_not_loaded_as_empty_index(self, persister):
+        os.makedirs(persister.get_absolute_path(f"collection/indexes/{self.INDEXER_NAME}/storage"))
+
+        with pytest.raises(FileNotFoundError):
+            indexer_factory.load_indexer(self.INDEXER_NAME, "collection", persister)
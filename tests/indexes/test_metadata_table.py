@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+
+from main.indexes.filter_parser import parse_filter
+from main.indexes.metadata_table import MetadataTable
+
+
+def build_table():
+    table = MetadataTable()
+    table.add(np.array([1, 2, 3, 4]), [
+        {"project": "A", "lastModifiedAt": "2026-01-01T00:00:00Z"},
+        {"project": "B", "lastModifiedAt": "2026-02-01T00:00:00+00:00"},
+        {"project": "A", "lastModifiedAt": "2026-03-01T00:00:00Z", "epic": None},
+        None,
+    ])
+    return table
+
+
+def find_ids(table, filter):
+    return np.flatnonzero(table.filter(parse_filter(filter))).tolist()
+
+
+class TestMetadataTable:
+    def test_filters_by_conditions_and_groups(self):
+        table = build_table()
+
+        assert find_ids(table, 'project = "A"') == [1, 3]
+        assert find_ids(table, 'project != "A"') == [2]
+        assert find_ids(table, 'project = "A" and lastModifiedAt > "2026-02-01"') == [3]
+        assert find_ids(table, 'project = "B" or lastModifiedAt < "2026-01-15"') == [1, 2]
+        assert find_ids(table, 'unknown = "A"') == []
+
+    def test_removed_and_replaced_rows(self):
+        table = build_table()
+
+        table.remove(np.array([1]))
+        table.add(np.array([3]), [{"project": "B"}])
+
+        assert find_ids(table, 'project = "B"') == [2, 3]
+        assert find_ids(table, 'lastModifiedAt > "2025-01-01"') == [2]
+
+    def test_survives_save_and_load(self, tmp_path):
+        path = str(tmp_path / "metadata.npz")
+        saved_table = build_table()
+        assert saved_table.is_changed()
+        saved_table.save(path)
+
+        table = MetadataTable.load(path)
+
+        assert not saved_table.is_changed()
+        assert not table.is_changed()
+        assert find_ids(table, 'project = "A" and lastModifiedAt >= "2026-03-01"') == [3]
+
+    def test_small_changes_are_saved_as_deltas(self, tmp_path):
+        path = str(tmp_path / "metadata.npz")
+        build_table().save(path)
+
+        table = MetadataTable.load(path)
+        table.add(np.array([5, 6]), [{"project": "C"}, {"project": "D"}])
+        table.remove(np.array([6, 1]))
+        table.save(path)
+        table.add(np.array([2]), [{"epic": "E"}])
+        table.save(path)
+
+        assert sorted(os.listdir(tmp_path)) == ["metadata.npz", "metadata_delta_000001.npz", "metadata_delta_000002.npz"]
+        loaded_table = MetadataTable.load(path)
+        assert find_ids(loaded_table, 'project = "A"') == [3]
+        assert find_ids(loaded_table, 'project = "C" or project = "D"') == [5]
+        assert find_ids(loaded_table, 'epic = "E" or project = "B"') == [2]
+
+        loaded_table.add(np.array([7]), [{"project": "D"}])
+        loaded_table.save(path, compact=True)
+
+        assert sorted(os.listdir(tmp_path)) == ["metadata.npz"]
+        assert find_ids(MetadataTable.load(path), 'project = "D"') == [7]
@@ -0,0 +1,34 @@
+import zlib
+
+import numpy as np
+
+from main.indexes.indexers.faiss_indexer import FaissIndexer
+from main.indexes.embeddings.base_embedder import BaseEmbedder
+from main.indexes.search_parameters_sweep import sweep_ef_search
+
+
+class RandomEmbedder(BaseEmbedder):
+    def embed(self, text) -> np.ndarray:
+        if isinstance(text, str):
+            return self.__embed_text(text)
+        return np.array([self.__embed_text(item) for item in text], dtype=np.float32)
+
+    def get_number_of_dimensions(self) -> int:
+        return 16
+
+    def __embed_text(self, text):
+        return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).random(16).astype(np.float32)
+
+
+class TestSearchParametersSweep:
+    def test_reports_recall_and_latency_for_each_ef_search(self):
+        indexer = FaissIndexer("test", RandomEmbedder(), index_type="HNSW", index_parameters={"M": 4, "efConstruction": 16})
+        texts = [f"text {number}" for number in range(2000)]
+        indexer.index_texts(np.arange(len(texts)), texts)
+
+        results = sweep_ef_search(indexer, [f"query {number}" for number in range(20)], [1, 256], number_of_results=10)
+
+        assert [result["efSearch"] for result in results] == [1, 256]
+        assert results[0]["recall"] < results[1]["recall"]
+        assert results[1]["recall"] > 0.9
+        assert all(result["meanLatencyInMs"] > 0 and result["p95LatencyInMs"] > 0 for result in results)
@@ -0,0 +1,50 @@
+from main.sources.files.files_document_converter import FilesDocumentConverter
+from main.splitter.base_text_splitter import BaseTextSplitter
+
+
+class LinesTextSplitter(BaseTextSplitter):
+    def split_text(self, text):
+        return text.splitlines()
+
+    def get_details(self):
+        return {"type": "lines"}
+
+
+def build_document(content):
+    return {
+        "fileRelativePath": "docs/report.pdf",
+        "fileFullPath": "/files/docs/report.pdf",
+        "createdTime": "2026-01-01T00:00:00",
+        "modifiedTime": "2026-01-02T00:00:00",
+        "duplicateFileRelativePaths": [],
+        "content": content,
+    }
+
+
+class TestFilesDocumentConverter:
+    def test_content_parts_are_split_to_chunks_with_page_metadata(self):
+        converter = FilesDocumentConverter(LinesTextSplitter())
+
+        document = converter.convert(build_document([
+            {"metadata": {"pageNumber": 1}, "text": "first\nsecond"},
+            {"metadata": {"pageNumber": 2}, "text": " "},
+            {"metadata": {"pageNumber": 3}, "text": "third"},
+        ]))[0]
+
+        assert document["id"] == "docs/report.pdf"
+        assert document["metadata"]["folder1"] == "docs"
+        assert document["chunks"] == [
+            {"indexedData": "docs/report.pdf"},
+            {"metadata": {"pageNumber": 1}, "indexedData": "first"},
+            {"metadata": {"pageNumber": 1}, "indexedData": "second"},
+            {"metadata": {"pageNumber": 3}, "indexedData": "third"},
+        ]
+
+    def test_streamed_content_is_read_once(self):
+        converter = FilesDocumentConverter(LinesTextSplitter())
+        content = ({"metadata": {"pageNumber": page_number}, "text": f"page {page_number}"} for page_number in [1, 2])
+
+        document = converter.convert(build_document(content))[0]
+
+        assert document["text"] == "docs/report.pdf\n\npage 1page 2"
+        assert [chunk["indexedData"] for chunk in document["chunks"]] == ["docs/report.pdf", "page 1", "page 2"]
@@ -0,0 +1,375 @@
+import os
+import re
+import json
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from main.sources.files.files_document_reader import FilesDocumentReader
+from main.sources.files.parsed_content_cache import ParsedContentCache
+from main.persisters.disk_persister import DiskPersister
+
+
+def write_file(base_path, relative_path, content):
+    path = os.path.join(base_path, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(content)
+    return path
+
+
+def read_relative_paths(reader):
+    return sorted(document["fileRelativePath"] for document in reader.read_all_documents())
+
+
+def read_broken_file(file_path):
+    raise ValueError(f"Broken file {file_path}")
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    path = str(tmp_path / "files")
+    write_file(path, "a.json", '{"a": 1}')
+    write_file(path, os.path.join("docs", "b.json"), '{"b": 2}')
+    write_file(path, os.path.join("docs", "nested", "c.json"), '{"c": 3}')
+    write_file(path, os.path.join("docs", "archive.zip"), "zip")
+    return path
+
+
+class TestFilesDocumentReaderScan:
+    def test_reads_all_matched_files(self, base_path):
+        reader = FilesDocumentReader(base_path)
+
+        assert reader.get_number_of_documents() == 3
+        assert read_relative_paths(reader) == ["a.json", os.path.join("docs", "b.json"), os.path.join("docs", "nested", "c.json")]
+
+    def test_honours_include_and_exclude_patterns(self, base_path):
+        reader = FilesDocumentReader(base_path, include_patterns=["docs/.*"], exclude_patterns=[".*/nested/.*"])
+
+        assert read_relative_paths(reader) == [os.path.join("docs", "b.json")]
+
+    def test_document_contains_file_details(self, base_path):
+        document = next(document for document in FilesDocumentReader(base_path).read_all_documents() if document["fileRelativePath"] == "a.json")
+
+        assert document["fileFullPath"] == os.path.join(base_path, "a.json")
+        assert document["content"] == [{"text": '{"a": 1}'}]
+        assert document["modifiedTime"]
+        assert document["createdTime"]
+
+
+class TestFilesDocumentReaderState:
+    def test_unchanged_files_are_skipped_when_previous_state_is_passed(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+
+        assert second_reader.get_number_of_documents() == 0
+        assert read_relative_paths(second_reader) == []
+        assert second_reader.get_removed_document_ids() == []
+
+    def test_changed_and_new_files_are_read(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        write_file(base_path, "a.json", '{"a": 100}')
+        write_file(base_path, "d.json", '{"d": 4}')
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+
+        assert read_relative_paths(second_reader) == ["a.json", "d.json"]
+
+    def test_file_restored_with_old_modification_time_is_read(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        path = os.path.join(base_path, "a.json")
+        original_stat = os.stat(path)
+        write_file(base_path, "a.json", '{"a": "restored"}')
+        os.utime(path, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns - 10**12))
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+
+        assert read_relative_paths(second_reader) == ["a.json"]
+
+    def test_deleted_files_are_reported_as_removed(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        os.remove(os.path.join(base_path, "docs", "b.json"))
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+
+        assert second_reader.get_removed_document_ids() == [os.path.join("docs", "b.json")]
+
+    def test_failed_files_are_not_saved_to_state(self, base_path):
+        write_file(base_path, "broken.json", "")
+        os.chmod(os.path.join(base_path, "broken.json"), 0)
+        if os.access(os.path.join(base_path, "broken.json"), os.R_OK):
+            pytest.skip("File permissions are not enforced for the current user")
+
+        reader = FilesDocumentReader(base_path)
+        list(reader.read_all_documents())
+
+        assert "broken.json" not in reader.get_state()["files"]
+
+    def test_files_failed_to_hash_are_reported_as_error_files(self, base_path, monkeypatch, caplog):
+        import main.sources.files.files_document_reader as files_document_reader
+        write_file(base_path, "broken.json", "{}")
+
+        file_digest = files_document_reader.hashlib.file_digest
+        def fake_file_digest(file, digest):
+            if file.name.endswith("broken.json"):
+                raise PermissionError(f"Permission denied: {file.name}")
+            return file_digest(file, digest)
+        monkeypatch.setattr(files_document_reader.hashlib, "file_digest", fake_file_digest)
+
+        reader = FilesDocumentReader(base_path)
+        with caplog.at_level("INFO"):
+            relative_paths = read_relative_paths(reader)
+
+        stats = json.loads(next(record.getMessage() for record in caplog.records if record.getMessage().startswith("Files reading stats")).split("\n", 1)[1])
+        assert "broken.json" not in relative_paths
+        assert stats["errorFiles"] == [os.path.join(base_path, "broken.json")]
+        assert "broken.json" not in reader.get_state()["files"]
+
+    def test_failed_files_keep_previous_state_and_are_removed_when_deleted(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+        first_state = first_reader.get_state()
+
+        write_file(base_path, "a.json", '{"a": 2}')
+        second_reader = FilesDocumentReader(base_path, previous_state=first_state)
+        second_reader.file_readers[".json"] = read_broken_file
+        list(second_reader.read_all_documents())
+        second_state = second_reader.get_state()
+
+        assert second_state["files"]["a.json"] == first_state["files"]["a.json"]
+
+        os.remove(os.path.join(base_path, "a.json"))
+        third_reader = FilesDocumentReader(base_path, previous_state=second_state)
+
+        assert third_reader.get_removed_document_ids() == ["a.json"]
+
+
+class TestFilesDocumentReaderContentHash:
+    def test_touched_but_identical_file_is_skipped(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        path = os.path.join(base_path, "a.json")
+        write_file(base_path, "a.json", '{"a": 1}')
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+
+        assert read_relative_paths(second_reader) == []
+        assert second_reader.get_state()["files"]["a.json"]["mtimeNs"] == os.stat(path).st_mtime_ns
+
+    def test_duplicate_files_are_read_once(self, base_path):
+        write_file(base_path, os.path.join("copy", "a.json"), '{"a": 1}')
+
+        documents = list(FilesDocumentReader(base_path).read_all_documents())
+        document = next(document for document in documents if document["fileRelativePath"] == "a.json")
+
+        assert len(documents) == 3
+        assert document["duplicateFileRelativePaths"] == [os.path.join("copy", "a.json")]
+
+    def test_new_duplicate_updates_existing_document(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        write_file(base_path, os.path.join("copy", "a.json"), '{"a": 1}')
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+        documents = list(second_reader.read_all_documents())
+
+        assert [document["fileRelativePath"] for document in documents] == ["a.json"]
+        assert documents[0]["duplicateFileRelativePaths"] == [os.path.join("copy", "a.json")]
+        assert second_reader.get_removed_document_ids() == []
+
+    def test_document_becoming_duplicate_is_removed(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        write_file(base_path, os.path.join("docs", "b.json"), '{"a": 1}')
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+        documents = list(second_reader.read_all_documents())
+
+        assert [document["fileRelativePath"] for document in documents] == ["a.json"]
+        assert second_reader.get_removed_document_ids() == [os.path.join("docs", "b.json")]
+
+    def test_duplicate_becomes_document_when_original_is_deleted(self, base_path):
+        write_file(base_path, os.path.join("copy", "a.json"), '{"a": 1}')
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        os.remove(os.path.join(base_path, "a.json"))
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state())
+
+        assert read_relative_paths(second_reader) == [os.path.join("copy", "a.json")]
+        assert second_reader.get_removed_document_ids() == ["a.json"]
+
+
+class TestFilesDocumentReaderParsedContentCache:
+    def test_parsed_content_is_reused_by_content_hash(self, base_path, tmp_path):
+        pytest.importorskip("unstructured")
+        parsed_content_cache = ParsedContentCache(DiskPersister(base_path=str(tmp_path / "parsed_files")))
+        write_file(base_path, "report.pdf", "pdf content")
+        write_file(base_path, os.path.join("other", "report.pdf"), "other pdf content")
+
+        parsed_file_paths = []
+        def fake_parse(file_path):
+            parsed_file_paths.append(file_path)
+            return [{"metadata": {"pageNumber": 1}, "text": f"parsed {os.path.basename(file_path)}"}]
+
+        first_reader = FilesDocumentReader(base_path, include_patterns=[".*pdf"], parsed_content_cache=parsed_content_cache)
+        first_reader.default_reader = fake_parse
+        first_documents = list(first_reader.read_all_documents())
+
+        second_reader = FilesDocumentReader(base_path, include_patterns=[".*pdf"], parsed_content_cache=parsed_content_cache)
+        second_reader.default_reader = fake_parse
+        second_documents = list(second_reader.read_all_documents())
+
+        assert len(parsed_file_paths) == 2
+        assert [document["content"] for document in first_documents] == [document["content"] for document in second_documents]
+
+
+class TestFilesDocumentReaderPageRanges:
+    def test_large_pdf_is_parsed_by_page_ranges(self, base_path, monkeypatch):
+        pypdf = pytest.importorskip("pypdf")
+        import main.sources.files.files_document_reader as files_document_reader
+
+        pdf_writer = pypdf.PdfWriter()
+        for _ in range(5):
+            pdf_writer.add_blank_page(width=100, height=100)
+        with open(os.path.join(base_path, "large.pdf"), "wb") as file:
+            pdf_writer.write(file)
+
+        parsed_number_of_pages = []
+        def fake_partition(file, metadata_filename, content_type, strategy):
+            number_of_pages = len(pypdf.PdfReader(file).pages)
+            parsed_number_of_pages.append(number_of_pages)
+            return [SimpleNamespace(text=f"page {page_number}", metadata=SimpleNamespace(page_number=page_number)) for page_number in range(1, number_of_pages + 1)]
+        monkeypatch.setattr(files_document_reader, "partition", fake_partition)
+
+        reader = FilesDocumentReader(base_path, include_patterns=[".*pdf"], streaming_threshold_in_bytes=0, pages_per_streaming_range=2)
+        documents = list(reader.read_all_documents())
+        content = documents[0]["content"]
+
+        assert next(content) == {"metadata": {"pageNumber": 1}, "text": "page 1"}
+        assert parsed_number_of_pages == [2]
+
+        remaining_parts = list(content)
+        assert parsed_number_of_pages == [2, 2, 1]
+        assert [part["metadata"]["pageNumber"] for part in remaining_parts] == [2, 3, 4, 5]
+        assert [part["text"] for part in remaining_parts] == ["page 2", "page 1", "page 2", "page 1"]
+
+    def test_large_presentation_is_parsed_by_slide_ranges(self, base_path, monkeypatch):
+        import main.sources.files.files_document_reader as files_document_reader
+
+        slide_ids = "".join(f'<p:sldId id="{256 + index}" r:id="rId{index + 2}"/>' for index in range(5))
+        with zipfile.ZipFile(os.path.join(base_path, "large.pptx"), "w") as presentation_file:
+            presentation_file.writestr("ppt/presentation.xml", f"<p:presentation><p:sldIdLst>{slide_ids}</p:sldIdLst></p:presentation>")
+            presentation_file.writestr("ppt/slides/slide1.xml", "<p:sld/>")
+
+        parsed_slide_ids = []
+        def fake_partition(file, metadata_filename, content_type, strategy):
+            with zipfile.ZipFile(file) as presentation_file:
+                range_slide_ids = re.findall(r'id="(\d+)"', presentation_file.read("ppt/presentation.xml").decode("utf-8"))
+                assert presentation_file.read("ppt/slides/slide1.xml") == b"<p:sld/>"
+            parsed_slide_ids.append(range_slide_ids)
+            return [SimpleNamespace(text=f"slide {slide_id}", metadata=SimpleNamespace(page_number=page_number)) for page_number, slide_id in enumerate(range_slide_ids, start=1)]
+        monkeypatch.setattr(files_document_reader, "partition", fake_partition)
+
+        reader = FilesDocumentReader(base_path, include_patterns=[".*pptx"], streaming_threshold_in_bytes=0, pages_per_streaming_range=2)
+        documents = list(reader.read_all_documents())
+        content = list(documents[0]["content"])
+
+        assert parsed_slide_ids == [["256", "257"], ["258", "259"], ["260"]]
+        assert [part["metadata"]["pageNumber"] for part in content] == [1, 2, 3, 4, 5]
+        assert [part["text"] for part in content] == ["slide 256", "slide 257", "slide 258", "slide 259", "slide 260"]
+
+    def test_file_failed_before_streaming_any_content_is_not_read(self, base_path):
+        write_file(base_path, "broken.pptx", "not a zip file")
+
+        reader = FilesDocumentReader(base_path, include_patterns=[".*pptx"], streaming_threshold_in_bytes=0)
+
+        assert list(reader.read_all_documents()) == []
+        assert "broken.pptx" not in reader.get_state()["files"]
+
+    def test_file_failed_while_streaming_is_reported_after_its_content_is_read(self, base_path, monkeypatch, caplog):
+        import main.sources.files.files_document_reader as files_document_reader
+
+        slide_ids = "".join(f'<p:sldId id="{256 + index}" r:id="rId{index + 2}"/>' for index in range(4))
+        with zipfile.ZipFile(os.path.join(base_path, "large.pptx"), "w") as presentation_file:
+            presentation_file.writestr("ppt/presentation.xml", f"<p:presentation><p:sldIdLst>{slide_ids}</p:sldIdLst></p:presentation>")
+
+        number_of_ranges = []
+        def fake_partition(file, metadata_filename, content_type, strategy):
+            number_of_ranges.append(1)
+            if len(number_of_ranges) > 1:
+                raise ValueError("Broken slide")
+            return [SimpleNamespace(text="slide", metadata=SimpleNamespace(page_number=1))]
+        monkeypatch.setattr(files_document_reader, "partition", fake_partition)
+
+        reader = FilesDocumentReader(base_path, include_patterns=[".*pptx"], streaming_threshold_in_bytes=0, pages_per_streaming_range=2)
+        with caplog.at_level("INFO"):
+            content = [list(document["content"]) for document in reader.read_all_documents()]
+
+        stats = json.loads(next(record.getMessage() for record in caplog.records if record.getMessage().startswith("Files reading stats")).split("\n", 1)[1])
+        assert content == [[{"metadata": {"pageNumber": 1}, "text": "slide"}]]
+        assert stats["successFiles"] == []
+        assert stats["errorFiles"] == [os.path.join(base_path, "large.pptx")]
+        assert "large.pptx" not in reader.get_state()["files"]
+
+
+class TestFilesDocumentReaderStrategies:
+    def test_falls_back_to_next_strategy_when_almost_no_text_is_extracted(self, base_path, monkeypatch):
+        import main.sources.files.files_document_reader as files_document_reader
+        write_file(base_path, "scan.pdf", "scanned pdf")
+        write_file(base_path, "text.pdf", "text pdf")
+
+        used_strategies = []
+        def fake_partition(filename, strategy):
+            used_strategies.append((os.path.basename(filename), strategy))
+            text = "" if filename.endswith("scan.pdf") and strategy == "fast" else f"{strategy} text extracted from {os.path.basename(filename)}"
+            return [SimpleNamespace(text=text, metadata=SimpleNamespace(page_number=1))]
+        monkeypatch.setattr(files_document_reader, "partition", fake_partition)
+
+        reader = FilesDocumentReader(base_path, include_patterns=[".*pdf"], strategies_by_extension={".pdf": ["fast", "hi_res"]})
+        documents = {document["fileRelativePath"]: document for document in reader.read_all_documents()}
+
+        assert sorted(used_strategies) == [("scan.pdf", "fast"), ("scan.pdf", "hi_res"), ("text.pdf", "fast")]
+        assert documents["scan.pdf"]["content"][0]["text"] == "hi_res text extracted from scan.pdf"
+        assert documents["text.pdf"]["content"][0]["text"] == "fast text extracted from text.pdf"
+
+
+class TestFilesDocumentReaderChangedPaths:
+    def test_only_changed_paths_are_checked(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        write_file(base_path, "a.json", '{"a": 100}')
+        write_file(base_path, "d.json", '{"d": 4}')
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state(), changed_paths=["a.json"])
+
+        assert read_relative_paths(second_reader) == ["a.json"]
+        assert "d.json" not in second_reader.get_state()["files"]
+        assert second_reader.get_state()["files"][os.path.join("docs", "b.json")] == first_reader.get_state()["files"][os.path.join("docs", "b.json")]
+
+    def test_changed_directory_is_scanned_and_deleted_files_are_removed(self, base_path):
+        first_reader = FilesDocumentReader(base_path)
+        list(first_reader.read_all_documents())
+
+        os.remove(os.path.join(base_path, "docs", "nested", "c.json"))
+        write_file(base_path, os.path.join("docs", "nested", "e.json"), '{"e": 5}')
+
+        second_reader = FilesDocumentReader(base_path, previous_state=first_reader.get_state(), changed_paths=[os.path.join("docs", "nested")])
+
+        assert read_relative_paths(second_reader) == [os.path.join("docs", "nested", "e.json")]
+        assert second_reader.get_removed_document_ids() == [os.path.join("docs", "nested", "c.json")]
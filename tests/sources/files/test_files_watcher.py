@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+from main.sources.files.files_watcher import FilesWatcher
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is available only on Linux")
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    path = tmp_path / "files"
+    (path / "docs").mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def watcher(base_path):
+    watcher = FilesWatcher(str(base_path), exclude_patterns=[".*\\.tmp"], debounce_time_in_seconds=0.1)
+    yield watcher
+    watcher.close()
+
+
+class TestFilesWatcher:
+    def test_coalesces_file_changes(self, base_path, watcher):
+        (base_path / "a.txt").write_text("a")
+        (base_path / "a.txt").write_text("a2")
+        (base_path / "docs" / "b.txt").write_text("b")
+        (base_path / "ignored.tmp").write_text("tmp")
+
+        assert watcher.wait_for_changes() == ["a.txt", os.path.join("docs", "b.txt")]
+
+    def test_reports_deleted_files(self, base_path, watcher):
+        (base_path / "docs" / "b.txt").write_text("b")
+        watcher.wait_for_changes()
+
+        (base_path / "docs" / "b.txt").unlink()
+
+        assert watcher.wait_for_changes() == [os.path.join("docs", "b.txt")]
+
+    def test_watches_new_directories(self, base_path, watcher):
+        (base_path / "new").mkdir()
+        assert watcher.wait_for_changes() == ["new"]
+
+        (base_path / "new" / "c.txt").write_text("c")
+
+        assert watcher.wait_for_changes() == [os.path.join("new", "c.txt")]
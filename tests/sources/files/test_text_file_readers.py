@@ -0,0 +1,52 @@
+import codecs
+
+import pytest
+
+from main.sources.files.text_file_readers import read_text_file, read_html_file
+
+
+def write_bytes(tmp_path, file_name, data):
+    path = tmp_path / file_name
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestReadTextFile:
+    def test_reads_utf8_file(self, tmp_path):
+        path = write_bytes(tmp_path, "a.md", "# Title\n\nПривіт ✓".encode("utf-8"))
+
+        assert read_text_file(path) == [{"text": "# Title\n\nПривіт ✓"}]
+
+    def test_reads_file_with_byte_order_mark(self, tmp_path):
+        utf8_path = write_bytes(tmp_path, "a.txt", codecs.BOM_UTF8 + "text".encode("utf-8"))
+        utf16_path = write_bytes(tmp_path, "b.txt", "text ✓".encode("utf-16"))
+
+        assert read_text_file(utf8_path) == [{"text": "text"}]
+        assert read_text_file(utf16_path) == [{"text": "text ✓"}]
+
+    def test_falls_back_to_single_byte_encoding(self, tmp_path):
+        path = write_bytes(tmp_path, "a.csv", "name;price\ncafé;5€".encode("cp1252"))
+
+        assert read_text_file(path) == [{"text": "name;price\ncafé;5€"}]
+
+    def test_fails_for_binary_content(self, tmp_path):
+        undefined_in_cp1252_path = write_bytes(tmp_path, "a.txt", b"text \x81\x8d")
+        binary_path = write_bytes(tmp_path, "b.txt", b"\x7fELF\x02\x01\x00\x00")
+
+        with pytest.raises(ValueError, match="Cannot detect encoding"):
+            read_text_file(undefined_in_cp1252_path)
+        with pytest.raises(ValueError, match="binary content"):
+            read_text_file(binary_path)
+
+    def test_normalizes_windows_line_endings(self, tmp_path):
+        path = write_bytes(tmp_path, "a.py", b"a = 1\r\nb = 2\r\n")
+
+        assert read_text_file(path) == [{"text": "a = 1\nb = 2\n"}]
+
+
+class TestReadHtmlFile:
+    def test_extracts_visible_text(self, tmp_path):
+        html = "<html><head><style>p {}</style><script>var a;</script></head><body><h1>Title</h1><p>First <b>bold</b></p>\n\n<p>Second</p></body></html>"
+        path = write_bytes(tmp_path, "a.html", html.encode("utf-8"))
+
+        assert read_html_file(path) == [{"text": "Title\nFirst bold\nSecond"}]
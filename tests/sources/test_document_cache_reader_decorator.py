@@ -0,0 +1,123 @@
+import json
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from main.sources.base_document_reader import BaseDocumentReader
+from main.sources.document_cache_reader_decorator import CacheReaderDecorator
+from main.persisters.disk_persister import DiskPersister
+
+
+class FakeReader(BaseDocumentReader):
+    def __init__(self, query, documents):
+        self.query = query
+        self.documents = documents
+        self.number_of_reads = 0
+
+    def read_all_documents(self):
+        self.number_of_reads += 1
+        yield from self.documents
+
+    def get_number_of_documents(self) -> int:
+        return len(self.documents)
+
+    def get_reader_details(self) -> dict:
+        return {"type": "fake", "query": self.query}
+
+
+@pytest.fixture
+def persister(tmp_path):
+    return DiskPersister(base_path=str(tmp_path / "caches"))
+
+
+def build_documents(number_of_documents):
+    return [{"id": str(i), "body": f"document {i} ✓"} for i in range(number_of_documents)]
+
+
+class TestCacheReaderDecorator:
+    def test_second_read_is_served_from_cache(self, persister):
+        reader = FakeReader("q", build_documents(5))
+        decorator = CacheReaderDecorator(reader, persister, max_documents_per_segment=2)
+
+        first_read = list(decorator.read_all_documents())
+        second_read = list(decorator.read_all_documents())
+
+        assert first_read == second_read == build_documents(5)
+        assert reader.number_of_reads == 1
+        assert decorator.get_number_of_documents() == 5
+
+    def test_documents_are_packed_into_compressed_segments(self, persister):
+        decorator = CacheReaderDecorator(FakeReader("q", build_documents(5)), persister, max_documents_per_segment=2)
+        list(decorator.read_all_documents())
+
+        cache_key = hashlib.sha256(json.dumps({"type": "fake", "query": "q"}).encode("utf-8")).hexdigest()
+        cache_files = sorted(persister.read_folder_files(cache_key))
+        assert cache_files == ["index.json", "segment_0.jsonl.gz", "segment_1.jsonl.gz", "segment_2.jsonl.gz"]
+
+        index = json.loads(persister.read_text_file(f"{cache_key}/index.json"))
+        assert [segment["numberOfDocuments"] for segment in index["segments"]] == [2, 2, 1]
+
+    def test_interrupted_read_is_not_treated_as_cache_hit(self, persister):
+        reader = FakeReader("q", build_documents(3))
+        decorator = CacheReaderDecorator(reader, persister)
+
+        generator = decorator.read_all_documents()
+        next(generator)
+        generator.close()
+
+        assert list(decorator.read_all_documents()) == build_documents(3)
+        assert reader.number_of_reads == 2
+
+    def test_least_recently_used_cache_is_evicted_when_size_budget_is_exceeded(self, persister):
+        first = CacheReaderDecorator(FakeReader("first", build_documents(50)), persister)
+        list(first.read_all_documents())
+        cache_size = json.loads(persister.read_text_file("registry.json")).popitem()[1]["sizeInBytes"]
+
+        second = CacheReaderDecorator(FakeReader("second", build_documents(50)), persister, max_cache_size_in_bytes=cache_size + 1)
+        list(second.read_all_documents())
+
+        registry = json.loads(persister.read_text_file("registry.json"))
+        assert len(registry) == 1
+        assert second.get_number_of_documents() == 50
+        assert first.reader.number_of_reads == 1
+        list(first.read_all_documents())
+        assert first.reader.number_of_reads == 2
+
+    def test_expired_cache_is_removed(self, persister):
+        old = CacheReaderDecorator(FakeReader("old", build_documents(2)), persister)
+        list(old.read_all_documents())
+
+        registry = json.loads(persister.read_text_file("registry.json"))
+        for entry in registry.values():
+            entry["lastAccessTime"] = (datetime.now(timezone.utc) - timedelta(days=31)).isoformat()
+        persister.save_text_file(json.dumps(registry), "registry.json")
+
+        list(CacheReaderDecorator(FakeReader("new", build_documents(2)), persister).read_all_documents())
+
+        assert len(json.loads(persister.read_text_file("registry.json"))) == 1
+        list(old.read_all_documents())
+        assert old.reader.number_of_reads == 2
+
+    def test_legacy_cache_folders_are_removed(self, persister):
+        legacy_key = "a" * 64
+        persister.save_text_file("{}", f"{legacy_key}/0.json")
+        persister.save_text_file("", f"{legacy_key}_completed")
+
+        list(CacheReaderDecorator(FakeReader("q", build_documents(1)), persister).read_all_documents())
+
+        assert not persister.is_path_exists(legacy_key)
+        assert not persister.is_path_exists(f"{legacy_key}_completed")
+
+    def test_cache_in_progress_is_kept_when_other_cache_is_completed(self, persister):
+        in_progress = CacheReaderDecorator(FakeReader("in progress", build_documents(50)), persister, max_cache_size_in_bytes=1)
+        generator = in_progress.read_all_documents()
+        documents = [next(generator)]
+
+        list(CacheReaderDecorator(FakeReader("completed", build_documents(50)), persister, max_cache_size_in_bytes=1).read_all_documents())
+        documents.extend(generator)
+
+        assert documents == build_documents(50)
+        assert in_progress.get_number_of_documents() == 50
+        list(in_progress.read_all_documents())
+        assert in_progress.reader.number_of_reads == 1
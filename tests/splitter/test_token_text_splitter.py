@@ -0,0 +1,40 @@
+import pytest
+
+from tokenizers import Tokenizer, processors
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+from main.splitter.token_text_splitter import TokenTextSplitter
+
+
+@pytest.fixture
+def tokenizer():
+    tokenizer = Tokenizer(WordLevel(vocab={"[UNK]": 0, "[CLS]": 1, "[SEP]": 2}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 1), ("[SEP]", 2)])
+    return tokenizer
+
+
+class TestTokenTextSplitter:
+    def test_splits_by_number_of_tokens_with_overlap(self, tokenizer):
+        splitter = TokenTextSplitter("model", chunk_size=4, chunk_overlap=1, tokenizer=tokenizer)
+
+        assert splitter.split_text("a b c d e f g") == ["a b c d", "d e f g"]
+
+    def test_prefers_paragraph_and_sentence_boundaries(self, tokenizer):
+        splitter = TokenTextSplitter("model", chunk_size=8, chunk_overlap=0, tokenizer=tokenizer)
+
+        text = "One two three four. Five six seven eight nine.\n\nTen eleven twelve."
+
+        assert splitter.split_text(text) == ["One two three four.", "Five six seven eight nine.", "Ten eleven twelve."]
+
+    def test_returns_no_chunks_for_blank_text(self, tokenizer):
+        splitter = TokenTextSplitter("model", chunk_size=4, chunk_overlap=1, tokenizer=tokenizer)
+
+        assert splitter.split_text("") == []
+        assert splitter.split_text(" \n ") == []
+
+    def test_details_contain_splitter_type_and_model(self, tokenizer):
+        splitter = TokenTextSplitter("model", chunk_size=100, tokenizer=tokenizer)
+
+        assert splitter.get_details() == {"type": "tokens", "model": "model", "chunkSize": 100, "chunkOverlap": 10}